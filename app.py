@@ -7,14 +7,8 @@ import streamlit as st
 import json
 from datetime import datetime
 from backend.main import analyze_contract, get_summary_report
+from backend.utils.result_cache import warm_result_cache, get_result_cache_stats
 import os
-import spacy
-try:
-    nlp = spacy.load("en_core_web_sm")
-except:
-    from spacy.cli import download
-    download("en_core_web_sm")
-    nlp = spacy.load("en_core_web_sm")
 
 
 # Page configuration
@@ -72,9 +66,98 @@ api_key = os.getenv("ANTHROPIC_API_KEY")
 if not api_key:
     st.sidebar.warning("⚠️ ANTHROPIC_API_KEY not set. Some features may be limited.")
 
+
+@st.cache_resource
+def warm_report_cache():
+    """Preload recent reports once per server process; shared by every session"""
+    return warm_result_cache()
+
+
+try:
+    warm_report_cache()
+    cache_stats = get_result_cache_stats()
+except Exception:
+    # The report cache is an optimization; hide its panel if the store fails
+    cache_stats = {"enabled": False}
+if cache_stats.get("enabled", True):
+    with st.sidebar.expander("⚡ Report Cache"):
+        st.write(f"Reports stored: {cache_stats['entries']} ({cache_stats['memory_entries']} in memory)")
+        st.write(f"Hit ratio: {cache_stats['hit_ratio']:.0%} ({cache_stats['hits']} hits, {cache_stats['misses']} misses)")
+
 # Main title
 st.markdown("<h1 class='main-title'>⚖️ GenAI Contract Analysis & Risk Assessment Bot</h1>", unsafe_allow_html=True)
 
+
+def render_clause(clause):
+    """Render one analyzed clause inside an expander"""
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        risk = clause.get("risk", "Unknown")
+        if risk == "High":
+            st.markdown(f"<span class='risk-high'>Risk: {risk}</span>", unsafe_allow_html=True)
+        elif risk == "Medium":
+            st.markdown(f"<span class='risk-medium'>Risk: {risk}</span>", unsafe_allow_html=True)
+        else:
+            st.markdown(f"<span class='risk-low'>Risk: {risk}</span>", unsafe_allow_html=True)
+    
+    with col2:
+        clause_type = clause.get("type", "General").replace("_", " ").title()
+        st.write(f"**Type:** {clause_type}")
+    
+    with col3:
+        if clause.get("unfavorable"):
+            st.markdown("⚠️ **Unfavorable**")
+        else:
+            st.markdown("✅ **Favorable**")
+    
+    # Clause text
+    st.markdown("**Clause Text:**")
+    st.text(clause.get("text", "No text available"))
+    
+    # Explanation
+    st.markdown("**Explanation:**")
+    st.info(clause.get("explanation", "No explanation available"))
+    
+    # Obligations
+    obligations = clause.get("obligations", [])
+    if obligations:
+        st.markdown("**Your Obligations:**")
+        for obl in obligations:
+            st.write(f"• {obl}")
+    
+    # Rights
+    rights = clause.get("rights", [])
+    if rights:
+        st.markdown("**Your Rights:**")
+        for right in rights:
+            st.write(f"• {right}")
+    
+    # Ambiguities
+    ambiguities = clause.get("ambiguities", [])
+    if ambiguities:
+        st.markdown("**⚠️ Ambiguous Language:**")
+        for ambig in ambiguities:
+            st.warning(f"• {ambig}")
+    
+    # Suggestion
+    if clause.get("unfavorable"):
+        st.markdown("**Suggested Action:**")
+        st.success(clause.get("suggestion", "Seek legal advice"))
+
+
+RISK_ICONS = {"High": "🚨", "Medium": "⚠️", "Low": "✅"}
+
+STAGE_LABELS = {
+    "extract_text": "📄 Text extracted",
+    "classify": "🏷️ Contract classified",
+    "ner": "🔍 Entities extracted",
+    "extract_clauses": "📑 Clauses identified",
+    "llm_analysis": "⚖️ Reviewing clauses",
+    "overall_risk": "✅ Overall risk scored"
+}
+
+
 # Create tabs
 tab1, tab2, tab3, tab4, tab5 = st.tabs([
     "📤 Upload & Analyze",
@@ -110,32 +193,76 @@ with tab1:
     if analyze_button and uploaded_file:
         st.session_state.uploaded_file = uploaded_file
         
-        with st.spinner("🔄 Analyzing contract... This may take a moment."):
-            try:
-                analysis_result = analyze_contract(uploaded_file)
-                st.session_state.analysis_result = analysis_result
-                
-                if analysis_result.get("success"):
+        # Partial results are rendered as the pipeline emits them
+        progress_bar = st.progress(0.0, text="🔄 Reading contract...")
+        live_summary = st.container()
+        live_verdicts = st.container()
+        clause_live = tab3.empty()
+        received = {}
+        clause_total = 0
+        
+        def show_event(event):
+            global clause_total
+            kind = event["event"]
+            if kind == "progress":
+                progress_bar.progress(min(event["fraction"], 1.0), text=STAGE_LABELS.get(event["stage"], "🔄 Analyzing..."))
+            elif kind == "classification":
+                info = event["classification"]
+                live_summary.markdown(f"**Contract Type:** {info.get('type', 'Unknown')} ({info.get('confidence', 0):.0%} confidence)")
+            elif kind == "entities":
+                entities = event["entities"]
+                live_summary.caption(
+                    f"Found {len(entities.get('parties', []))} parties, {len(entities.get('dates', []))} dates, "
+                    f"{len(entities.get('amounts', []))} amounts"
+                )
+            elif kind == "clauses":
+                clause_total = event["total"]
+                live_verdicts.markdown(f"**Reviewing {clause_total} clauses:**")
+            elif kind == "clause":
+                clause = event["clause"]
+                received[event["index"]] = clause
+                risk = clause.get("risk", "Unknown")
+                live_verdicts.markdown(f"{RISK_ICONS.get(risk, '•')} {clause.get('title', 'Clause')} - Risk: {risk}")
+                with clause_live.container():
+                    st.caption(f"⏳ Analysis in progress: {len(received)} of {clause_total} clauses reviewed")
+                    for index in sorted(received):
+                        shown = received[index]
+                        with st.expander(f"📑 {shown.get('title', f'Clause {index + 1}')} - Risk: {shown.get('risk', 'Unknown')}"):
+                            render_clause(shown)
+            elif kind == "done":
+                progress_bar.empty()
+                clause_live.empty()
+        
+        try:
+            analysis_result = analyze_contract(uploaded_file, on_event=show_event)
+            st.session_state.analysis_result = analysis_result
+            
+            if analysis_result.get("success"):
+                if analysis_result.get("result_cache", {}).get("hit"):
+                    st.success("⚡ Contract analysis loaded from cache (identical contract analyzed before)")
+                else:
                     st.success("✅ Contract analysis complete!")
-                    
-                    # Display file info
-                    st.subheader("📄 File Information")
-                    file_info = analysis_result.get("file_info", {})
-                    
-                    col1, col2, col3 = st.columns(3)
-                    with col1:
-                        st.metric("File Name", file_info.get("name", "Unknown")[:30])
-                    with col2:
-                        metadata = file_info.get("metadata", {})
-                        st.metric("Word Count", f"{metadata.get('word_count', 0):,}")
-                    with col3:
-                        st.metric("Est. Pages", metadata.get("page_estimate", 1))
                 
-                else:
-                    st.error(f"❌ {analysis_result.get('error', 'Analysis failed')}")
+                # Display file info
+                st.subheader("📄 File Information")
+                file_info = analysis_result.get("file_info", {})
+                
+                col1, col2, col3 = st.columns(3)
+                with col1:
+                    st.metric("File Name", file_info.get("name", "Unknown")[:30])
+                with col2:
+                    metadata = file_info.get("metadata", {})
+                    st.metric("Word Count", f"{metadata.get('word_count', 0):,}")
+                with col3:
+                    st.metric("Est. Pages", metadata.get("page_estimate", 1))
             
-            except Exception as e:
-                st.error(f"❌ Error analyzing contract: {str(e)}")
+            else:
+                st.error(f"❌ {analysis_result.get('error', 'Analysis failed')}")
+        
+        except Exception as e:
+            progress_bar.empty()
+            clause_live.empty()
+            st.error(f"❌ Error analyzing contract: {str(e)}")
     
     elif uploaded_file is None and analyze_button:
         st.warning("Please upload a file first")
@@ -356,60 +483,7 @@ with tab3:
                 with st.expander(
                     f"📑 {clause.get('title', f'Clause {i}')} - Risk: {clause.get('risk', 'Unknown')}"
                 ):
-                    col1, col2, col3 = st.columns(3)
-                    
-                    with col1:
-                        risk = clause.get("risk", "Unknown")
-                        if risk == "High":
-                            st.markdown(f"<span class='risk-high'>Risk: {risk}</span>", unsafe_allow_html=True)
-                        elif risk == "Medium":
-                            st.markdown(f"<span class='risk-medium'>Risk: {risk}</span>", unsafe_allow_html=True)
-                        else:
-                            st.markdown(f"<span class='risk-low'>Risk: {risk}</span>", unsafe_allow_html=True)
-                    
-                    with col2:
-                        clause_type = clause.get("type", "General").replace("_", " ").title()
-                        st.write(f"**Type:** {clause_type}")
-                    
-                    with col3:
-                        if clause.get("unfavorable"):
-                            st.markdown("⚠️ **Unfavorable**")
-                        else:
-                            st.markdown("✅ **Favorable**")
-                    
-                    # Clause text
-                    st.markdown("**Clause Text:**")
-                    st.text(clause.get("text", "No text available"))
-                    
-                    # Explanation
-                    st.markdown("**Explanation:**")
-                    st.info(clause.get("explanation", "No explanation available"))
-                    
-                    # Obligations
-                    obligations = clause.get("obligations", [])
-                    if obligations:
-                        st.markdown("**Your Obligations:**")
-                        for obl in obligations:
-                            st.write(f"• {obl}")
-                    
-                    # Rights
-                    rights = clause.get("rights", [])
-                    if rights:
-                        st.markdown("**Your Rights:**")
-                        for right in rights:
-                            st.write(f"• {right}")
-                    
-                    # Ambiguities
-                    ambiguities = clause.get("ambiguities", [])
-                    if ambiguities:
-                        st.markdown("**⚠️ Ambiguous Language:**")
-                        for ambig in ambiguities:
-                            st.warning(f"• {ambig}")
-                    
-                    # Suggestion
-                    if clause.get("unfavorable"):
-                        st.markdown("**Suggested Action:**")
-                        st.success(clause.get("suggestion", "Seek legal advice"))
+                    render_clause(clause)
         
         else:
             st.warning("No clauses extracted from contract")
@@ -446,8 +520,12 @@ with tab4:
                 st.write("No dates found")
             
             st.subheader("Locations & Jurisdiction")
+            places = entities.get("places", [])
             locations = entities.get("locations", [])
-            if locations:
+            if places:
+                for place in places:
+                    st.write(f"• {place['name']} ({place['kind'].replace('_', ' ')}, `{place['id']}`)")
+            elif locations:
                 for loc in locations:
                     st.write(f"• {loc}")
             else:
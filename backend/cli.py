@@ -0,0 +1,229 @@
+"""
+Batch Command Line Interface - Analyze many contracts with a worker pool
+
+Usage:
+    python -m backend.cli contracts/ --jobs 8 --output results.jsonl
+    python -m backend.cli "archive/**/*.pdf" --offline --checkpoint run.ckpt
+    python -m backend.cli --manifest files.txt
+    python -m backend.cli contracts/ --offline --entity-index portfolio.idx
+
+Writes one JSON line per contract as soon as it finishes and prints a
+throughput summary (files/sec, p50/p95 latency, failures) to stderr. With
+--entity-index, every contract's normalized dates and amounts are added to a
+columnar index that backend.portfolio can filter without re-reading files
+"""
+import argparse
+import glob
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, Iterable, List, Set
+
+
+SUPPORTED_EXTENSIONS = (".pdf", ".docx", ".txt")
+
+
+class NamedBytesIO(io.BytesIO):
+    """In-memory upload with a .name, the interface analyze_contract expects"""
+
+    def __init__(self, data: bytes, name: str):
+        super().__init__(data)
+        self.name = name
+
+
+def collect_inputs(paths: Iterable[str], manifest: str = None) -> List[str]:
+    """Expand directories, glob patterns and an optional manifest into contract files"""
+    candidates = []
+    if manifest:
+        with open(manifest, "r", encoding="utf-8") as f:
+            candidates.extend(line.strip() for line in f if line.strip() and not line.startswith("#"))
+
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, files in os.walk(path):
+                candidates.extend(os.path.join(root, name) for name in sorted(files))
+        elif glob.has_magic(path):
+            candidates.extend(sorted(glob.glob(path, recursive=True)))
+        else:
+            candidates.append(path)
+
+    seen = set()
+    files = []
+    for candidate in candidates:
+        if candidate.lower().endswith(SUPPORTED_EXTENSIONS) and candidate not in seen:
+            seen.add(candidate)
+            files.append(candidate)
+    return files
+
+
+def load_checkpoint(path: str) -> Set[str]:
+    """Files already completed in a previous run"""
+    if not path or not os.path.exists(path):
+        return set()
+    with open(path, "r", encoding="utf-8") as f:
+        return {line.rstrip("\n") for line in f if line.strip()}
+
+
+def _init_worker(offline: bool, tiered: bool = False, scheduler_state: str = None):
+    """Configure each worker process before the analyzer is created"""
+    # Batch jobs yield to interactive uploads and share one token budget
+    os.environ["LLM_LANE"] = "batch"
+    # The job pool already uses the CPUs; a per-worker PDF page pool would start
+    # jobs x cpu_count processes
+    os.environ["PDF_EXTRACT_WORKERS"] = "1"
+    if scheduler_state:
+        os.environ.setdefault("LLM_SCHEDULER_STATE_PATH", scheduler_state)
+    if offline:
+        os.environ["CONTRACT_ANALYSIS_OFFLINE"] = "1"
+    if tiered:
+        os.environ["TIERED_ANALYSIS"] = "1"
+
+
+def _analyze_file(path: str) -> Dict:
+    """Analyze one contract file in a worker process"""
+    from backend.main import analyze_contract
+
+    started = time.perf_counter()
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+        report = analyze_contract(NamedBytesIO(data, os.path.basename(path)))
+        ok = bool(report.get("success"))
+        error = None if ok else report.get("error")
+    except Exception as e:
+        report, ok, error = None, False, str(e)
+
+    return {
+        "path": path,
+        "ok": ok,
+        "error": error,
+        "elapsed_seconds": round(time.perf_counter() - started, 4),
+        "report": report
+    }
+
+
+def _percentile(values: List[float], percent: float) -> float:
+    """Nearest-rank percentile"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, int(round(percent / 100 * len(ordered) + 0.5)) - 1))
+    return ordered[rank]
+
+
+def summarize(latencies: List[float], failures: int, wall_seconds: float, skipped: int = 0) -> Dict:
+    """Throughput summary for a batch run"""
+    processed = len(latencies)
+    return {
+        "files": processed,
+        "failures": failures,
+        "skipped": skipped,
+        "wall_seconds": round(wall_seconds, 3),
+        "files_per_second": round(processed / wall_seconds, 3) if wall_seconds > 0 else 0.0,
+        "p50_latency_seconds": round(_percentile(latencies, 50), 4),
+        "p95_latency_seconds": round(_percentile(latencies, 95), 4)
+    }
+
+
+def run_batch(files: List[str], jobs: int, output, offline: bool = False,
+              checkpoint: str = None, tiered: bool = False, entity_index=None) -> Dict:
+    """
+    Analyze files across a process pool, streaming JSON lines to output
+    Successful reports are also added to entity_index (an EntityIndex) when given
+    """
+    done = load_checkpoint(checkpoint)
+    pending = [path for path in files if path not in done]
+    latencies = []
+    failures = 0
+    started = time.perf_counter()
+
+    checkpoint_file = open(checkpoint, "a", encoding="utf-8") if checkpoint else None
+    scheduler_state = os.path.join(tempfile.gettempdir(), f"contract-analyze-{os.getpid()}.budget")
+    try:
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker,
+                                 initargs=(offline, tiered, scheduler_state)) as pool:
+            futures = {pool.submit(_analyze_file, path): path for path in pending}
+            for future in as_completed(futures):
+                try:
+                    result = future.result()
+                except Exception as e:
+                    # Worker crashed (e.g. killed); record it and keep going
+                    result = {"path": futures[future], "ok": False, "error": str(e),
+                              "elapsed_seconds": None, "report": None}
+
+                output.write(json.dumps(result, ensure_ascii=False, default=str) + "\n")
+                output.flush()
+
+                if result["elapsed_seconds"] is not None:
+                    latencies.append(result["elapsed_seconds"])
+                if result["ok"] and entity_index is not None:
+                    try:
+                        entity_index.add(result["path"], result["report"].get("normalized_entities") or {})
+                    except Exception as e:
+                        # The report is already written; an unindexable one must not stop the batch
+                        print(f"Not indexed: {result['path']}: {e}", file=sys.stderr)
+                if not result["ok"]:
+                    failures += 1
+                elif checkpoint_file:
+                    checkpoint_file.write(result["path"] + "\n")
+                    checkpoint_file.flush()
+    finally:
+        if checkpoint_file:
+            checkpoint_file.close()
+        if os.path.exists(scheduler_state):
+            os.remove(scheduler_state)
+
+    return summarize(latencies, failures, time.perf_counter() - started, skipped=len(files) - len(pending))
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="contract-analyze",
+        description="Analyze a directory, glob or manifest of contracts and stream JSONL results"
+    )
+    parser.add_argument("inputs", nargs="*", help="Contract files, directories or glob patterns")
+    parser.add_argument("--manifest", help="File listing one contract path per line")
+    parser.add_argument("--jobs", "-j", type=int, default=os.cpu_count() or 1,
+                        help="Worker processes (default: CPU count)")
+    parser.add_argument("--offline", action="store_true",
+                        help="Rule-based analysis only; never call the LLM API")
+    parser.add_argument("--tiered", action="store_true",
+                        help="Send only risky or sensitive clauses to the LLM")
+    parser.add_argument("--checkpoint", help="Record finished files here and skip them on re-run")
+    parser.add_argument("--output", "-o", help="JSONL output file (default: stdout)")
+    parser.add_argument("--entity-index", help="Add normalized dates and amounts to this index file")
+    return parser
+
+
+def main(argv: List[str] = None) -> int:
+    args = build_parser().parse_args(argv)
+    files = collect_inputs(args.inputs, args.manifest)
+    if not files:
+        print("No PDF, DOCX or TXT contracts found", file=sys.stderr)
+        return 2
+
+    entity_index = None
+    if args.entity_index:
+        from backend.utils.entity_index import EntityIndex
+        entity_index = EntityIndex.load(args.entity_index) if os.path.exists(args.entity_index) else EntityIndex()
+
+    output = open(args.output, "a" if args.checkpoint else "w", encoding="utf-8") if args.output else sys.stdout
+    try:
+        summary = run_batch(files, max(1, args.jobs), output, offline=args.offline,
+                            checkpoint=args.checkpoint, tiered=args.tiered, entity_index=entity_index)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+        if entity_index is not None:
+            entity_index.save(args.entity_index)
+
+    print(json.dumps({"summary": summary}), file=sys.stderr)
+    return 1 if summary["failures"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
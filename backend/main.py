@@ -2,83 +2,413 @@
 Main Analysis Pipeline - Orchestrates contract analysis workflow
 """
 import io
-from typing import Dict, List
-from backend.utils.file_reader import extract_text, clean_text, extract_metadata
+import os
+import json
+import hashlib
+import contextvars
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, Iterator, List, Optional, Union
+from backend.utils.file_reader import (
+    extract_text, clean_text, normalize_text, extract_metadata, iter_text_chunks, EXTRACTOR_VERSION
+)
 from backend.utils.clause_extractor import (
     extract_clauses,
     identify_obligations,
     identify_rights,
-    detect_ambiguities
+    detect_ambiguities,
+    IMPORTANT_CLAUSES,
+    HIGH_RISK_KEYWORDS,
+    MEDIUM_RISK_KEYWORDS,
+    AMBIGUOUS_PHRASES
 )
 from backend.utils.risk_engine import (
     analyze_clause,
+    analyze_clauses_batch,
     overall_risk,
-    get_contract_summary
+    get_contract_summary,
+    get_analyzer,
+    RiskAnalyzer,
+    CRITICAL_CONTRACT_KEYWORDS,
+    LEGAL_ADVISOR_SYSTEM_PROMPT
+)
+from backend.utils.ner import extract_entities, ner_backend_version, scan_entities
+from backend.utils.entity_normalizer import normalize_entities, to_report
+from backend.utils.contract_classifier import classify_contract_type, ContractClassifier
+from backend.utils.document import Document, SECTION_SPLIT_PATTERN, sentence_backend
+from backend.utils.gazetteer import get_gazetteer
+from backend.utils.perf import PerfRecorder, recording
+from backend.utils.result_cache import ResultCache, get_result_cache
+
+
+# Upper bound on LLM requests in flight for a single contract
+MAX_CONCURRENT_ANALYSES = int(os.getenv("MAX_CONCURRENT_ANALYSES", "4"))
+
+# Clauses packed into one structured-output request (1 = one request per clause)
+CLAUSE_BATCH_SIZE = int(os.getenv("CLAUSE_BATCH_SIZE", "5"))
+
+# Longest unfinished section held back in streaming mode before it is processed anyway
+STREAM_MAX_CARRY = 20000
+
+# Tiered analysis (enabled per call or with TIERED_ANALYSIS=1): score every clause
+# with the rule engine and send only risky or sensitive clauses to the LLM, at
+# most TIER_MAX_LLM_CLAUSES per contract
+TIER_ESCALATION_SCORE = float(os.getenv("TIER_ESCALATION_SCORE", "1.0"))
+TIER_SENSITIVE_TYPES = tuple(
+    t.strip() for t in os.getenv("TIER_SENSITIVE_TYPES", "liability,termination,non-compete").split(",") if t.strip()
 )
-from backend.utils.ner import extract_entities
-from backend.utils.contract_classifier import classify_contract_type
+TIER_MAX_LLM_CLAUSES = int(os.getenv("TIER_MAX_LLM_CLAUSES", "6"))
+
+# Bump when pipeline code changes what a report contains; rule tables, prompts
+# and the model are folded into engine_version automatically
+PIPELINE_VERSION = "6"
+
+_rules_fingerprint = None
+
+
+def _rule_tables_fingerprint() -> str:
+    """Hash of the keyword and weight tables the rule engine and classifier score with"""
+    global _rules_fingerprint
+    if _rules_fingerprint is None:
+        tables = {
+            "important_clauses": IMPORTANT_CLAUSES,
+            "high_risk": HIGH_RISK_KEYWORDS,
+            "medium_risk": MEDIUM_RISK_KEYWORDS,
+            "ambiguous": AMBIGUOUS_PHRASES,
+            "critical": CRITICAL_CONTRACT_KEYWORDS,
+            "weights": [RiskAnalyzer.CRITICAL_HIGH_RISK_WEIGHTS, RiskAnalyzer.MEDIUM_RISK_WEIGHTS,
+                        RiskAnalyzer.LOW_RISK_WEIGHTS],
+            "contract_types": {
+                name: getattr(ContractClassifier, name)
+                for name in dir(ContractClassifier) if name.endswith("_KEYWORDS")
+            }
+        }
+        canonical = json.dumps(tables, sort_keys=True, ensure_ascii=False)
+        _rules_fingerprint = hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+    return _rules_fingerprint
+
+
+def engine_version(batch_size: int = CLAUSE_BATCH_SIZE, tiered: bool = False) -> str:
+    """
+    Version of everything that shapes a report: pipeline, extractor, rule tables,
+    gazetteer data, NER backend, prompts, model and the analysis options; part of every result cache key
+    """
+    analyzer = get_analyzer()
+    material = {
+        "pipeline": PIPELINE_VERSION,
+        "extractor": EXTRACTOR_VERSION,
+        "rules": _rule_tables_fingerprint(),
+        "sentences": sentence_backend(),
+        "gazetteer": get_gazetteer().version,
+        "ner": ner_backend_version(),
+        "prompts": [analyzer.CLAUSE_PROMPT_VERSION, analyzer.OVERVIEW_PROMPT_VERSION,
+                    analyzer.BATCH_PROMPT_VERSION,
+                    hashlib.sha256(LEGAL_ADVISOR_SYSTEM_PROMPT.encode("utf-8")).hexdigest()],
+        "model": "offline" if analyzer.offline else analyzer.model,
+        "batched": batch_size > 1,
+        "tiers": [TIER_ESCALATION_SCORE, list(TIER_SENSITIVE_TYPES), TIER_MAX_LLM_CLAUSES] if tiered else None
+    }
+    digest = hashlib.sha256(json.dumps(material, sort_keys=True).encode("utf-8")).hexdigest()
+    return f"{PIPELINE_VERSION}-{digest[:16]}"
+
+
+def _analyze_clause_safely(clause_text: str, clause_type: str, keywords: Optional[Dict] = None) -> Dict:
+    """Analyze one clause, falling back to rule-based scoring if the call fails"""
+    try:
+        return analyze_clause(clause_text, clause_type, keywords)
+    except Exception:
+        return get_analyzer()._fallback_analysis(clause_text, clause_type, keywords, fallback=True)
+
+
+def _analyze_single_safely(group: List[tuple]) -> List[Dict]:
+    """Analyze a one-clause group of (clause_text, clause_type, keywords) with its own request"""
+    return [_analyze_clause_safely(*group[0])]
+
+
+def _analyze_batch_safely(batch: List[tuple]) -> List[Dict]:
+    """Analyze a batch of (clause_text, clause_type, keywords), falling back to rule-based scoring if the call fails"""
+    pairs = [(text, ctype) for text, ctype, _ in batch]
+    keywords = [found for _, _, found in batch]
+    try:
+        return analyze_clauses_batch(pairs, keywords)
+    except Exception:
+        analyzer = get_analyzer()
+        return [analyzer._fallback_analysis(text, ctype, found, fallback=True) for text, ctype, found in batch]
+
+
+def triage_clauses(items: List[tuple], escalation_score: float = TIER_ESCALATION_SCORE,
+                   sensitive_types=TIER_SENSITIVE_TYPES,
+                   max_llm_clauses: int = TIER_MAX_LLM_CLAUSES,
+                   keywords: Optional[List[Optional[Dict]]] = None):
+    """
+    Score (clause_text, clause_type) pairs with the rule engine and pick the ones worth an LLM call
+    A clause escalates if its rule score reaches escalation_score or its type is
+    sensitive; above max_llm_clauses, sensitive and higher-scoring clauses win
+    keywords, if given, holds each clause's keyword-engine hits so clauses are not rescanned
+    Returns: (rule_analyses, escalated indices in clause order)
+    """
+    analyzer = get_analyzer()
+    keywords = keywords or [None] * len(items)
+    rule_analyses = [
+        analyzer._fallback_analysis(text, ctype, found) for (text, ctype), found in zip(items, keywords)
+    ]
+    
+    candidates = [
+        i for i, ((_, ctype), analysis) in enumerate(zip(items, rule_analyses))
+        if ctype in sensitive_types or analysis["risk_score"] >= escalation_score
+    ]
+    if max_llm_clauses is not None and max_llm_clauses >= 0 and len(candidates) > max_llm_clauses:
+        candidates.sort(key=lambda i: (items[i][1] in sensitive_types, rule_analyses[i]["risk_score"]), reverse=True)
+        candidates = candidates[:max_llm_clauses]
+    
+    return rule_analyses, sorted(candidates)
+
+
+def analyze_clauses_concurrently(clauses: List[Dict], contract_text: Union[str, Document],
+                                 max_workers: int = MAX_CONCURRENT_ANALYSES,
+                                 batch_size: int = CLAUSE_BATCH_SIZE,
+                                 tiered: bool = False,
+                                 on_verdict: Optional[Callable[[int, Dict], None]] = None):
+    """
+    Fan out the contract overview and every clause analysis together
+    With batch_size > 1, clauses are sent batch_size at a time in one request
+    With tiered, only clauses escalated by triage_clauses go to the LLM and the
+    rest keep their rule-engine verdict
+    Each analysis gets a "tier": "llm", "rules" (never sent: triaged out or
+    offline) or "rules_fallback" (sent to the LLM but answered by the rule engine)
+    on_verdict(clause_index, analysis) is called in the calling thread as each
+    analysis lands: triaged-out clauses first, then LLM verdicts in completion order
+    Returns: (contract_summary, risk_analyses) with analyses in clause order
+    """
+    max_workers = max(1, max_workers)
+    doc = Document.ensure(contract_text)
+    all_items = [
+        (clause.get("full_text", clause.get("text", "")), clause.get("type", "General"))
+        for clause in clauses
+    ]
+    # Rule-based scoring reads each clause's hits from the document's single keyword scan
+    all_keywords = [doc.keywords_in(*clause["span"]) if "span" in clause else None for clause in clauses]
+    if tiered:
+        risk_analyses, escalated = triage_clauses(all_items, keywords=all_keywords)
+    else:
+        risk_analyses, escalated = [None] * len(all_items), list(range(len(all_items)))
+    if on_verdict:
+        escalated_set = set(escalated)
+        for i, analysis in enumerate(risk_analyses):
+            if analysis is not None and i not in escalated_set:
+                on_verdict(i, analysis)
+    
+    def submit(fn, *args):
+        # Run each task in a copy of the caller's context so the active PerfRecorder follows it
+        return pool.submit(contextvars.copy_context().run, fn, *args)
+    
+    def deliver(indices: List[int], analyses: List[Dict]):
+        for i, analysis in zip(indices, analyses):
+            risk_analyses[i] = dict(analysis, tier=analysis.get("tier", "llm"))
+            if on_verdict:
+                on_verdict(i, risk_analyses[i])
+    
+    group_size = batch_size if batch_size > 1 else 1
+    run_group = _analyze_batch_safely if batch_size > 1 else _analyze_single_safely
+    index_groups = [escalated[i:i + group_size] for i in range(0, len(escalated), group_size)]
+    
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        summary_future = submit(get_contract_summary, doc.text)
+        pending = {
+            submit(run_group, [all_items[i] + (all_keywords[i],) for i in indices]): indices
+            for indices in index_groups
+        }
+        
+        for future in as_completed(pending):
+            deliver(pending[future], future.result())
+        
+        contract_summary = summary_future.result()
+    
+    return contract_summary, risk_analyses
 
 
-def analyze_contract(uploaded_file) -> Dict:
+def analyze_contract(uploaded_file, max_workers: int = MAX_CONCURRENT_ANALYSES,
+                     batch_size: int = CLAUSE_BATCH_SIZE, tiered: bool = None,
+                     on_event: Optional[Callable[[Dict], None]] = None) -> Dict:
     """
     Complete contract analysis pipeline
     Extracts clauses, analyzes risks, identifies entities, and provides recommendations
+    Clause analyses and the contract overview run concurrently, at most
+    max_workers LLM requests at a time, with batch_size clauses per request
+    With tiered, low-risk clauses keep their rule-engine verdict (see triage_clauses)
+    Per-stage and per-LLM-call metrics are attached under report["perf"]
+    Reports are shared through the result cache, keyed by the file bytes and
+    engine_version; report["result_cache"]["hit"] tells whether this one was
+    
+    on_event, if given, receives partial results in the calling thread as they are ready:
+      {"event": "progress", "stage": str, "fraction": float}
+      {"event": "classification", "classification": {...}}
+      {"event": "entities", "entities": {...}}
+      {"event": "clauses", "total": int}                      clauses awaiting a verdict
+      {"event": "clause", "index": int, "clause": {...}}      assembled clause, as analyzed
+      {"event": "summary", "contract_summary": {...}}        contract overview, as get_contract_summary returns it
+      {"event": "done", "report": {...}}                      also sent for failed analyses
     """
+    if tiered is None:
+        tiered = os.getenv("TIERED_ANALYSIS", "").lower() in ("1", "true", "yes")
+    recorder = PerfRecorder()
+    cache = get_result_cache()
+    cache_key, version, report = None, None, None
+    
+    if cache is not None:
+        with recorder.stage("result_cache") as stage:
+            try:
+                data = uploaded_file.read()
+                uploaded_file.seek(0)
+                version = engine_version(batch_size, tiered)
+                cache_key = ResultCache.make_key(data, os.path.splitext(uploaded_file.name)[1].lower(), version)
+                stage["bytes"] = len(data)
+                report = cache.get(cache_key)
+            except Exception:
+                # Analyze uncached if the upload cannot be re-read or the store fails
+                cache_key, report = None, None
+    
+    if report is not None:
+        report["file_info"]["name"] = uploaded_file.name
+        report["result_cache"] = {"hit": True, "engine_version": version}
+        report["perf"] = recorder.to_dict()
+        _replay_events(report, on_event)
+    else:
+        with recording(recorder):
+            report = _run_analysis(uploaded_file, recorder, max_workers, batch_size, tiered, on_event)
+        if cache_key is not None and _is_cacheable(report):
+            try:
+                cache.set(cache_key, {k: v for k, v in report.items() if k != "perf"}, engine_version=version)
+            except Exception:
+                # A locked or broken store (e.g. shared by --jobs workers) must not fail a finished analysis
+                pass
+        report["result_cache"] = {"hit": False, "engine_version": version}
+    
+    if on_event:
+        on_event({"event": "done", "report": report})
+    return report
+
+
+def _is_cacheable(report: Dict) -> bool:
+    """Only successful reports free of rule-engine fallbacks for failed LLM calls are shared"""
+    if not report.get("success"):
+        return False
+    if get_analyzer().offline:
+        return True
+    llm = report.get("perf", {}).get("llm", {})
+    return not llm.get("fallbacks") and not llm.get("errors")
+
+
+def _replay_events(report: Dict, on_event: Optional[Callable[[Dict], None]]):
+    """Send a cached report through on_event as if it had just been analyzed"""
+    if not on_event:
+        return
+    on_event({"event": "classification", "classification": report.get("contract_classification")})
+    on_event({"event": "entities", "entities": report.get("entities")})
+    on_event({"event": "clauses", "total": len(report.get("clauses", []))})
+    for index, clause in enumerate(report.get("clauses", [])):
+        on_event({"event": "clause", "index": index, "clause": clause})
+    on_event({"event": "summary", "contract_summary": report.get("contract_summary")})
+    on_event({"event": "progress", "stage": "overall_risk", "fraction": 1.0})
+
+
+# Share of the progress bar reached once each stage before the clause verdicts finishes
+PROGRESS_STAGES = {
+    "extract_text": 0.1,
+    "classify": 0.15,
+    "ner": 0.2,
+    "extract_clauses": 0.25,
+    "llm_analysis": 0.95,
+    "overall_risk": 1.0
+}
+
+
+def _run_analysis(uploaded_file, recorder: PerfRecorder, max_workers: int, batch_size: int,
+                  tiered: bool, on_event: Optional[Callable[[Dict], None]] = None) -> Dict:
+    """Pipeline body for analyze_contract, timed stage by stage"""
+    def emit(event: str, **payload):
+        if on_event:
+            on_event(dict(payload, event=event))
+    
+    def progress(stage: str, fraction: float = None):
+        emit("progress", stage=stage, fraction=PROGRESS_STAGES[stage] if fraction is None else fraction)
+    
     try:
         # Step 1: Extract text from file
-        text, file_type = extract_text(uploaded_file)
+        with recorder.stage("extract_text") as stage:
+            text, file_type = extract_text(uploaded_file)
+            stage["bytes"] = len(text.encode("utf-8")) if text else 0
+        progress("extract_text")
         
         if not text or len(text.strip()) < 100:
             return {
                 "success": False,
                 "error": "Contract file appears to be empty or unreadable",
                 "overall_risk": "Unknown",
-                "clauses": []
+                "clauses": [],
+                "perf": recorder.to_dict()
             }
         
-        # Step 2: Clean and normalize text
-        cleaned_text = clean_text(text)
+        text_bytes = len(text.encode("utf-8"))
+        
+        # Step 2: Clean and normalize text, preprocessed once for every stage
+        with recorder.stage("normalize", text_bytes):
+            cleaned_text, offset_map = normalize_text(text)
+            doc = Document(cleaned_text)
+        with recorder.stage("sentence_tokenize", text_bytes):
+            doc.sentence_spans
+        with recorder.stage("keyword_scan", text_bytes):
+            doc.keyword_hits
         
         # Step 3: Classify contract type
-        contract_info = classify_contract_type(cleaned_text)
+        with recorder.stage("classify", text_bytes):
+            contract_info = classify_contract_type(doc)
+        progress("classify")
+        emit("classification", classification=contract_info)
         
         # Step 4: Extract named entities
-        entities = extract_entities(cleaned_text)
+        with recorder.stage("ner", text_bytes):
+            entity_matches = list(scan_entities(doc))
+            entities = extract_entities(doc, entity_matches)
+            normalized_entities = to_report(normalize_entities(doc, entity_matches), offset_map.span_to_raw)
+        progress("ner")
+        emit("entities", entities=entities)
         
-        # Step 5: Get contract overview
-        contract_summary = get_contract_summary(cleaned_text)
+        # Step 5: Extract clauses
+        with recorder.stage("extract_clauses", text_bytes):
+            clauses = extract_clauses(doc, max_clauses=15)
+        progress("extract_clauses")
+        emit("clauses", total=len(clauses))
         
-        # Step 6: Extract clauses
-        clauses = extract_clauses(cleaned_text, max_clauses=15)
+        # Assembled as verdicts arrive when someone is listening, otherwise in step 7
+        streamed = {}
         
-        # Step 7: Analyze each clause
-        analyzed_clauses = []
-        for clause in clauses:
-            try:
-                risk_analysis = analyze_clause(clause.get("full_text", clause.get("text", "")), clause.get("type", "General"))
-                
-                # Use risk_analysis risk if available, otherwise fallback to clause extraction risk
-                final_risk = risk_analysis.get("risk", clause.get("risk_level", "Unknown"))
-                
-                analyzed_clause = {
-                    "type": clause.get("type", "General"),
-                    "title": clause.get("title", "Untitled Clause"),
-                    "text": clause.get("text", "")[:500],
-                    "risk": final_risk,
-                    "unfavorable": risk_analysis.get("unfavorable", False),
-                    "explanation": risk_analysis.get("explanation", ""),
-                    "suggestion": risk_analysis.get("suggestion", ""),
-                    "obligations": identify_obligations(clause.get("full_text", "")),
-                    "rights": identify_rights(clause.get("full_text", "")),
-                    "ambiguities": detect_ambiguities(clause.get("full_text", ""))
-                }
-                analyzed_clauses.append(analyzed_clause)
-            except Exception as e:
-                # Continue with next clause if one fails
-                continue
+        def on_verdict(index: int, analysis: Dict):
+            streamed[index] = _assemble_clause(doc, offset_map, clauses[index], analysis)
+            if streamed[index] is not None:
+                emit("clause", index=index, clause=streamed[index])
+            start, end = PROGRESS_STAGES["extract_clauses"], PROGRESS_STAGES["llm_analysis"]
+            progress("llm_analysis", start + (end - start) * len(streamed) / len(clauses))
+        
+        # Step 6: Get contract overview and clause risk analyses concurrently
+        with recorder.stage("llm_analysis", sum(len(c.get("full_text", "").encode("utf-8")) for c in clauses)):
+            contract_summary, risk_analyses = analyze_clauses_concurrently(
+                clauses, doc, max_workers=max_workers, batch_size=batch_size, tiered=tiered,
+                on_verdict=on_verdict if on_event else None
+            )
+        progress("llm_analysis")
+        emit("summary", contract_summary=contract_summary)
+        
+        # Step 7: Assemble each analyzed clause
+        with recorder.stage("assemble_clauses"):
+            if on_event:
+                analyzed_clauses = [streamed[i] for i in range(len(clauses)) if streamed.get(i) is not None]
+            else:
+                analyzed_clauses = _assemble_clauses(doc, offset_map, clauses, risk_analyses)
         
         # Step 8: Calculate overall risk
-        overall_risk_score = overall_risk(analyzed_clauses, cleaned_text)
+        with recorder.stage("overall_risk"):
+            overall_risk_score = overall_risk(analyzed_clauses, doc)
+        progress("overall_risk")
         
         # Prepare comprehensive report
         report = {
@@ -86,16 +416,24 @@ def analyze_contract(uploaded_file) -> Dict:
             "file_info": {
                 "name": uploaded_file.name,
                 "type": file_type,
-                "metadata": extract_metadata(cleaned_text)
+                "metadata": extract_metadata(doc)
             },
             "contract_classification": contract_info,
             "entities": entities,
+            "normalized_entities": normalized_entities,
             "overall_risk": overall_risk_score,
             "contract_summary": contract_summary,
             "clauses": analyzed_clauses,
             "high_risk_clauses": [c for c in analyzed_clauses if c.get("risk") == "High"],
             "unfavorable_clauses": [c for c in analyzed_clauses if c.get("unfavorable")],
-            "recommendations": generate_recommendations(analyzed_clauses)
+            "recommendations": generate_recommendations(analyzed_clauses),
+            "analysis_tiers": {
+                "mode": "tiered" if tiered else "full",
+                "llm": sum(1 for c in analyzed_clauses if c.get("tier") == "llm"),
+                "rules": sum(1 for c in analyzed_clauses if c.get("tier") == "rules"),
+                "rules_fallback": sum(1 for c in analyzed_clauses if c.get("tier") == "rules_fallback")
+            },
+            "perf": recorder.to_dict()
         }
         
         return report
@@ -105,8 +443,165 @@ def analyze_contract(uploaded_file) -> Dict:
             "success": False,
             "error": f"Error analyzing contract: {str(e)}",
             "overall_risk": "Unknown",
-            "clauses": []
+            "clauses": [],
+            "perf": recorder.to_dict()
+        }
+
+
+def _assemble_clauses(doc: Document, offset_map, clauses: List[Dict], risk_analyses: List[Dict]) -> List[Dict]:
+    """Combine extracted clauses with their risk analyses"""
+    analyzed_clauses = []
+    for clause, risk_analysis in zip(clauses, risk_analyses):
+        analyzed_clause = _assemble_clause(doc, offset_map, clause, risk_analysis)
+        if analyzed_clause is not None:
+            analyzed_clauses.append(analyzed_clause)
+    
+    return analyzed_clauses
+
+
+def _assemble_clause(doc: Document, offset_map, clause: Dict, risk_analysis: Dict) -> Optional[Dict]:
+    """Combine one extracted clause with its risk analysis; None if it cannot be assembled"""
+    try:
+        clause_sentences = doc.sentences_in(*clause["span"]) if "span" in clause else None
+        clause_keywords = doc.keywords_in(*clause["span"]) if "span" in clause else None
+        
+        # Use risk_analysis risk if available, otherwise fallback to clause extraction risk
+        final_risk = risk_analysis.get("risk", clause.get("risk_level", "Unknown"))
+        
+        return {
+            "type": clause.get("type", "General"),
+            "title": clause.get("title", "Untitled Clause"),
+            "text": clause.get("text", "")[:500],
+            "risk": final_risk,
+            "unfavorable": risk_analysis.get("unfavorable", False),
+            "explanation": risk_analysis.get("explanation", ""),
+            "suggestion": risk_analysis.get("suggestion", ""),
+            "obligations": identify_obligations(clause.get("full_text", ""), clause_sentences),
+            "rights": identify_rights(clause.get("full_text", ""), clause_sentences),
+            "ambiguities": detect_ambiguities(clause.get("full_text", ""), clause_keywords),
+            "source_span": offset_map.span_to_raw(*clause["span"]) if "span" in clause else None,
+            "tier": risk_analysis.get("tier")
+        }
+    except Exception:
+        # Skip a clause that fails rather than the whole report
+        return None
+
+
+def _split_settled(buffer: str, final: bool):
+    """
+    Split streamed text into (settled, carry)
+    Settled text ends just before the last section heading, so only the
+    unfinished tail section is held back for the next chunk
+    """
+    if final:
+        return buffer, ""
+    
+    boundary = None
+    for match in SECTION_SPLIT_PATTERN.finditer(buffer):
+        boundary = match.start()
+    
+    if not boundary and len(buffer) > STREAM_MAX_CARRY:
+        boundary = buffer.rfind("\n", 0, len(buffer) - 1) + 1 or len(buffer)
+    if not boundary:
+        return "", buffer
+    return buffer[:boundary], buffer[boundary:]
+
+
+def _merge_new_entities(known: Dict, found: Dict) -> Dict:
+    """Add newly found entities to known; return only the new ones"""
+    new = {}
+    for key, values in found.items():
+        if isinstance(values, dict):
+            nested = _merge_new_entities(known.setdefault(key, {}), values)
+            if nested:
+                new[key] = nested
+            continue
+        seen = known.setdefault(key, [])
+        fresh = [v for v in values if v not in seen]
+        if fresh:
+            seen.extend(fresh)
+            new[key] = fresh
+    return new
+
+
+def stream_contract(uploaded_file, max_clauses: int = 15) -> Iterator[Dict]:
+    """
+    Incremental rule-based analysis that starts before the whole file is read
+    Consumes iter_text_chunks and yields events as results become available:
+      {"event": "progress", "chars": int, "page": int|None}
+      {"event": "classification", "classification": {...}}   whenever the type changes
+      {"event": "entities", "entities": {...}}                newly found entities only
+      {"event": "clause", "clause": {...}}                    with rule-based risk
+      {"event": "done", ...}                                  final aggregates
+    Only the unfinished tail section is buffered, so memory stays bounded
+    """
+    buffer = ""
+    chars_read = 0
+    keyword_categories = {}
+    entities = {}
+    clauses = []
+    key_dates, key_amounts = {}, {}
+    classification = None
+    
+    def process(segment: str) -> Iterator[Dict]:
+        nonlocal classification
+        cleaned = clean_text(segment)
+        if not cleaned.strip():
+            return
+        doc = Document(cleaned)
+        
+        for category, keywords in doc.keyword_categories.items():
+            keyword_categories.setdefault(category, set()).update(keywords)
+        for label, value in ContractClassifier.get_key_dates(doc):
+            key_dates.setdefault(label, value)
+        for label, value in ContractClassifier.get_key_amounts(doc):
+            key_amounts.setdefault(label, value)
+        
+        contract_type, confidence = ContractClassifier.classify_keywords(keyword_categories)
+        is_nda, nda_confidence = ContractClassifier.nda_from_keywords(keyword_categories)
+        current = {
+            "type": contract_type,
+            "confidence": round(confidence, 2),
+            "is_nda": is_nda,
+            "nda_confidence": round(nda_confidence, 2)
         }
+        if classification is None or current["type"] != classification["type"] or current["is_nda"] != classification["is_nda"]:
+            yield {"event": "classification", "classification": current}
+        classification = current
+        
+        new_entities = _merge_new_entities(entities, extract_entities(doc))
+        if new_entities:
+            yield {"event": "entities", "entities": new_entities}
+        
+        remaining = max_clauses - len(clauses)
+        if remaining > 0:
+            for clause in extract_clauses(doc, max_clauses=remaining, min_clauses=1):
+                clause["risk"] = clause.get("risk_level", "Low")
+                clauses.append(clause)
+                yield {"event": "clause", "clause": clause}
+    
+    for chunk in iter_text_chunks(uploaded_file):
+        chars_read += len(chunk.text)
+        yield {"event": "progress", "chars": chars_read, "page": chunk.page}
+        settled, buffer = _split_settled(buffer + chunk.text, final=False)
+        if settled:
+            yield from process(settled)
+    
+    if buffer:
+        yield from process(buffer)
+    
+    if classification:
+        classification = dict(classification, key_dates=list(key_dates.items()), key_amounts=list(key_amounts.items()))
+    
+    yield {
+        "event": "done",
+        "chars": chars_read,
+        "contract_classification": classification,
+        "entities": entities,
+        "clauses": clauses,
+        "high_risk_clauses": [c for c in clauses if c.get("risk") == "High"],
+        "overall_risk": overall_risk(clauses, keyword_categories=keyword_categories)
+    }
 
 
 def generate_recommendations(clauses: List[Dict]) -> List[str]:
@@ -0,0 +1,110 @@
+"""
+Portfolio Queries - Filter many analyzed contracts by their dates and amounts
+
+Usage:
+    python -m backend.portfolio portfolio.idx --build results.jsonl
+    python -m backend.portfolio portfolio.idx --amount-min "₹50 lakh"
+    python -m backend.portfolio portfolio.idx --amount-min "50 lakh" --date-role end \\
+        --date-from 2026-10-01 --date-to 2026-12-31
+
+Works on the columnar entity index written by `backend.cli --entity-index`
+(or built here from its JSONL output), so no contract is re-extracted.
+Prints matching contracts, one per line; all given filters must hold
+"""
+import argparse
+import json
+import os
+import sys
+from datetime import date
+from typing import List, Set
+
+from backend.utils.entity_index import ROLES, EntityIndex
+from backend.utils.entity_normalizer import normalize_amount
+
+
+def build_index(index_path: str, results_paths: List[str]) -> EntityIndex:
+    """Add every report in backend.cli JSONL output to the index at index_path"""
+    index = EntityIndex.load(index_path) if os.path.exists(index_path) else EntityIndex()
+    for results_path in results_paths:
+        with open(results_path, "r", encoding="utf-8") as f:
+            EntityIndex.from_reports((json.loads(line) for line in f if line.strip()), index)
+    index.save(index_path)
+    return index
+
+
+def query(index: EntityIndex, amount_min: str = None, amount_max: str = None, currency: str = None,
+          amount_role: str = None, date_from: str = None, date_to: str = None, date_role: str = None) -> Set[str]:
+    """Contracts matching every given filter; amounts accept "₹50 lakh", "1.5 crore" or "500000" """
+    results = None
+
+    if amount_min or amount_max or amount_role:
+        low = normalize_amount(amount_min) if amount_min else None
+        high = normalize_amount(amount_max) if amount_max else None
+        # A currency written in a bound ("₹50 lakh") applies when none is given
+        currency = currency or next((bound[1] for bound in (low, high) if bound and bound[1]), None)
+        results = index.filter("amount", low[0] if low else None, high[0] if high else None,
+                               role=amount_role, currency=currency)
+
+    if date_from or date_to or date_role:
+        matched = index.filter("date", date_from, date_to, role=date_role)
+        results = matched if results is None else results & matched
+
+    return set(index.contracts) if results is None else results
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m backend.portfolio",
+        description="Filter analyzed contracts by normalized dates and amounts"
+    )
+    roles = [role for role in ROLES if role]
+    parser.add_argument("index", help="Entity index file")
+    parser.add_argument("--build", nargs="+", metavar="RESULTS",
+                        help="First add these backend.cli JSONL results to the index")
+    parser.add_argument("--amount-min", help='Smallest amount, e.g. "₹50 lakh"')
+    parser.add_argument("--amount-max", help="Largest amount")
+    parser.add_argument("--currency", help="ISO currency code (default: the bounds' currency)")
+    parser.add_argument("--amount-role", choices=roles, help="Only amounts with this label")
+    parser.add_argument("--date-from", help="Earliest date (YYYY-MM-DD)")
+    parser.add_argument("--date-to", help="Latest date (YYYY-MM-DD)")
+    parser.add_argument("--date-role", choices=roles, help='Only dates with this label, e.g. "end"')
+    parser.add_argument("--stats", action="store_true", help="Print index statistics instead")
+    return parser
+
+
+def main(argv: List[str] = None) -> int:
+    args = build_parser().parse_args(argv)
+    if args.build:
+        index = build_index(args.index, args.build)
+    elif os.path.exists(args.index):
+        index = EntityIndex.load(args.index)
+    else:
+        print(f"No entity index at {args.index}; build one with --build or backend.cli --entity-index",
+              file=sys.stderr)
+        return 2
+
+    if args.stats:
+        print(json.dumps(index.stats(), indent=2))
+        return 0
+
+    for bound in (args.amount_min, args.amount_max):
+        if bound and normalize_amount(bound) is None:
+            print(f"Not an amount: {bound}", file=sys.stderr)
+            return 2
+    for bound in (args.date_from, args.date_to):
+        try:
+            if bound:
+                date.fromisoformat(bound)
+        except ValueError:
+            print(f"Not a YYYY-MM-DD date: {bound}", file=sys.stderr)
+            return 2
+
+    matches = query(index, args.amount_min, args.amount_max, args.currency, args.amount_role,
+                    args.date_from, args.date_to, args.date_role)
+    for contract in sorted(matches):
+        print(contract)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
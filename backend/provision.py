@@ -0,0 +1,123 @@
+"""
+Provisioning - One-time download of the NLP data the pipeline can use
+
+Usage:
+    python -m backend.provision              # download NLTK punkt data, compile the gazetteer
+    python -m backend.provision --check      # report what is installed, download nothing
+    python -m backend.provision --nltk-dir ./nltk_data
+    python -m backend.provision --spacy      # also download the spaCy model for NER_BACKEND=spacy
+
+Nothing in the backend downloads at import or analysis time. Run this from
+setup (setup.sh / setup.bat) or a deployment build step; without the punkt
+data, sentences are split with a regex fallback instead. The gazetteer is
+compiled and pickled here too, so the first analysis does not pay for it
+"""
+import argparse
+import os
+import sys
+from typing import Dict, List
+
+
+NLTK_PACKAGES = {
+    "punkt_tab": "tokenizers/punkt_tab",
+    "punkt": "tokenizers/punkt",
+}
+DEFAULT_NLTK_DIR = os.path.expanduser("~/nltk_data")
+
+
+def check_nltk_data() -> Dict[str, bool]:
+    """Which NLTK packages are installed (all False if NLTK itself is missing)"""
+    try:
+        import nltk
+    except ImportError:
+        return {package: False for package in NLTK_PACKAGES}
+
+    installed = {}
+    for package, resource in NLTK_PACKAGES.items():
+        try:
+            nltk.data.find(resource)
+            installed[package] = True
+        except LookupError:
+            installed[package] = False
+    return installed
+
+
+def provision_nltk(download_dir: str = DEFAULT_NLTK_DIR) -> Dict[str, bool]:
+    """Download missing NLTK packages into download_dir; returns what is installed afterwards"""
+    import nltk
+
+    os.makedirs(download_dir, exist_ok=True)
+    if download_dir not in nltk.data.path:
+        nltk.data.path.append(download_dir)
+    for package, installed in check_nltk_data().items():
+        if not installed:
+            nltk.download(package, download_dir=download_dir, quiet=True)
+    return check_nltk_data()
+
+
+def provision_gazetteer() -> int:
+    """Compile the place gazetteer into its pickle cache; returns the number of places"""
+    from backend.utils.gazetteer import get_gazetteer
+    return len(get_gazetteer())
+
+
+def check_spacy_model() -> bool:
+    """Whether the spaCy model used by NER_BACKEND=spacy loads"""
+    from backend.utils.spacy_ner import get_nlp
+    return get_nlp() is not None
+
+
+def provision_spacy_model() -> bool:
+    """Download the spaCy model if it is missing; returns whether it is installed afterwards"""
+    import spacy.util
+    from backend.utils.spacy_ner import SPACY_MODEL
+
+    if not spacy.util.is_package(SPACY_MODEL):
+        from spacy.cli import download
+        download(SPACY_MODEL)
+    return spacy.util.is_package(SPACY_MODEL)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m backend.provision",
+        description="Download the NLP data used by the contract analysis pipeline"
+    )
+    parser.add_argument("--check", action="store_true", help="Only report what is installed")
+    parser.add_argument("--nltk-dir", default=DEFAULT_NLTK_DIR,
+                        help="Where to put NLTK data (must be on NLTK's search path, e.g. via NLTK_DATA)")
+    parser.add_argument("--spacy", action="store_true",
+                        help="Also download the spaCy model (only needed for NER_BACKEND=spacy)")
+    return parser
+
+
+def main(argv: List[str] = None) -> int:
+    args = build_parser().parse_args(argv)
+    try:
+        installed = check_nltk_data() if args.check else provision_nltk(args.nltk_dir)
+    except ImportError:
+        print("NLTK is not installed; run: pip install -r requirements.txt", file=sys.stderr)
+        return 1
+
+    from backend.utils.document import sentence_backend
+    for package, present in installed.items():
+        print(f"{'✓' if present else '-'} nltk:{package}")
+    if not args.check:
+        print(f"✓ gazetteer: {provision_gazetteer()} places")
+    spacy_ready = True
+    if args.spacy:
+        from backend.utils.spacy_ner import SPACY_MODEL
+        try:
+            spacy_ready = check_spacy_model() if args.check else provision_spacy_model()
+        except ImportError:
+            print("spaCy is not installed; run: pip install -r requirements.txt", file=sys.stderr)
+            return 1
+        print(f"{'✓' if spacy_ready else '-'} spacy:{SPACY_MODEL}")
+    # NLTK releases need either punkt_tab (3.8.2+) or punkt, not both
+    backend = sentence_backend()
+    print(f"Sentence splitter: {backend}")
+    return 0 if backend == "punkt" and spacy_ready else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,15 +2,25 @@
 Backend utilities for contract analysis
 """
 
-from .file_reader import extract_text, clean_text, extract_metadata
+from .file_reader import extract_text, clean_text, normalize_text, extract_metadata
 from .clause_extractor import extract_clauses, identify_obligations, identify_rights, detect_ambiguities
 from .risk_engine import analyze_clause, overall_risk, get_contract_summary, get_analyzer
-from .ner import extract_entities
+from .ner import extract_entities, scan_entities, EntityMatch, ner_backend
+from .gazetteer import Gazetteer, Place, get_gazetteer, find_places
+from .entity_normalizer import normalize_entities, NormalizedEntity
+from .entity_index import EntityIndex
 from .contract_classifier import classify_contract_type
+from .analysis_cache import AnalysisCache, get_analysis_cache, invalidate_analysis_cache, get_cache_stats
+from .text_cache import ExtractedTextCache, get_text_cache, get_text_cache_stats
+from .perf import PerfRecorder, to_prometheus, to_json_lines
+from .resilience import CircuitOpenError, get_circuit_stats
+from .scheduler import get_scheduler, get_scheduler_stats, use_lane
+from .result_cache import ResultCache, get_result_cache, warm_result_cache, get_result_cache_stats
 
 __all__ = [
     'extract_text',
     'clean_text',
+    'normalize_text',
     'extract_metadata',
     'extract_clauses',
     'identify_obligations',
@@ -21,5 +31,34 @@ __all__ = [
     'get_contract_summary',
     'get_analyzer',
     'extract_entities',
+    'scan_entities',
+    'EntityMatch',
+    'ner_backend',
+    'Gazetteer',
+    'Place',
+    'get_gazetteer',
+    'find_places',
+    'normalize_entities',
+    'NormalizedEntity',
+    'EntityIndex',
     'classify_contract_type',
+    'AnalysisCache',
+    'get_analysis_cache',
+    'invalidate_analysis_cache',
+    'get_cache_stats',
+    'ExtractedTextCache',
+    'get_text_cache',
+    'get_text_cache_stats',
+    'PerfRecorder',
+    'to_prometheus',
+    'to_json_lines',
+    'CircuitOpenError',
+    'get_circuit_stats',
+    'get_scheduler',
+    'get_scheduler_stats',
+    'use_lane',
+    'ResultCache',
+    'get_result_cache',
+    'warm_result_cache',
+    'get_result_cache_stats',
 ]
@@ -0,0 +1,112 @@
+"""
+Analysis Cache Module - Persistent content-addressed cache for LLM analyses
+Stores clause and overview results in SQLite so repeat analyses skip the API
+"""
+import hashlib
+import json
+import os
+from typing import Dict, Optional
+
+from backend.utils.sqlite_store import CACHE_DIR, CacheSingleton, SQLiteStore
+
+
+DEFAULT_CACHE_PATH = os.path.join(CACHE_DIR, "analysis_cache.sqlite3")
+DEFAULT_MAX_ENTRIES = 10000
+DEFAULT_TTL_SECONDS = 30 * 24 * 3600  # 30 days
+
+
+class AnalysisCache:
+    """
+    On-disk cache of LLM analysis results
+    Keys are derived from model name, prompt template version and a hash of the
+    analyzed text; eviction is LRU (max_entries) plus TTL (ttl_seconds)
+    """
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH,
+                 max_entries: int = DEFAULT_MAX_ENTRIES,
+                 ttl_seconds: float = DEFAULT_TTL_SECONDS):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._store = SQLiteStore(
+            path, "analyses",
+            ("kind TEXT NOT NULL", "model TEXT NOT NULL", "prompt_version TEXT NOT NULL", "value TEXT NOT NULL"),
+            max_entries=max_entries, ttl_seconds=ttl_seconds
+        )
+
+    @staticmethod
+    def make_key(kind: str, model: str, prompt_version: str, text: str, extra: str = "") -> str:
+        """Build a content-addressed cache key"""
+        text_hash = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        return f"{kind}:{model}:{prompt_version}:{extra}:{text_hash}"
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Return the cached analysis for key, or None on miss/expiry"""
+        with self._store.lock:
+            row = self._store.get(key, ("value",))
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return json.loads(row[0])
+
+    def set(self, key: str, value: Dict, kind: str = "", model: str = "", prompt_version: str = ""):
+        """Store an analysis and evict least recently used entries over capacity"""
+        self._store.set(key, kind=kind, model=model, prompt_version=prompt_version, value=json.dumps(value))
+
+    def invalidate(self, key: str = None, kind: str = None,
+                   model: str = None, prompt_version: str = None) -> int:
+        """
+        Remove matching entries; with no arguments the whole cache is cleared
+        Returns: number of entries removed
+        """
+        return self._store.delete(key=key, kind=kind, model=model, prompt_version=prompt_version)
+
+    def purge_expired(self) -> int:
+        """Remove all entries older than the TTL"""
+        return self._store.purge_expired()
+
+    def stats(self) -> Dict:
+        """Get hit/miss counters and current size"""
+        entries, = self._store.aggregate("COUNT(*)")
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 3) if lookups else 0.0,
+            "entries": entries,
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "path": self.path
+        }
+
+
+# Singleton instance
+_cache = CacheSingleton("ANALYSIS_CACHE", lambda: AnalysisCache(
+    path=os.getenv("ANALYSIS_CACHE_PATH", DEFAULT_CACHE_PATH),
+    max_entries=int(os.getenv("ANALYSIS_CACHE_MAX_ENTRIES", DEFAULT_MAX_ENTRIES)),
+    ttl_seconds=float(os.getenv("ANALYSIS_CACHE_TTL", DEFAULT_TTL_SECONDS))
+))
+
+
+def get_analysis_cache() -> Optional[AnalysisCache]:
+    """
+    Get or create the process-wide analysis cache
+    Configured via ANALYSIS_CACHE_PATH, ANALYSIS_CACHE_MAX_ENTRIES and
+    ANALYSIS_CACHE_TTL; set ANALYSIS_CACHE_DISABLED=1 to turn caching off
+    """
+    return _cache.get()
+
+
+def invalidate_analysis_cache(**filters) -> int:
+    """Wrapper function to invalidate cached analyses"""
+    cache = get_analysis_cache()
+    return cache.invalidate(**filters) if cache else 0
+
+
+def get_cache_stats() -> Dict:
+    """Wrapper function to get analysis cache statistics"""
+    cache = get_analysis_cache()
+    return cache.stats() if cache else {"enabled": False}
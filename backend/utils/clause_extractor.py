@@ -2,32 +2,9 @@
 Clause Extractor Module - Identifies and extracts clauses from contracts using NLP
 """
 import re
-from typing import List, Dict
-import nltk
-from nltk.tokenize import sent_tokenize
-from textblob import TextBlob
-
-# Download required NLTK data
-import os
-nltk_data_dir = os.path.expanduser('~/nltk_data')
-if not os.path.exists(nltk_data_dir):
-    os.makedirs(nltk_data_dir, exist_ok=True)
-
-try:
-    nltk.data.find('tokenizers/punkt_tab')
-except LookupError:
-    try:
-        nltk.download('punkt_tab', quiet=True)
-    except:
-        pass
-
-try:
-    nltk.data.find('tokenizers/punkt')
-except LookupError:
-    try:
-        nltk.download('punkt', quiet=True)
-    except:
-        pass
+from typing import List, Dict, Optional, Set, Union
+from backend.utils.document import Document, sent_tokenize
+from backend.utils.keyword_engine import get_keyword_engine
 
 
 IMPORTANT_CLAUSES = {
@@ -60,29 +37,52 @@ MEDIUM_RISK_KEYWORDS = [
     "liability cap", "insurance", "notice period", "notice requirement"
 ]
 
+AMBIGUOUS_PHRASES = [
+    "reasonable", "as appropriate", "suitable",
+    "appropriate manner", "best efforts", "commercially reasonable",
+    "upon request", "if necessary", "may vary",
+    "subject to", "without limitation"
+]
+
+
+def _clause_type_from_keywords(found: Dict[str, set]) -> str:
+    """First IMPORTANT_CLAUSES category (in declaration order) with a keyword hit"""
+    for ctype in IMPORTANT_CLAUSES:
+        if f"clause:{ctype}" in found:
+            return ctype
+    return None
+
+
+def _risk_from_keywords(found: Dict[str, set]) -> str:
+    """Risk level from keyword-engine hits"""
+    if "risk:high" in found:
+        return "High"
+    if "risk:medium" in found:
+        return "Medium"
+    return "Low"
+
 
-def extract_clauses(text: str, max_clauses: int = 20) -> List[Dict[str, any]]:
+def extract_clauses(text: Union[str, Document], max_clauses: int = 20,
+                    min_clauses: int = 5) -> List[Dict[str, any]]:
     """
     Extract meaningful legal clauses from contract text
     Uses multiple strategies: numbering, keywords, and sentence segmentation
+    Falls back to keyword sentences when fewer than min_clauses sections are found
+    Each clause records its (start, end) span in the document
     """
+    doc = Document.ensure(text)
     clauses = []
     seen_content = set()
     
     # Strategy 1: Split by numbered sections (1., 2., 3., etc.)
-    sections = re.split(r"\n\s*(?:\d+[\.\)]\s+|[A-Z]\.\s+)", text)
-    
-    for section in sections:
-        section = section.strip()
+    for start, end in doc.section_spans:
+        section = doc.text[start:end]
         if len(section) < 50:  # Lowered from 100
             continue
         
         # Find matching clause category
-        clause_type = None
-        for ctype, keywords in IMPORTANT_CLAUSES.items():
-            if any(kw in section.lower() for kw in keywords):
-                clause_type = ctype
-                break
+        found = doc.keywords_in(start, end)
+        clause_type = _clause_type_from_keywords(found)
         
         if not clause_type:
             clause_type = "General"  # Don't skip, mark as General
@@ -98,18 +98,19 @@ def extract_clauses(text: str, max_clauses: int = 20) -> List[Dict[str, any]]:
         
         # Extract sentences for better readability
         try:
-            sentences = sent_tokenize(section)
+            sentences = doc.sentences_in(start, end)
             clause_text = " ".join(sentences[:5])  # First 5 sentences
         except:
             clause_text = section[:500]
         
-        risk_level = calculate_clause_risk(section)
+        risk_level = _risk_from_keywords(found)
         
         clauses.append({
             "type": clause_type,
             "title": first_line if first_line else f"{clause_type.replace('_', ' ').title()} Clause",
             "text": clause_text[:1000],  # Limit length
             "full_text": section[:2000],
+            "span": (start, start + min(len(section), 2000)),
             "risk_level": risk_level
         })
         
@@ -117,26 +118,30 @@ def extract_clauses(text: str, max_clauses: int = 20) -> List[Dict[str, any]]:
             break
     
     # Ensure minimum clauses extracted (fallback strategy)
-    if len(clauses) < 5:
-        additional_clauses = extract_clauses_by_keywords(text, max_clauses - len(clauses))
+    if len(clauses) < min_clauses:
+        additional_clauses = extract_clauses_by_keywords(doc, max_clauses - len(clauses))
         clauses.extend(additional_clauses)
     
     return clauses
 
 
-def extract_clauses_by_keywords(text: str, max_clauses: int) -> List[Dict[str, any]]:
+def extract_clauses_by_keywords(text: Union[str, Document], max_clauses: int) -> List[Dict[str, any]]:
     """
     Fallback method: Extract clauses by keyword matching
     """
+    doc = Document.ensure(text)
     clauses = []
     seen = set()
     
     # Find sentences containing important keywords
-    sentences = sent_tokenize(text)
-    
-    for ctype, keywords in IMPORTANT_CLAUSES.items():
-        for sentence in sentences:
-            if any(kw.lower() in sentence.lower() for kw in keywords):
+    sentence_spans = doc.sentence_spans
+    sentence_keywords = [doc.keywords_in(start, end) for start, end in sentence_spans]
+    
+    for ctype in IMPORTANT_CLAUSES:
+        category = f"clause:{ctype}"
+        for (start, end), found in zip(sentence_spans, sentence_keywords):
+            if category in found:
+                sentence = doc.text[start:end]
                 sent_hash = hash(sentence[:100])
                 if sent_hash not in seen:
                     seen.add(sent_hash)
@@ -145,7 +150,8 @@ def extract_clauses_by_keywords(text: str, max_clauses: int) -> List[Dict[str, a
                         "title": f"{ctype.replace('_', ' ').title()} Clause",
                         "text": sentence[:1000],
                         "full_text": sentence,
-                        "risk_level": calculate_clause_risk(sentence)
+                        "span": (start, end),
+                        "risk_level": _risk_from_keywords(found)
                     })
                 if len(clauses) >= max_clauses:
                     break
@@ -155,27 +161,10 @@ def extract_clauses_by_keywords(text: str, max_clauses: int) -> List[Dict[str, a
     return clauses
 
 
-def calculate_clause_risk(clause_text: str) -> str:
-    """
-    Calculate risk level of a clause
-    Returns: 'High', 'Medium', 'Low'
-    """
-    text_lower = clause_text.lower()
-    
-    # High risk keywords
-    if any(kw in text_lower for kw in HIGH_RISK_KEYWORDS):
-        return "High"
-    
-    # Medium risk keywords
-    if any(kw in text_lower for kw in MEDIUM_RISK_KEYWORDS):
-        return "Medium"
-    
-    return "Low"
-
-
-def identify_obligations(clause_text: str) -> List[str]:
+def identify_obligations(clause_text: str, sentences: Optional[List[str]] = None) -> List[str]:
     """
     Identify obligations in a clause
+    Pass pre-split sentences (e.g. Document.sentences_in) to skip re-tokenizing
     """
     obligations = []
     obligation_starters = [
@@ -183,7 +172,8 @@ def identify_obligations(clause_text: str) -> List[str]:
         "obligated to", "shall not", "may not", "prohibited"
     ]
     
-    sentences = sent_tokenize(clause_text)
+    if sentences is None:
+        sentences = sent_tokenize(clause_text)
     for sent in sentences:
         for starter in obligation_starters:
             if starter.lower() in sent.lower():
@@ -193,9 +183,10 @@ def identify_obligations(clause_text: str) -> List[str]:
     return obligations[:3]  # Return top 3
 
 
-def identify_rights(clause_text: str) -> List[str]:
+def identify_rights(clause_text: str, sentences: Optional[List[str]] = None) -> List[str]:
     """
     Identify rights in a clause
+    Pass pre-split sentences (e.g. Document.sentences_in) to skip re-tokenizing
     """
     rights = []
     right_starters = [
@@ -203,7 +194,8 @@ def identify_rights(clause_text: str) -> List[str]:
         "permitted to", "can", "allowed to", "shall have"
     ]
     
-    sentences = sent_tokenize(clause_text)
+    if sentences is None:
+        sentences = sent_tokenize(clause_text)
     for sent in sentences:
         for starter in right_starters:
             if starter.lower() in sent.lower():
@@ -213,20 +205,18 @@ def identify_rights(clause_text: str) -> List[str]:
     return rights[:3]  # Return top 3
 
 
-def detect_ambiguities(clause_text: str) -> List[str]:
+def detect_ambiguities(clause_text: str, keywords: Optional[Dict[str, Set[str]]] = None) -> List[str]:
     """
     Detect ambiguous language in clauses
+    Pass keywords (e.g. Document.keywords_in over the clause span) to skip rescanning the clause
     """
     ambiguities = []
-    ambiguous_phrases = [
-        "reasonable", "as appropriate", "suitable",
-        "appropriate manner", "best efforts", "commercially reasonable",
-        "upon request", "if necessary", "may vary",
-        "subject to", "without limitation"
-    ]
+    if keywords is None:
+        keywords = get_keyword_engine().categories(clause_text.lower())
+    found = keywords.get("ambiguity", set())
     
-    for phrase in ambiguous_phrases:
-        if phrase.lower() in clause_text.lower():
+    for phrase in AMBIGUOUS_PHRASES:
+        if phrase in found:
             ambiguities.append(f"'{phrase}' - vague term that could be interpreted differently")
     
     return ambiguities
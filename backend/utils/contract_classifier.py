@@ -1,7 +1,21 @@
 """
 Contract Classifier Module - Classifies contract types
 """
-from typing import Tuple
+import re
+from typing import Tuple, Union
+from backend.utils.document import Document
+
+
+# "<label>: <value>" lookups for key dates and amounts; the value is cut to 50
+# characters, so only a bounded stretch of the line is captured
+LABEL_VALUE_MAX_CHARS = 200
+LABEL_VALUE = r'[:\s]+([^\n]{1,' + str(LABEL_VALUE_MAX_CHARS) + r'})'
+EFFECTIVE_DATE_PATTERN = re.compile(r'effective date' + LABEL_VALUE, re.IGNORECASE)
+END_DATE_PATTERN = re.compile(r'(?:expiry|end date|termination date|expires)' + LABEL_VALUE, re.IGNORECASE)
+RENEWAL_DATE_PATTERN = re.compile(r'renewal' + LABEL_VALUE, re.IGNORECASE)
+TOTAL_AMOUNT_PATTERN = re.compile(r'(?:total|consideration)' + LABEL_VALUE, re.IGNORECASE)
+PAYMENT_PATTERN = re.compile(r'(?:salary|compensation|payment|fees|price)' + LABEL_VALUE, re.IGNORECASE)
+DEPOSIT_PATTERN = re.compile(r'(?:security|advance|earnest)' + LABEL_VALUE, re.IGNORECASE)
 
 
 class ContractClassifier:
@@ -44,21 +58,39 @@ class ContractClassifier:
         "proprietary", "disclosure", "confidentiality agreement"
     ]
     
+    @classmethod
+    def keyword_dictionaries(cls) -> dict:
+        """Keyword lists by category, as compiled into the shared keyword engine"""
+        return {
+            "employment": cls.EMPLOYMENT_KEYWORDS,
+            "vendor": cls.VENDOR_KEYWORDS,
+            "lease": cls.LEASE_KEYWORDS,
+            "partnership": cls.PARTNERSHIP_KEYWORDS,
+            "service": cls.SERVICE_KEYWORDS,
+            "nda": cls.NDA_KEYWORDS,
+        }
+    
     @staticmethod
-    def classify_contract(text: str) -> Tuple[str, float]:
+    def classify_contract(text: Union[str, Document]) -> Tuple[str, float]:
         """
         Classify contract type and return confidence score (0-1)
         Returns: (contract_type, confidence)
         """
-        text_lower = text.lower()
-        
+        return ContractClassifier.classify_keywords(Document.ensure(text).keyword_categories)
+    
+    @staticmethod
+    def classify_keywords(found: dict) -> Tuple[str, float]:
+        """
+        Classify from keyword-engine hits (category -> keywords found)
+        Lets streaming callers classify from hits accumulated across chunks
+        """
         # Count keyword matches for each type
         type_scores = {
-            "Employment Agreement": ContractClassifier._count_keywords(text_lower, ContractClassifier.EMPLOYMENT_KEYWORDS),
-            "Vendor/Supply Agreement": ContractClassifier._count_keywords(text_lower, ContractClassifier.VENDOR_KEYWORDS),
-            "Lease Agreement": ContractClassifier._count_keywords(text_lower, ContractClassifier.LEASE_KEYWORDS),
-            "Partnership Agreement": ContractClassifier._count_keywords(text_lower, ContractClassifier.PARTNERSHIP_KEYWORDS),
-            "Service Agreement": ContractClassifier._count_keywords(text_lower, ContractClassifier.SERVICE_KEYWORDS),
+            "Employment Agreement": len(found.get("contract:employment", ())),
+            "Vendor/Supply Agreement": len(found.get("contract:vendor", ())),
+            "Lease Agreement": len(found.get("contract:lease", ())),
+            "Partnership Agreement": len(found.get("contract:partnership", ())),
+            "Service Agreement": len(found.get("contract:service", ())),
         }
         
         # Find the highest scoring type
@@ -83,13 +115,17 @@ class ContractClassifier:
         return max_type, confidence
     
     @staticmethod
-    def is_nda(text: str) -> Tuple[bool, float]:
+    def is_nda(text: Union[str, Document]) -> Tuple[bool, float]:
         """
         Detect if contract is an NDA
         Returns: (is_nda, confidence)
         """
-        text_lower = text.lower()
-        score = ContractClassifier._count_keywords(text_lower, ContractClassifier.NDA_KEYWORDS)
+        return ContractClassifier.nda_from_keywords(Document.ensure(text).keyword_categories)
+    
+    @staticmethod
+    def nda_from_keywords(found: dict) -> Tuple[bool, float]:
+        """Detect an NDA from keyword-engine hits"""
+        score = len(found.get("contract:nda", ()))
         
         is_nda = score >= 2
         confidence = min(1.0, score / 3)
@@ -97,71 +133,63 @@ class ContractClassifier:
         return is_nda, confidence
     
     @staticmethod
-    def _count_keywords(text: str, keywords: list) -> int:
-        """Count how many keywords appear in text"""
-        count = 0
-        for keyword in keywords:
-            if keyword in text:
-                count += 1
-        return count
-    
-    @staticmethod
-    def get_key_dates(text: str) -> list:
+    def get_key_dates(text: Union[str, Document]) -> list:
         """Get important dates for the contract type"""
-        import re
-        
+        doc = Document.ensure(text)
+        text, text_lower = doc.text, doc.lower
         dates = []
         
         # Effective date
-        if "effective date" in text.lower():
-            match = re.search(r'effective date[:\s]+([^\n]+)', text, re.IGNORECASE)
+        if "effective date" in text_lower:
+            match = EFFECTIVE_DATE_PATTERN.search(text)
             if match:
                 dates.append(("Effective Date", match.group(1).strip()[:50]))
         
         # Expiry/End date
-        if any(term in text.lower() for term in ["expiry", "end date", "termination date", "expires"]):
-            match = re.search(r'(?:expiry|end date|termination date|expires)[:\s]+([^\n]+)', text, re.IGNORECASE)
+        if any(term in text_lower for term in ["expiry", "end date", "termination date", "expires"]):
+            match = END_DATE_PATTERN.search(text)
             if match:
                 dates.append(("End Date", match.group(1).strip()[:50]))
         
         # Renewal date
-        if "renewal" in text.lower():
-            match = re.search(r'renewal[:\s]+([^\n]+)', text, re.IGNORECASE)
+        if "renewal" in text_lower:
+            match = RENEWAL_DATE_PATTERN.search(text)
             if match:
                 dates.append(("Renewal Date", match.group(1).strip()[:50]))
         
         return dates
     
     @staticmethod
-    def get_key_amounts(text: str) -> list:
+    def get_key_amounts(text: Union[str, Document]) -> list:
         """Extract key financial amounts"""
-        import re
-        
+        doc = Document.ensure(text)
+        text, text_lower = doc.text, doc.lower
         amounts = []
         
         # Total value/consideration
-        if any(term in text.lower() for term in ["total consideration", "total amount", "total value"]):
-            match = re.search(r'(?:total|consideration)[:\s]+([^\n]+)', text, re.IGNORECASE)
+        if any(term in text_lower for term in ["total consideration", "total amount", "total value"]):
+            match = TOTAL_AMOUNT_PATTERN.search(text)
             if match:
                 amounts.append(("Total Consideration", match.group(1).strip()[:50]))
         
         # Salary/Payment
-        if any(term in text.lower() for term in ["salary", "compensation", "payment", "fees", "price"]):
-            match = re.search(r'(?:salary|compensation|payment|fees|price)[:\s]+([^\n]+)', text, re.IGNORECASE)
+        if any(term in text_lower for term in ["salary", "compensation", "payment", "fees", "price"]):
+            match = PAYMENT_PATTERN.search(text)
             if match:
                 amounts.append(("Payment Terms", match.group(1).strip()[:50]))
         
         # Security deposit/Advance
-        if any(term in text.lower() for term in ["security deposit", "advance", "earnest"]):
-            match = re.search(r'(?:security|advance|earnest)[:\s]+([^\n]+)', text, re.IGNORECASE)
+        if any(term in text_lower for term in ["security deposit", "advance", "earnest"]):
+            match = DEPOSIT_PATTERN.search(text)
             if match:
                 amounts.append(("Deposit/Advance", match.group(1).strip()[:50]))
         
         return amounts
 
 
-def classify_contract_type(text: str) -> dict:
+def classify_contract_type(text: Union[str, Document]) -> dict:
     """Wrapper function to classify contract"""
+    text = Document.ensure(text)
     contract_type, confidence = ContractClassifier.classify_contract(text)
     is_nda, nda_confidence = ContractClassifier.is_nda(text)
     
@@ -0,0 +1,208 @@
+"""
+Document Module - Shared preprocessed view of a contract
+Built once per analysis so every stage reuses the same lowercased text,
+sentence spans, section spans and token index instead of recomputing them
+"""
+import re
+import threading
+from bisect import bisect_right
+from functools import cached_property
+from typing import Callable, Dict, List, Set, Tuple, Union
+from backend.utils.keyword_engine import KeywordHit, get_keyword_engine, group_hits
+
+
+# Numbered or lettered section headings ("1.", "2)", "A. "). A match may only
+# start where a whitespace run starts, so blank or indented lines are scanned
+# once rather than from every newline in the run; the match can include the
+# previous line's trailing spaces, which sections trim anyway
+SECTION_SPLIT_PATTERN = re.compile(r"(?<!\s)[^\S\n]*\n\s*(?:\d+[\.\)]\s+|[A-Z]\.\s+)")
+TOKEN_PATTERN = re.compile(r"\S+")
+# Fallback sentence boundary: terminal punctuation (plus closing quotes/brackets) then whitespace
+SENTENCE_BREAK_PATTERN = re.compile(r"(?<=[.!?])[\"')\]]*\s+")
+
+Span = Tuple[int, int]
+
+_sentence_splitter: Callable[[str], List[str]] = None
+_sentence_backend = None
+_splitter_lock = threading.Lock()
+
+
+def lower_same_length(text: str) -> str:
+    """
+    Lowercase text without changing any offset: a character whose lowercase
+    form has a different length ('İ' -> 'i̇') is kept as it is
+    """
+    lowered = text.lower()
+    # str.lower never shortens a character, so equal lengths mean a 1:1 mapping
+    if len(lowered) == len(text):
+        return lowered
+    return "".join(lower if len(lower := char.lower()) == 1 else char for char in text)
+
+
+def _regex_sent_tokenize(text: str) -> List[str]:
+    """Split after ., ! or ? followed by whitespace; pieces are exact substrings of text"""
+    sentences = []
+    position = 0
+    for match in SENTENCE_BREAK_PATTERN.finditer(text):
+        sentence = text[position:match.start()].strip()
+        if sentence:
+            sentences.append(sentence)
+        position = match.end()
+    tail = text[position:].strip()
+    if tail:
+        sentences.append(tail)
+    return sentences
+
+
+def _load_sentence_splitter():
+    """Pick NLTK punkt if it and its data are installed, else the regex splitter (lock held)"""
+    global _sentence_splitter, _sentence_backend
+    try:
+        from nltk.tokenize import sent_tokenize as punkt_sent_tokenize
+        punkt_sent_tokenize("Probe sentence. Another one.")
+        _sentence_splitter, _sentence_backend = punkt_sent_tokenize, "punkt"
+    except (ImportError, LookupError):
+        # Never downloads here; install the data with `python -m backend.provision`
+        _sentence_splitter, _sentence_backend = _regex_sent_tokenize, "regex"
+
+
+def sent_tokenize(text: str) -> List[str]:
+    """Split text into sentences; NLTK is imported on first use, not at import time"""
+    if _sentence_splitter is None:
+        with _splitter_lock:
+            if _sentence_splitter is None:
+                _load_sentence_splitter()
+    return _sentence_splitter(text)
+
+
+def sentence_backend() -> str:
+    """Name of the sentence splitter in use: "punkt" or "regex" """
+    sent_tokenize("")
+    return _sentence_backend
+
+
+class Document:
+    """
+    Preprocessed contract text
+    - text / lower: original and lowercased text (same offsets)
+    - sentence_spans: (start, end) of each sentence
+    - section_spans: (start, end) of each numbered section, whitespace-trimmed
+    - token_spans / token_index: whitespace tokens and lowercase word -> token positions
+    - keyword_hits: every keyword-dictionary hit from one Aho-Corasick pass
+    Each derived view is computed lazily on first use and then reused.
+    """
+
+    def __init__(self, text: str):
+        self.text = text
+        self.lower = lower_same_length(text)
+
+    @classmethod
+    def ensure(cls, text: Union[str, "Document"]) -> "Document":
+        """Return text unchanged if it is already a Document, otherwise wrap it"""
+        return text if isinstance(text, Document) else cls(text)
+
+    def __len__(self) -> int:
+        return len(self.text)
+
+    @cached_property
+    def sentence_spans(self) -> List[Span]:
+        """Sentence boundaries located back in the original text"""
+        spans = []
+        position = 0
+        for sentence in sent_tokenize(self.text):
+            start = self.text.find(sentence, position)
+            if start == -1:
+                continue
+            end = start + len(sentence)
+            spans.append((start, end))
+            position = end
+        return spans
+
+    @cached_property
+    def _sentence_ends(self) -> List[int]:
+        return [end for _, end in self.sentence_spans]
+
+    @property
+    def sentences(self) -> List[str]:
+        """Sentence strings"""
+        return [self.text[start:end] for start, end in self.sentence_spans]
+
+    @cached_property
+    def section_spans(self) -> List[Span]:
+        """Numbered sections, split the same way as clause extraction expects"""
+        spans = []
+        position = 0
+        for match in SECTION_SPLIT_PATTERN.finditer(self.text):
+            spans.append(self._trim(position, match.start()))
+            position = match.end()
+        spans.append(self._trim(position, len(self.text)))
+        return spans
+
+    @cached_property
+    def token_spans(self) -> List[Span]:
+        """Whitespace-delimited tokens"""
+        return [m.span() for m in TOKEN_PATTERN.finditer(self.text)]
+
+    @cached_property
+    def token_index(self) -> Dict[str, List[int]]:
+        """Lowercase word (punctuation stripped) -> positions in token_spans"""
+        index: Dict[str, List[int]] = {}
+        for position, (start, end) in enumerate(self.token_spans):
+            word = self.lower[start:end].strip(".,;:!?()[]\"'")
+            if word:
+                index.setdefault(word, []).append(position)
+        return index
+
+    @cached_property
+    def keyword_hits(self) -> List[KeywordHit]:
+        """All keyword hits over the lowercased text, ordered by end offset"""
+        return get_keyword_engine().find_all(self.lower)
+
+    @cached_property
+    def _keyword_hit_starts(self) -> List[int]:
+        return sorted(hit.start for hit in self.keyword_hits)
+
+    @cached_property
+    def _keyword_hits_by_start(self) -> List[KeywordHit]:
+        return sorted(self.keyword_hits, key=lambda hit: hit.start)
+
+    @cached_property
+    def keyword_categories(self) -> Dict[str, Set[str]]:
+        """Category -> keywords found anywhere in the document"""
+        return group_hits(self.keyword_hits)
+
+    def keywords_in(self, start: int, end: int) -> Dict[str, Set[str]]:
+        """Category -> keywords whose hits lie entirely inside [start, end)"""
+        hits = self._keyword_hits_by_start
+        first = bisect_right(self._keyword_hit_starts, start - 1)
+        selected = []
+        for hit in hits[first:]:
+            if hit.start >= end:
+                break
+            if hit.end <= end:
+                selected.append(hit)
+        return group_hits(selected)
+
+    def sentences_in(self, start: int, end: int) -> List[str]:
+        """Sentences overlapping [start, end), clipped to that range"""
+        sentences = []
+        first = bisect_right(self._sentence_ends, start)
+        for s_start, s_end in self.sentence_spans[first:]:
+            if s_start >= end:
+                break
+            sentence = self.text[max(s_start, start):min(s_end, end)].strip()
+            if sentence:
+                sentences.append(sentence)
+        return sentences
+
+    def contains(self, phrase: str) -> bool:
+        """Case-insensitive substring test against the shared lowercased text"""
+        return phrase.lower() in self.lower
+
+    def _trim(self, start: int, end: int) -> Span:
+        """Shrink a span so it excludes leading and trailing whitespace"""
+        while start < end and self.text[start].isspace():
+            start += 1
+        while end > start and self.text[end - 1].isspace():
+            end -= 1
+        return start, end
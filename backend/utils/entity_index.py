@@ -0,0 +1,244 @@
+"""
+Entity Index Module - Columnar store of normalized dates and amounts across contracts
+Each column is a typed array (contract id, kind, role, currency, offsets,
+value), so tens of thousands of contracts take a few bytes per value and
+load in one read. Dates are stored as proleptic ordinals and amounts in
+hundredths; a per-kind sorted view answers range filters with bisect, e.g.
+"contracts over ₹50 lakh" and "contracts ending next quarter" without
+re-extracting any file
+"""
+import json
+import os
+import threading
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import date
+from decimal import ROUND_HALF_UP, Decimal
+from typing import Dict, Iterable, List, Optional, Set, Union
+
+
+KINDS = ("date", "amount")
+ROLES = ("", "effective", "end", "renewal", "total", "payment", "deposit")
+# Column name -> array typecode; all columns have one entry per value
+COLUMNS = {
+    "contract": "I",
+    "kind": "B",
+    "role": "B",
+    "currency": "B",
+    "start": "I",
+    "end": "I",
+    "value": "q",
+}
+FORMAT_VERSION = 1
+AMOUNT_SCALE = 100
+# Range of the signed 64-bit value column; amounts of 1e17 and above do not fit
+VALUE_MIN, VALUE_MAX = -2 ** 63, 2 ** 63 - 1
+
+
+def encode_value(kind: str, value: Union[date, Decimal, str]) -> int:
+    """Column value for a date (ISO string or date) or amount (Decimal or decimal string)"""
+    if kind == "date":
+        return (date.fromisoformat(value) if isinstance(value, str) else value).toordinal()
+    amount = Decimal(value) * AMOUNT_SCALE
+    return int(amount.to_integral_value(rounding=ROUND_HALF_UP))
+
+
+def decode_value(kind: str, value: int) -> Union[date, Decimal]:
+    if kind == "date":
+        return date.fromordinal(value)
+    return Decimal(value) / AMOUNT_SCALE
+
+
+class EntityIndex:
+    """
+    Append-mostly columnar index keyed by contract (a path, hash or any string)
+    Adding a contract that is already present replaces its values
+    """
+
+    def __init__(self):
+        self.contracts: List[str] = []
+        self.currencies: List[str] = [""]
+        self.columns: Dict[str, array] = {name: array(code) for name, code in COLUMNS.items()}
+        self._contract_ids: Dict[str, int] = {}
+        self._sorted: Dict[int, tuple] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.columns["value"])
+
+    def _contract_id(self, contract: str) -> int:
+        contract_id = self._contract_ids.get(contract)
+        if contract_id is None:
+            contract_id = self._contract_ids[contract] = len(self.contracts)
+            self.contracts.append(contract)
+        return contract_id
+
+    def _currency_id(self, currency: Optional[str]) -> int:
+        currency = currency or ""
+        if currency not in self.currencies:
+            self.currencies.append(currency)
+        return self.currencies.index(currency)
+
+    def _drop_rows(self, contract_id: int):
+        """Remove a contract's rows (lock held)"""
+        keep = [row for row, owner in enumerate(self.columns["contract"]) if owner != contract_id]
+        if len(keep) == len(self):
+            return
+        for name, column in self.columns.items():
+            self.columns[name] = array(column.typecode, (column[row] for row in keep))
+
+    def add(self, contract: str, normalized: Dict) -> int:
+        """
+        Index one contract's normalized entities, as found in a report under
+        "normalized_entities"; offsets are the source spans when present.
+        Values that cannot be encoded or do not fit the value column are skipped
+        Returns: number of values indexed
+        """
+        items = []
+        for kind, key in (("date", "dates"), ("amount", "amounts")):
+            for item in normalized.get(key, []):
+                try:
+                    value = encode_value(kind, item[kind])
+                except (KeyError, TypeError, ValueError, ArithmeticError):
+                    continue
+                if VALUE_MIN <= value <= VALUE_MAX:
+                    items.append((kind, item, value))
+        with self._lock:
+            known = contract in self._contract_ids
+            contract_id = self._contract_id(contract)
+            if known:
+                self._drop_rows(contract_id)
+            columns = self.columns
+            for kind, item, value in items:
+                start, end = item.get("source_span") or item.get("span") or (0, 0)
+                columns["contract"].append(contract_id)
+                columns["kind"].append(KINDS.index(kind))
+                columns["role"].append(ROLES.index(item.get("role") or ""))
+                columns["currency"].append(self._currency_id(item.get("currency")))
+                columns["start"].append(start)
+                columns["end"].append(end)
+                columns["value"].append(value)
+            self._sorted.clear()
+        return len(items)
+
+    def _sorted_view(self, kind_id: int) -> tuple:
+        """(values, rows) of one kind sorted by value, built on first use after a change"""
+        view = self._sorted.get(kind_id)
+        if view is None:
+            values = self.columns["value"]
+            rows = sorted((row for row, kind in enumerate(self.columns["kind"]) if kind == kind_id),
+                          key=values.__getitem__)
+            view = self._sorted[kind_id] = (array("q", (values[row] for row in rows)), array("I", rows))
+        return view
+
+    def rows(self, kind: str, low=None, high=None, role: str = None, currency: str = None) -> List[int]:
+        """
+        Row numbers of kind with low <= value <= high (either bound optional),
+        optionally restricted to a role and, for amounts, a currency
+        """
+        kind_id = KINDS.index(kind)
+        role_id = ROLES.index(role) if role is not None else None
+        currency_id = None
+        if currency is not None:
+            if currency not in self.currencies:
+                return []
+            currency_id = self.currencies.index(currency)
+
+        with self._lock:
+            values, rows = self._sorted_view(kind_id)
+            first = bisect_left(values, encode_value(kind, low)) if low is not None else 0
+            last = bisect_right(values, encode_value(kind, high)) if high is not None else len(values)
+            roles, currencies = self.columns["role"], self.columns["currency"]
+            return [
+                row for row in rows[first:last]
+                if (role_id is None or roles[row] == role_id)
+                and (currency_id is None or currencies[row] == currency_id)
+            ]
+
+    def filter(self, kind: str, low=None, high=None, role: str = None, currency: str = None) -> Set[str]:
+        """Contracts with at least one value matching rows(); combine results with & and |"""
+        owners = self.columns["contract"]
+        return {self.contracts[owners[row]] for row in self.rows(kind, low, high, role, currency)}
+
+    def values(self, contract: str) -> List[Dict]:
+        """Decoded values of one contract, in the order they were added"""
+        contract_id = self._contract_ids.get(contract)
+        if contract_id is None:
+            return []
+        columns = self.columns
+        values = []
+        for row, owner in enumerate(columns["contract"]):
+            if owner != contract_id:
+                continue
+            kind = KINDS[columns["kind"][row]]
+            values.append({
+                "kind": kind,
+                "value": decode_value(kind, columns["value"][row]),
+                "currency": self.currencies[columns["currency"][row]] or None,
+                "role": ROLES[columns["role"][row]],
+                "source_span": [columns["start"][row], columns["end"][row]]
+            })
+        return values
+
+    def save(self, path: str):
+        """Write a JSON header line followed by each column's raw bytes"""
+        with self._lock:
+            header = {
+                "format": FORMAT_VERSION,
+                "rows": len(self),
+                "contracts": self.contracts,
+                "currencies": self.currencies,
+                "columns": [[name, column.typecode, column.itemsize] for name, column in self.columns.items()]
+            }
+            temp_path = f"{path}.{os.getpid()}.tmp"
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            with open(temp_path, "wb") as f:
+                f.write(json.dumps(header, ensure_ascii=False).encode("utf-8") + b"\n")
+                for column in self.columns.values():
+                    f.write(column.tobytes())
+            os.replace(temp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> "EntityIndex":
+        with open(path, "rb") as f:
+            header = json.loads(f.readline().decode("utf-8"))
+            if header.get("format") != FORMAT_VERSION:
+                raise ValueError(f"Unsupported entity index format: {header.get('format')}")
+            index = cls()
+            for name, typecode, itemsize in header["columns"]:
+                column = array(typecode)
+                if column.itemsize != itemsize:
+                    raise ValueError(f"Entity index column {name} was written with {itemsize}-byte items")
+                column.frombytes(f.read(itemsize * header["rows"]))
+                index.columns[name] = column
+        index.contracts = header["contracts"]
+        index.currencies = header["currencies"]
+        index._contract_ids = {contract: i for i, contract in enumerate(index.contracts)}
+        return index
+
+    @classmethod
+    def from_reports(cls, records: Iterable[Dict], index: "EntityIndex" = None) -> "EntityIndex":
+        """
+        Build from batch results ({"path": ..., "report": {...}}, as written by
+        backend.cli) or bare reports keyed by their file name
+        """
+        index = cls() if index is None else index
+        for record in records:
+            report = record.get("report", record) or {}
+            normalized = report.get("normalized_entities")
+            if normalized is None:
+                continue
+            contract = record.get("path") or report.get("file_info", {}).get("name", "")
+            index.add(contract, normalized)
+        return index
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "contracts": len(self.contracts),
+                "values": len(self),
+                "dates": self.columns["kind"].count(KINDS.index("date")),
+                "amounts": self.columns["kind"].count(KINDS.index("amount")),
+                "currencies": [currency for currency in self.currencies if currency],
+                "bytes": sum(column.itemsize * len(column) for column in self.columns.values())
+            }
@@ -0,0 +1,221 @@
+"""
+Entity Normalizer Module - Machine-readable dates and amounts with offsets
+Turns the raw date and amount matches of the NER scan into ISO dates and
+Decimal amounts with an ISO currency code, understanding Indian lakh/crore
+scales and comma grouping. Every value keeps its offsets in the text, and
+dates or amounts introduced by a label ("Expiry Date:", "Security Deposit:")
+carry that label as their role
+"""
+import re
+from bisect import bisect_right
+from datetime import date
+from decimal import Decimal, InvalidOperation, localcontext
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple, Union
+
+from backend.utils.contract_classifier import (
+    DEPOSIT_PATTERN, EFFECTIVE_DATE_PATTERN, END_DATE_PATTERN, LABEL_VALUE_MAX_CHARS,
+    PAYMENT_PATTERN, RENEWAL_DATE_PATTERN, TOTAL_AMOUNT_PATTERN
+)
+from backend.utils.document import Document
+from backend.utils.ner import EntityMatch, scan_entities
+
+
+MONTH_NUMBERS = {
+    name: number for number, name in enumerate(
+        ["january", "february", "march", "april", "may", "june", "july",
+         "august", "september", "october", "november", "december"], 1
+    )
+}
+NUMERIC_DATE_PATTERN = re.compile(r'(\d{1,2})[/-](\d{1,2})[/-](\d{2,4})')
+NAMED_DATE_PATTERN = re.compile(r'(?:(\d{1,2})\s+)?([A-Za-z]+)\s+(?:(\d{1,2}),?\s+)?(\d{4})')
+
+CURRENCY_CODES = {
+    "₹": "INR", "rs": "INR", "rs.": "INR", "inr": "INR", "rupees": "INR",
+    "$": "USD", "usd": "USD", "dollars": "USD",
+    "€": "EUR", "eur": "EUR", "euros": "EUR",
+    "£": "GBP", "gbp": "GBP", "pounds": "GBP",
+}
+SCALE_FACTORS = {
+    "thousand": 10 ** 3, "thousands": 10 ** 3,
+    "lakh": 10 ** 5, "lakhs": 10 ** 5, "lac": 10 ** 5, "lacs": 10 ** 5,
+    "million": 10 ** 6, "millions": 10 ** 6, "mn": 10 ** 6,
+    "crore": 10 ** 7, "crores": 10 ** 7, "cr": 10 ** 7,
+    "billion": 10 ** 9, "billions": 10 ** 9, "bn": 10 ** 9,
+}
+# Lakh and crore only appear in Indian amounts
+INDIAN_SCALES = {"lakh", "lakhs", "lac", "lacs", "crore", "crores", "cr"}
+AMOUNT_PARTS_PATTERN = re.compile(r'(₹|\$|€|£|[A-Za-z]+\.?)|(\d[\d,]*(?:\.\d+)?)')
+
+# Role given to a date or amount that starts inside a label's value
+ROLE_PATTERNS = {
+    "date": [("effective", EFFECTIVE_DATE_PATTERN), ("end", END_DATE_PATTERN), ("renewal", RENEWAL_DATE_PATTERN)],
+    "amount": [("total", TOTAL_AMOUNT_PATTERN), ("payment", PAYMENT_PATTERN), ("deposit", DEPOSIT_PATTERN)],
+}
+
+# Most values kept per kind in a report
+NORMALIZED_LIMIT = 500
+
+
+class NormalizedEntity(NamedTuple):
+    """
+    A date (value: datetime.date) or amount (value: Decimal, currency: ISO code
+    or None when the text names none) found at text[start:end]
+    """
+    kind: str
+    raw: str
+    value: Union[date, Decimal]
+    currency: Optional[str]
+    start: int
+    end: int
+    role: str = ""
+
+
+def _year(digits: str) -> int:
+    year = int(digits)
+    if len(digits) == 2:
+        # Two-digit years: 00-69 are 2000s, 70-99 are 1900s
+        return year + (2000 if year < 70 else 1900)
+    return year
+
+
+def _safe_date(year: int, month: int, day: int) -> Optional[date]:
+    try:
+        return date(year, month, day)
+    except ValueError:
+        return None
+
+
+def normalize_date(raw: str) -> Optional[date]:
+    """
+    Parse a date as matched by the NER scan
+    Numeric dates are day-first (15/01/2024), falling back to month-first only
+    when the day-first reading is impossible (01/15/2024)
+    """
+    match = NUMERIC_DATE_PATTERN.fullmatch(raw.strip())
+    if match:
+        first, second, year_digits = match.groups()
+        if len(year_digits) == 3:
+            return None
+        year = _year(year_digits)
+        return _safe_date(year, int(second), int(first)) or _safe_date(year, int(first), int(second))
+
+    match = NAMED_DATE_PATTERN.fullmatch(raw.strip())
+    if match:
+        day_before, month_name, day_after, year_digits = match.groups()
+        month = MONTH_NUMBERS.get(month_name.lower())
+        day = day_before or day_after
+        if month and day and not (day_before and day_after):
+            return _safe_date(int(year_digits), month, int(day))
+    return None
+
+
+def normalize_amount(raw: str) -> Optional[Tuple[Decimal, Optional[str]]]:
+    """
+    Parse an amount as matched by the NER scan into (value, currency)
+    Grouping commas are dropped whatever their position ("12,00,000"), scale
+    words multiply ("1.5 crore" -> 15000000) and a bare lakh/crore amount is
+    taken to be in rupees
+    """
+    number = None
+    currency = None
+    scale = 1
+    indian_scale = False
+    for word, digits in AMOUNT_PARTS_PATTERN.findall(raw):
+        if digits:
+            if number is None:
+                number = digits.replace(",", "")
+            continue
+        word = word.lower()
+        bare = word.rstrip(".")
+        if bare in SCALE_FACTORS:
+            scale = SCALE_FACTORS[bare]
+            indian_scale = bare in INDIAN_SCALES
+        elif currency is None:
+            currency = CURRENCY_CODES.get(word) or CURRENCY_CODES.get(bare)
+
+    if not number:
+        return None
+    # Enough precision for the digits and the scale, so long numbers stay exact
+    with localcontext() as context:
+        context.prec = max(context.prec, len(number) + len(str(scale)))
+        try:
+            value = Decimal(number) * scale
+            # 1.5 crore is 15000000, not 15000000.0
+            if value == value.to_integral_value():
+                value = value.quantize(Decimal(1))
+        except InvalidOperation:
+            return None
+    if currency is None and indian_scale:
+        currency = "INR"
+    return value, currency
+
+
+def _label_spans(text: str, kind: str) -> List[Tuple[int, int, str]]:
+    """(start, end, role) of every labelled value of kind, sorted by start"""
+    spans = []
+    for role, pattern in ROLE_PATTERNS[kind]:
+        spans.extend((match.start(1), match.end(1), role) for match in pattern.finditer(text))
+    spans.sort()
+    return spans
+
+
+def _role(spans: List[Tuple[int, int, str]], starts: List[int], position: int) -> str:
+    """Role of the label value containing position"""
+    index = bisect_right(starts, position) - 1
+    while index >= 0 and position - spans[index][0] < LABEL_VALUE_MAX_CHARS:
+        start, end, role = spans[index]
+        if position < end:
+            return role
+        index -= 1
+    return ""
+
+
+def normalize_entities(text: Union[str, Document], matches: Iterable[EntityMatch] = None) -> List[NormalizedEntity]:
+    """
+    Normalize every date and amount in text, in text order; values that cannot
+    be parsed (31/02/2024) are left out. Pass matches to reuse an existing scan
+    """
+    text = Document.ensure(text).text
+    if matches is None:
+        matches = scan_entities(text)
+    labels = {kind: _label_spans(text, kind) for kind in ROLE_PATTERNS}
+    label_starts = {kind: [start for start, _, _ in spans] for kind, spans in labels.items()}
+
+    entities = []
+    for match in matches:
+        if match.kind == "date":
+            value, currency = normalize_date(match.value), None
+        elif match.kind == "amount":
+            parsed = normalize_amount(match.value)
+            value, currency = parsed if parsed else (None, None)
+        else:
+            continue
+        if value is not None:
+            role = _role(labels[match.kind], label_starts[match.kind], match.start)
+            entities.append(NormalizedEntity(match.kind, match.value, value, currency, match.start, match.end, role))
+    entities.sort(key=lambda entity: entity.start)
+    return entities
+
+
+def to_report(entities: Iterable[NormalizedEntity], span_to_source=None, limit: int = NORMALIZED_LIMIT) -> Dict:
+    """
+    JSON-ready {"dates": [...], "amounts": [...]}: ISO date strings and amounts as
+    decimal strings; span_to_source(start, end) adds each value's source_span
+    """
+    report = {"dates": [], "amounts": []}
+    for entity in entities:
+        key = "dates" if entity.kind == "date" else "amounts"
+        if len(report[key]) >= limit:
+            continue
+        item = {"raw": entity.raw}
+        if entity.kind == "date":
+            item["date"] = entity.value.isoformat()
+        else:
+            item["amount"] = str(entity.value)
+            item["currency"] = entity.currency
+        item["role"] = entity.role
+        item["span"] = [entity.start, entity.end]
+        if span_to_source is not None:
+            item["source_span"] = list(span_to_source(entity.start, entity.end))
+        report[key].append(item)
+    return report
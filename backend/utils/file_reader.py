@@ -2,36 +2,192 @@
 File Reader Module - Extracts text from PDF, DOCX, and TXT files
 """
 import io
-from docx import Document
-import pdfplumber
-from typing import Tuple
+import os
+import re
+import time
+import multiprocessing
+from bisect import bisect_right
+from typing import Iterator, List, NamedTuple, Optional, Tuple, Union
+from backend.utils.document import Document as ContractDocument
+from backend.utils.text_cache import ExtractedTextCache, get_text_cache
 
 
-def extract_text(uploaded_file) -> Tuple[str, str]:
+# Parallel PDF extraction settings; PDF_EXTRACT_WORKERS (0 = one per CPU) is read
+# per call so batch workers can lower it after this module is imported
+PDF_PAGE_TIMEOUT = float(os.getenv("PDF_PAGE_TIMEOUT", "30"))
+PDF_PARALLEL_MIN_PAGES = int(os.getenv("PDF_PARALLEL_MIN_PAGES", "16"))
+# How often the parent checks whether a worker has started the range it waits for
+PDF_RANGE_POLL_SECONDS = 0.25
+
+# Bump when extraction output changes so cached text is not reused
+EXTRACTOR_VERSION = "1"
+
+# Whitespace runs rewritten by normalize_text
+WHITESPACE_PATTERN = re.compile(r"\s+")
+
+# Blank-line paragraph separators used to chunk plain text
+PARAGRAPH_BREAK_PATTERN = re.compile(r"\n[ \t\r]*\n\s*")
+
+
+class TextChunk(NamedTuple):
+    """A streamed piece of document text"""
+    text: str
+    start: int  # offset of text[0] in the full extracted text
+    page: Optional[int]  # 1-based PDF page number, None for other formats
+
+
+# Per-process pdfplumber handle and shared range start times set by _init_pdf_worker
+_worker_pdf = None
+_worker_started = None
+
+
+def _init_pdf_worker(data: bytes, started):
+    """Open one pdfplumber handle per worker process"""
+    import pdfplumber
+    global _worker_pdf, _worker_started
+    _worker_pdf = pdfplumber.open(io.BytesIO(data))
+    _worker_started = started
+
+
+def _extract_page_range(start: int, end: int) -> List[str]:
+    """Extract pages [start, end) using the worker's own PDF handle"""
+    # Lets the parent time the range from now rather than from when it was queued
+    _worker_started[start] = time.time()
+    pages = []
+    for index in range(start, end):
+        page = _worker_pdf.pages[index]
+        pages.append(page.extract_text() or "")
+        page.close()  # release cached layout objects
+    return pages
+
+
+def _pool_context():
+    """Start workers fresh instead of forking a possibly multithreaded parent (e.g. Streamlit)"""
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+
+
+def _wait_for_range(result, started, start: int, timeout: float) -> Optional[List[str]]:
+    """Pages of the range at start, or None once it has run timeout seconds since a worker began it"""
+    while True:
+        began = started[start]
+        wait = began + timeout - time.time() if began else PDF_RANGE_POLL_SECONDS
+        if wait <= 0 and not result.ready():
+            return None
+        try:
+            return result.get(timeout=max(0.0, min(wait, PDF_RANGE_POLL_SECONDS)))
+        except multiprocessing.TimeoutError:
+            continue
+
+
+def iter_pdf_pages(data: bytes, workers: int = None, page_timeout: float = None) -> Iterator[str]:
     """
-    Extract text from uploaded file (PDF, DOCX, TXT)
-    Returns: (text, file_type)
+    Yield the text of every PDF page, in page order
+    Large documents are split into page ranges across a process pool. A range
+    still running page_timeout seconds per page after its worker started it is
+    abandoned: the pool is replaced and the range retried page by page, so
+    only a pathological page itself is yielded empty and the upload never stalls
+    """
+    if workers is None:
+        workers = int(os.getenv("PDF_EXTRACT_WORKERS", "0"))
+    workers = workers or os.cpu_count() or 1
+    page_timeout = PDF_PAGE_TIMEOUT if page_timeout is None else page_timeout
+    import pdfplumber
+    
+    with pdfplumber.open(io.BytesIO(data)) as pdf:
+        page_count = len(pdf.pages)
+        if workers <= 1 or page_count < PDF_PARALLEL_MIN_PAGES:
+            for page in pdf.pages:
+                yield page.extract_text() or ""
+                page.close()
+            return
+    
+    # Several ranges per worker keeps the pool balanced when pages vary in cost
+    chunk_size = max(1, -(-page_count // (workers * 4)))
+    ranges = [(start, min(start + chunk_size, page_count)) for start in range(0, page_count, chunk_size)]
+    
+    context = _pool_context()
+    done = {}  # ranges a replaced pool had already finished
+    while ranges:
+        started = context.Array("d", page_count, lock=False)
+        pool = context.Pool(processes=min(workers, len(ranges)), initializer=_init_pdf_worker,
+                            initargs=(data, started))
+        stuck = None
+        finished = False
+        try:
+            pending = [None if page_range in done else pool.apply_async(_extract_page_range, page_range)
+                       for page_range in ranges]
+            for index, ((start, end), result) in enumerate(zip(ranges, pending)):
+                pages = done.pop((start, end)) if result is None else _wait_for_range(
+                    result, started, start, page_timeout * (end - start)
+                )
+                if pages is None:
+                    stuck = index
+                    break
+                yield from pages
+            finished = stuck is None
+            if stuck is not None:
+                for page_range, result in zip(ranges[stuck + 1:], pending[stuck + 1:]):
+                    if result is not None and result.ready() and result.successful():
+                        done[page_range] = result.get()
+        finally:
+            # Stuck or abandoned workers are killed rather than waited for
+            if finished:
+                pool.close()
+            else:
+                pool.terminate()
+            pool.join()
+        
+        if stuck is None:
+            return
+        start, end = ranges[stuck]
+        if end - start > 1:
+            # Find the slow page; the others in its range are extracted normally
+            ranges = [(page, page + 1) for page in range(start, end)] + ranges[stuck + 1:]
+        else:
+            yield ""
+            ranges = ranges[stuck + 1:]
+
+
+def extract_pdf_pages(data: bytes, workers: int = None, page_timeout: float = None) -> List[str]:
+    """Extract the text of every PDF page, in page order (see iter_pdf_pages)"""
+    return list(iter_pdf_pages(data, workers=workers, page_timeout=page_timeout))
+
+
+def iter_text_chunks(uploaded_file) -> Iterator[TextChunk]:
+    """
+    Stream an uploaded file as page (PDF) or paragraph (DOCX, TXT) chunks
+    Chunk offsets index into the same text extract_text would return, so
+    concatenating chunk.text in order reproduces it
     """
     try:
         file_name = uploaded_file.name.lower()
         
         if file_name.endswith(".txt"):
             text = uploaded_file.read().decode("utf-8", errors="ignore")
-            return text, "txt"
+            position = 0
+            for match in PARAGRAPH_BREAK_PATTERN.finditer(text):
+                yield TextChunk(text[position:match.end()], position, None)
+                position = match.end()
+            if position < len(text):
+                yield TextChunk(text[position:], position, None)
         
         elif file_name.endswith(".docx"):
+            from docx import Document
             doc = Document(io.BytesIO(uploaded_file.read()))
-            text = "\n".join([p.text for p in doc.paragraphs if p.text.strip()])
-            return text, "docx"
+            paragraphs = [p.text for p in doc.paragraphs if p.text.strip()]
+            position = 0
+            for i, paragraph in enumerate(paragraphs):
+                chunk = paragraph if i == len(paragraphs) - 1 else paragraph + "\n"
+                yield TextChunk(chunk, position, None)
+                position += len(chunk)
         
         elif file_name.endswith(".pdf"):
-            text = ""
-            with pdfplumber.open(io.BytesIO(uploaded_file.read())) as pdf:
-                for page in pdf.pages:
-                    extracted = page.extract_text()
-                    if extracted:
-                        text += extracted + "\n"
-            return text, "pdf"
+            position = 0
+            for page_number, page in enumerate(iter_pdf_pages(uploaded_file.read()), 1):
+                if page:
+                    yield TextChunk(page + "\n", position, page_number)
+                    position += len(page) + 1
         
         else:
             raise ValueError(f"Unsupported file format: {file_name}")
@@ -40,24 +196,180 @@ def extract_text(uploaded_file) -> Tuple[str, str]:
         raise ValueError(f"Error reading file: {str(e)}")
 
 
+def extract_text(uploaded_file) -> Tuple[str, str]:
+    """
+    Extract text from uploaded file (PDF, DOCX, TXT)
+    Returns: (text, file_type)
+    """
+    text, file_type, _ = extract_text_with_pages(uploaded_file)
+    return text, file_type
+
+
+def _text_cache_get(cache: Optional[ExtractedTextCache], key: str, raw_size: int):
+    """Look up cached extracted text, ignoring cache failures"""
+    if cache is None:
+        return None
+    try:
+        return cache.get(key, raw_size=raw_size)
+    except Exception:
+        return None
+
+
+def _text_cache_set(cache: Optional[ExtractedTextCache], key: str, text: str, file_type: str,
+                    page_offsets: List[int], raw_size: int):
+    """Store extracted text, ignoring cache failures (a locked or corrupt cache file)"""
+    if cache is None:
+        return
+    try:
+        cache.set(key, text, file_type, page_offsets, raw_size=raw_size)
+    except Exception:
+        pass
+
+
+def extract_text_with_pages(uploaded_file) -> Tuple[str, str, List[int]]:
+    """
+    Extract text from uploaded file along with the start offset of each page
+    PDF and DOCX results are cached by the SHA-256 of the file bytes, so a
+    repeat upload skips parsing
+    Returns: (text, file_type, page_offsets)
+    """
+    try:
+        file_name = uploaded_file.name.lower()
+        
+        if file_name.endswith(".txt"):
+            text = uploaded_file.read().decode("utf-8", errors="ignore")
+            return text, "txt", [0]
+        
+        if not file_name.endswith((".docx", ".pdf")):
+            raise ValueError(f"Unsupported file format: {file_name}")
+        
+        data = uploaded_file.read()
+        cache = get_text_cache()
+        cache_key = ExtractedTextCache.make_key(data, EXTRACTOR_VERSION)
+        cached = _text_cache_get(cache, cache_key, len(data))
+        if cached is not None:
+            return cached
+        
+        if file_name.endswith(".docx"):
+            from docx import Document
+            doc = Document(io.BytesIO(data))
+            text = "\n".join([p.text for p in doc.paragraphs if p.text.strip()])
+            file_type, page_offsets = "docx", [0]
+        
+        else:
+            parts = []
+            page_offsets = []
+            position = 0
+            for page in iter_pdf_pages(data):
+                page_offsets.append(position)
+                if page:
+                    parts.append(page + "\n")
+                    position += len(page) + 1
+            text = "".join(parts)
+            file_type = "pdf"
+        
+        _text_cache_set(cache, cache_key, text, file_type, page_offsets, len(data))
+        return text, file_type, page_offsets
+    
+    except Exception as e:
+        raise ValueError(f"Error reading file: {str(e)}")
+
+
+class OffsetMap:
+    """
+    Maps offsets in normalized text back to the raw text
+    Stored as runs of (normalized_start, raw_start); within a run offsets move
+    together, so lookups are a binary search over runs
+    """
+    
+    def __init__(self):
+        self._norm_starts: List[int] = []
+        self._raw_starts: List[int] = []
+    
+    def add_run(self, norm_start: int, raw_start: int):
+        """Start a new run at norm_start that maps to raw_start"""
+        self._norm_starts.append(norm_start)
+        self._raw_starts.append(raw_start)
+    
+    def to_raw(self, offset: int) -> int:
+        """Raw-text offset of the normalized character at offset"""
+        run = bisect_right(self._norm_starts, offset) - 1
+        if run < 0:
+            return offset
+        return self._raw_starts[run] + (offset - self._norm_starts[run])
+    
+    def span_to_raw(self, start: int, end: int) -> Tuple[int, int]:
+        """Raw-text span covering normalized span [start, end)"""
+        if end <= start:
+            raw = self.to_raw(start)
+            return raw, raw
+        return self.to_raw(start), self.to_raw(end - 1) + 1
+
+
+def normalize_text(text: str) -> Tuple[str, OffsetMap]:
+    """
+    Normalize whitespace in one pass while keeping line and paragraph structure
+    - runs of spaces/tabs collapse to one space
+    - whitespace containing one newline becomes "\n", two or more become "\n\n"
+    - whitespace before . , ! ? ; : on the same line is removed
+    - leading and trailing whitespace is dropped
+    Returns: (normalized_text, offset_map back to text)
+    """
+    parts = []
+    offsets = OffsetMap()
+    out_len = 0
+    position = 0
+    
+    for match in WHITESPACE_PATTERN.finditer(text):
+        start, end = match.span()
+        if start > position:
+            offsets.add_run(out_len, position)
+            parts.append(text[position:start])
+            out_len += start - position
+        position = end
+        
+        if start == 0 or end == len(text):
+            continue
+        
+        newlines = match.group().count("\n")
+        if newlines >= 2:
+            replacement = "\n\n"
+        elif newlines == 1:
+            replacement = "\n"
+        elif text[end] in ".,!?;:":
+            continue
+        else:
+            replacement = " "
+        
+        offsets.add_run(out_len, start)
+        parts.append(replacement)
+        out_len += len(replacement)
+    
+    if position < len(text):
+        offsets.add_run(out_len, position)
+        parts.append(text[position:])
+    
+    return "".join(parts), offsets
+
+
 def clean_text(text: str) -> str:
     """
     Clean and normalize contract text
+    Line and paragraph breaks are kept so numbered sections can be split
     """
-    # Remove extra whitespace
-    text = " ".join(text.split())
-    # Replace multiple punctuation
-    import re
-    text = re.sub(r'\s+([.,!?;:])', r'\1', text)
-    return text
+    return normalize_text(text)[0]
 
 
-def extract_metadata(text: str) -> dict:
+def extract_metadata(text: Union[str, ContractDocument]) -> dict:
     """
     Extract basic metadata from contract text
     """
+    doc = ContractDocument.ensure(text)
+    text = doc.text
+    word_count = len(doc.token_spans)
+    
     metadata = {
-        "word_count": len(text.split()),
+        "word_count": word_count,
         "char_count": len(text),
         "page_estimate": max(1, len(text) // 3000)
     }
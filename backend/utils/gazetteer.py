@@ -0,0 +1,222 @@
+"""
+Gazetteer Module - Place and jurisdiction lookup for contract text
+Place names and aliases from backend/data/places.tsv are compiled into a
+token trie, pickled next to the other caches so later processes start
+without re-parsing the data file. find() scans the document once,
+matching whole words only and taking the longest name at each position;
+every match resolves to a canonical place ID
+"""
+import hashlib
+import os
+import pickle
+import re
+import threading
+from typing import Dict, Iterator, List, NamedTuple, Optional
+
+
+DEFAULT_GAZETTEER_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "places.tsv"
+)
+DEFAULT_CACHE_PATH = os.path.join(
+    os.path.expanduser("~"), ".cache", "contract_analysis", "gazetteer.pickle"
+)
+# Bump when the pickled layout changes
+CACHE_FORMAT_VERSION = 1
+
+COLUMNS = ("id", "name", "kind", "parent", "aliases")
+TOKEN_PATTERN = re.compile(r"\w+(?:['’]\w+)*|&")
+# A word that may start a name: not preceded by a word character, not a digit or
+# lowercase ASCII letter (other letters are checked with str.isupper)
+START_PATTERN = re.compile(r"(?<![\w'’])[^\W\d_a-z]\w*(?:['’]\w+)*")
+# Allowed between the words of one name ("Navi-Mumbai", "U.S.A.", line breaks)
+SEPARATOR_PATTERN = re.compile(r"[ \t\r\n.\-]*")
+# Trie key marking the end of a name; tokens are never empty
+TERMINAL = ""
+
+
+class Place(NamedTuple):
+    """A gazetteer entry; id is an ISO 3166 code or <parent>/<slug>"""
+    id: str
+    name: str
+    kind: str
+    parent: str
+
+    @property
+    def country(self) -> str:
+        return self.id.split("/")[0].split("-")[0]
+
+    def to_dict(self) -> Dict:
+        return {"id": self.id, "name": self.name, "kind": self.kind, "parent": self.parent}
+
+
+class PlaceMatch(NamedTuple):
+    """A place named at text[start:end]"""
+    start: int
+    end: int
+    place: Place
+
+
+def _name_tokens(name: str) -> List[str]:
+    return [token.casefold() for token in TOKEN_PATTERN.findall(name)]
+
+
+class Gazetteer:
+    """
+    Token trie over place names and aliases
+    Each trie node is a dict from a case-folded word to the next node; a name
+    ends where a node holds TERMINAL -> index into places
+    """
+
+    def __init__(self, places: List[Place], trie: Dict, version: str = ""):
+        self.places = places
+        self.trie = trie
+        self.version = version
+        self._by_id = None
+
+    @classmethod
+    def from_tsv(cls, content: str, version: str = "") -> "Gazetteer":
+        """Build from places.tsv content; names listed earlier win on conflicts"""
+        places = []
+        seen_ids = set()
+        trie = {}
+        for line_number, line in enumerate(content.splitlines(), 1):
+            if not line.strip() or line.startswith("#") or line.startswith("id\t"):
+                continue
+            fields = line.split("\t")
+            if len(fields) < 4:
+                raise ValueError(f"Gazetteer line {line_number}: expected {len(COLUMNS)} tab-separated columns")
+            place_id, name, kind, parent = (field.strip() for field in fields[:4])
+            if place_id in seen_ids:
+                raise ValueError(f"Gazetteer line {line_number}: duplicate id {place_id}")
+            seen_ids.add(place_id)
+
+            index = len(places)
+            places.append(Place(place_id, name, kind, parent))
+            aliases = fields[4].split("|") if len(fields) > 4 else []
+            for label in [name] + aliases:
+                tokens = _name_tokens(label)
+                if not tokens:
+                    continue
+                node = trie
+                for token in tokens:
+                    node = node.setdefault(token, {})
+                node.setdefault(TERMINAL, index)
+        return cls(places, trie, version)
+
+    @classmethod
+    def from_file(cls, path: str = DEFAULT_GAZETTEER_PATH, cache_path: Optional[str] = DEFAULT_CACHE_PATH) -> "Gazetteer":
+        """
+        Load a gazetteer data file, reusing the pickled trie when it was built
+        from identical content; cache_path=None skips the pickle
+        """
+        with open(path, "rb") as f:
+            data = f.read()
+        version = hashlib.sha256(data).hexdigest()[:16]
+
+        if cache_path:
+            try:
+                with open(cache_path, "rb") as f:
+                    format_version, cached_version, places, trie = pickle.load(f)
+                if format_version == CACHE_FORMAT_VERSION and cached_version == version:
+                    return cls([Place(*place) for place in places], trie, version)
+            except (OSError, EOFError, ValueError, TypeError, pickle.UnpicklingError):
+                pass
+
+        gazetteer = cls.from_tsv(data.decode("utf-8"), version)
+        if cache_path:
+            gazetteer.save(cache_path)
+        return gazetteer
+
+    def save(self, cache_path: str) -> bool:
+        """Pickle the compiled trie; returns False if the cache location is unusable"""
+        payload = (CACHE_FORMAT_VERSION, self.version, [tuple(place) for place in self.places], self.trie)
+        temp_path = f"{cache_path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(cache_path)), exist_ok=True)
+            with open(temp_path, "wb") as f:
+                pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, cache_path)
+            return True
+        except OSError:
+            # Unwritable cache location: the trie is simply rebuilt on the next start
+            return False
+
+    def __len__(self) -> int:
+        return len(self.places)
+
+    def get(self, place_id: str) -> Optional[Place]:
+        """Place by canonical ID"""
+        if self._by_id is None:
+            self._by_id = {place.id: place for place in self.places}
+        return self._by_id.get(place_id)
+
+    def lookup(self, name: str) -> Optional[Place]:
+        """Place for an exact name or alias (case-insensitive)"""
+        node = self.trie
+        for token in _name_tokens(name):
+            node = node.get(token)
+            if node is None:
+                return None
+        index = node.get(TERMINAL)
+        return self.places[index] if index is not None else None
+
+    def find(self, text: str) -> Iterator[PlaceMatch]:
+        """
+        Yield the places named in text, left to right, without overlaps
+        A match must start with a capitalized word and span whole words only,
+        separated by SEPARATOR_PATTERN; only capitalized words start a trie
+        walk, which is bounded by the longest name's word count
+        """
+        root = self.trie
+        position = 0
+        while True:
+            first = START_PATTERN.search(text, position)
+            if first is None:
+                return
+            position = first.end()
+            word = first.group()
+            if not word[0].isupper():
+                continue
+
+            node = root.get(word.casefold())
+            best = None
+            end = first.end()
+            while node is not None:
+                if TERMINAL in node:
+                    best = (end, node[TERMINAL])
+                following = TOKEN_PATTERN.match(text, SEPARATOR_PATTERN.match(text, end).end())
+                if following is None:
+                    break
+                end = following.end()
+                node = node.get(following.group().casefold())
+
+            if best is not None:
+                position, index = best
+                yield PlaceMatch(first.start(), position, self.places[index])
+
+
+# Singleton instance
+_gazetteer = None
+_gazetteer_lock = threading.Lock()
+
+
+def get_gazetteer() -> Gazetteer:
+    """
+    Get or load the process-wide gazetteer
+    Configured via GAZETTEER_PATH (data file) and GAZETTEER_CACHE_PATH
+    (compiled pickle; empty to disable)
+    """
+    global _gazetteer
+    if _gazetteer is None:
+        with _gazetteer_lock:
+            if _gazetteer is None:
+                _gazetteer = Gazetteer.from_file(
+                    os.getenv("GAZETTEER_PATH", DEFAULT_GAZETTEER_PATH),
+                    os.getenv("GAZETTEER_CACHE_PATH", DEFAULT_CACHE_PATH) or None
+                )
+    return _gazetteer
+
+
+def find_places(text: str) -> List[PlaceMatch]:
+    """Wrapper function to find every place named in text"""
+    return list(get_gazetteer().find(text))
@@ -0,0 +1,148 @@
+"""
+Keyword Engine Module - Aho-Corasick multi-pattern matcher for keyword dictionaries
+One compiled automaton covers clause types, risk words, ambiguity phrases and
+contract-type keywords, reporting every hit with its category in a single pass
+"""
+import threading
+from collections import deque
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Set, Tuple
+
+
+class KeywordHit(NamedTuple):
+    """A keyword occurrence: text[start:end] == keyword"""
+    start: int
+    end: int
+    keyword: str
+    category: str
+
+
+class KeywordAutomaton:
+    """
+    Aho-Corasick automaton over lowercase keywords
+    Matching is plain substring matching (same semantics as `kw in text`), so
+    input should already be lowercased; cost is linear in the text length
+    regardless of how many keywords are registered
+    """
+
+    def __init__(self):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[Tuple[str, str]]] = [[]]
+        self._built = False
+
+    def add(self, keyword: str, category: str):
+        """Register keyword under category (a keyword may have several categories)"""
+        keyword = keyword.lower()
+        if not keyword:
+            return
+        state = 0
+        for char in keyword:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            state = next_state
+        if (keyword, category) not in self._output[state]:
+            self._output[state].append((keyword, category))
+        self._built = False
+
+    def add_all(self, keywords: Iterable[str], category: str):
+        """Register every keyword in keywords under category"""
+        for keyword in keywords:
+            self.add(keyword, category)
+
+    def build(self) -> "KeywordAutomaton":
+        """Compute failure links; outputs are merged along them so matching never walks suffix chains"""
+        goto, fail, output = self._goto, self._fail, self._output
+        queue = deque()
+        for state in goto[0].values():
+            fail[state] = 0
+            queue.append(state)
+
+        while queue:
+            state = queue.popleft()
+            for char, next_state in goto[state].items():
+                queue.append(next_state)
+                fallback = fail[state]
+                while fallback and char not in goto[fallback]:
+                    fallback = fail[fallback]
+                fail[next_state] = goto[fallback].get(char, 0)
+                for entry in output[fail[next_state]]:
+                    if entry not in output[next_state]:
+                        output[next_state].append(entry)
+
+        self._built = True
+        return self
+
+    def iter_hits(self, text: str, offset: int = 0) -> Iterator[KeywordHit]:
+        """Yield every keyword occurrence in text (positions shifted by offset)"""
+        if not self._built:
+            self.build()
+        goto, fail, output = self._goto, self._fail, self._output
+        state = 0
+        for position, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if output[state]:
+                end = position + 1
+                for keyword, category in output[state]:
+                    yield KeywordHit(offset + end - len(keyword), offset + end, keyword, category)
+
+    def find_all(self, text: str) -> List[KeywordHit]:
+        """List every keyword occurrence in text"""
+        return list(self.iter_hits(text))
+
+    def categories(self, text: str) -> Dict[str, Set[str]]:
+        """Map each category to the set of its keywords found in text"""
+        return group_hits(self.iter_hits(text))
+
+
+def group_hits(hits: Iterable[KeywordHit]) -> Dict[str, Set[str]]:
+    """Group hits into category -> set of keywords"""
+    found: Dict[str, Set[str]] = {}
+    for hit in hits:
+        found.setdefault(hit.category, set()).add(hit.keyword)
+    return found
+
+
+def _build_default_engine() -> KeywordAutomaton:
+    """Compile every keyword dictionary used by the analysis pipeline"""
+    # Imported here because those modules consume this engine at call time
+    from backend.utils.clause_extractor import (
+        IMPORTANT_CLAUSES, HIGH_RISK_KEYWORDS, MEDIUM_RISK_KEYWORDS, AMBIGUOUS_PHRASES
+    )
+    from backend.utils.contract_classifier import ContractClassifier
+    from backend.utils.risk_engine import RiskAnalyzer, CRITICAL_CONTRACT_KEYWORDS
+
+    engine = KeywordAutomaton()
+    for ctype, keywords in IMPORTANT_CLAUSES.items():
+        engine.add_all(keywords, f"clause:{ctype}")
+    engine.add_all(HIGH_RISK_KEYWORDS, "risk:high")
+    engine.add_all(MEDIUM_RISK_KEYWORDS, "risk:medium")
+    engine.add_all(AMBIGUOUS_PHRASES, "ambiguity")
+    engine.add_all(RiskAnalyzer.CRITICAL_HIGH_RISK_WEIGHTS, "weight:high")
+    engine.add_all(RiskAnalyzer.MEDIUM_RISK_WEIGHTS, "weight:medium")
+    engine.add_all(RiskAnalyzer.LOW_RISK_WEIGHTS, "weight:low")
+    engine.add_all(CRITICAL_CONTRACT_KEYWORDS, "critical")
+    for category, keywords in ContractClassifier.keyword_dictionaries().items():
+        engine.add_all(keywords, f"contract:{category}")
+    return engine.build()
+
+
+# Singleton instance
+_engine = None
+_engine_lock = threading.Lock()
+
+
+def get_keyword_engine() -> KeywordAutomaton:
+    """Get or compile the shared keyword automaton"""
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                _engine = _build_default_engine()
+    return _engine
@@ -1,9 +1,180 @@
 """
 Named Entity Recognition (NER) Module - Extracts key information from contracts
+All full-text patterns are combined into one compiled scanner with a named
+group per entity kind, so a contract is scanned once instead of once per pattern;
+locations come from the gazetteer, which resolves them to canonical place IDs.
+With NER_BACKEND=spacy, parties and locations come from the statistical model
+instead (see spacy_ner), falling back to the patterns when it is not installed
 """
+import os
 import re
-from typing import Dict, List
+from typing import Dict, Iterator, List, NamedTuple, Optional, Union
 from datetime import datetime
+from backend.utils.document import Document
+from backend.utils.gazetteer import get_gazetteer
+from backend.utils import spacy_ner
+
+
+MONTHS = r'(?:January|February|March|April|May|June|July|August|September|October|November|December)'
+# Number scales and currency words that may follow an amount ("1.5 crore", "50 lakh rupees")
+SCALES = r'(?:crores?|cr|lakhs?|lacs?|thousands?|millions?|mn|billions?|bn)\b'
+CURRENCY_WORDS = r'(?:rupees|dollars|euros|pounds)\b'
+
+# Longest party or company name looked for; bounds how far a failed match can scan
+NAME_MAX_CHARS = 120
+
+# One alternative per entity pattern; at each position the first one that
+# matches wins, so more specific patterns come first. The party alternative
+# only consumes "between " and captures the name in a lookahead, leaving the
+# name itself to be scanned for other entities too. Lookbehinds start runs of
+# digits or email characters only at the run's first character (where a
+# separate findall would have matched anyway), and the final unnamed
+# alternative skips the rest of a lowercase word in one step, so the engine
+# is not restarted at every letter.
+# Every repetition is either bounded or anchored so that no stretch of text is
+# rescanned from more than one start: matching stays linear on garbled input
+# (checked by benchmarks/regex_fuzz.py).
+ENTITY_PATTERN = re.compile(
+    r'(?<![a-zA-Z0-9._%+-])(?P<email>[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})'
+    r'|(?P<date>\d{1,2}[/-]\d{1,2}[/-]\d{2,4}'
+    r'|' + MONTHS + r'\s+\d{1,2},?\s+\d{4}'
+    r'|\d{1,2}\s+' + MONTHS + r'\s+\d{4})'
+    r'|(?P<amount>(?i:(?:₹|Rs|INR|Rs\.|\$|USD|€|EUR|£|GBP)\s*[\d,]+(?:\.\d+)?(?:\s*' + SCALES + r')?'
+    r'|(?<![\d,])[\d,]+(?:\.\d+)?\s*(?:' + SCALES + r'(?:\s+' + CURRENCY_WORDS + r')?|' + CURRENCY_WORDS + r')))'
+    r'|(?<!\d)(?P<percentage>\d+(?:\.\d+)?)(?:%|\s+(?i:percent|%))'
+    r'|(?P<phone>(?:\+91|0)?[\s\-]?\d{10}|\+\d{1,3}\s?\d{1,14})'
+    r'|between\s+(?=(?P<party>[A-Z][A-Za-z\s&,\.]{0,' + str(NAME_MAX_CHARS - 1) + r'}?)(?:\sand\s|,))'
+    r'|[a-z]+'
+)
+
+# Only looked for in the opening of the contract, where parties are named
+HEAD_CHARS = 2000
+COMPANY_PATTERN = re.compile(
+    r'(?<![A-Za-z])[A-Z][A-Za-z\s&\.]{1,' + str(NAME_MAX_CHARS - 1) + r'}(?:Company|Corporation|Limited|Inc\.|Ltd\.|LLP|Pvt)\.?'
+)
+
+# "regex" (patterns and gazetteer) or "spacy" (statistical parties and locations)
+NER_BACKEND = os.getenv("NER_BACKEND", "regex").strip().lower()
+BACKENDS = ("regex", "spacy")
+
+# Output key and item limit per entity kind, in report order
+ENTITY_LIMITS = {
+    "party": ("parties", 5),
+    "date": ("dates", 10),
+    "amount": ("amounts", 15),
+    "location": ("locations", 10),
+    "percentage": ("percentages", 10),
+    "email": ("emails", 5),
+    "phone": ("phone_numbers", 5),
+}
+
+
+class EntityMatch(NamedTuple):
+    """
+    An entity found at text[start:end]; value is the string reported for it
+    and id the canonical gazetteer ID of a location
+    """
+    kind: str
+    start: int
+    end: int
+    value: str
+    id: Optional[str] = None
+
+
+def ner_backend() -> str:
+    """Backend in use for parties and locations: "spacy" only when configured and its model loads"""
+    if NER_BACKEND == "spacy" and spacy_ner.get_nlp() is not None:
+        return "spacy"
+    return "regex"
+
+
+def ner_backend_version() -> str:
+    """Backend name plus model version, for cache keys"""
+    backend = ner_backend()
+    return f"spacy:{spacy_ner.model_version()}" if backend == "spacy" else backend
+
+
+def _statistical_matches(doc: Document) -> Iterator[EntityMatch]:
+    """Model parties and locations; locations the gazetteer knows get its name and ID"""
+    gazetteer = get_gazetteer()
+    for entity in spacy_ner.find_entities([doc])[0]:
+        place = gazetteer.lookup(entity.value) if entity.kind == "location" else None
+        if place is not None:
+            yield EntityMatch(entity.kind, entity.start, entity.end, place.name, place.id)
+        else:
+            yield EntityMatch(entity.kind, entity.start, entity.end, entity.value.strip())
+
+
+def scan_entities(text: Union[str, Document], backend: str = None) -> Iterator[EntityMatch]:
+    """
+    Yield every pattern match in one pass over the text, then places, then contract-head parties
+    backend overrides ner_backend(); "spacy" raises RuntimeError if the model is missing
+    """
+    doc = Document.ensure(text)
+    text = doc.text
+    statistical = (backend or ner_backend()) == "spacy"
+    for match in ENTITY_PATTERN.finditer(text):
+        kind = match.lastgroup
+        if kind is None or (statistical and kind == "party"):
+            continue
+        if kind == "percentage":
+            yield EntityMatch(kind, match.start(), match.end(), match.group(kind) + "%")
+        elif kind == "party":
+            # The name may carry the whitespace before " and"
+            start = match.start(kind)
+            value = match.group(kind).rstrip()
+            yield EntityMatch(kind, start, start + len(value), value)
+        else:
+            yield EntityMatch(kind, match.start(), match.end(), match.group())
+
+    if statistical:
+        yield from _statistical_matches(doc)
+        return
+
+    for match in get_gazetteer().find(text):
+        yield EntityMatch("location", match.start, match.end, match.place.name, match.place.id)
+
+    for match in COMPANY_PATTERN.finditer(text[:HEAD_CHARS]):
+        if len(match.group()) > 5:
+            yield EntityMatch("party", match.start(), match.end(), match.group().strip())
+
+
+def _is_party_name(value: str) -> bool:
+    return len(value) > 3 and not any(skip in value for skip in ["The", "This", "That"])
+
+
+def group_entities(matches: Iterator[EntityMatch]) -> Dict[str, List[str]]:
+    """Unique values per output key, in order of first occurrence, cut to each kind's limit"""
+    grouped = {key: [] for key, _ in ENTITY_LIMITS.values()}
+    seen = {key: set() for key in grouped}
+    for match in matches:
+        key, limit = ENTITY_LIMITS[match.kind]
+        if match.value in seen[key] or len(grouped[key]) >= limit:
+            continue
+        if match.kind == "party" and not _is_party_name(match.value):
+            continue
+        seen[key].add(match.value)
+        grouped[key].append(match.value)
+    return grouped
+
+
+def group_places(matches: Iterator[EntityMatch]) -> List[Dict]:
+    """Gazetteer entries of the matched locations, in order of first occurrence"""
+    _, limit = ENTITY_LIMITS["location"]
+    gazetteer = get_gazetteer()
+    places = []
+    seen = set()
+    for match in matches:
+        if match.kind != "location" or match.id is None or match.id in seen:
+            continue
+        place = gazetteer.get(match.id)
+        if place is None:
+            continue
+        seen.add(match.id)
+        places.append(place.to_dict())
+        if len(places) >= limit:
+            break
+    return places
 
 
 class ContractNER:
@@ -12,145 +183,64 @@ class ContractNER:
     - Parties (Company names, individuals)
     - Dates
     - Amounts
-    - Locations
+    - Locations (resolved to gazetteer places)
     - Percentages
     """
-    
+
     @staticmethod
-    def extract_all_entities(text: str) -> Dict[str, List[str]]:
-        """Extract all entities from contract"""
+    def extract_all_entities(text: Union[str, Document], matches: List[EntityMatch] = None) -> Dict[str, List[str]]:
+        """Extract all entities from contract (pass matches to reuse an existing scan)"""
+        if matches is None:
+            matches = list(scan_entities(text))
+        grouped = group_entities(matches)
         return {
-            "parties": ContractNER.extract_parties(text),
-            "dates": ContractNER.extract_dates(text),
-            "amounts": ContractNER.extract_amounts(text),
-            "locations": ContractNER.extract_locations(text),
-            "percentages": ContractNER.extract_percentages(text),
-            "contact_info": ContractNER.extract_contact_info(text)
+            "parties": grouped["parties"],
+            "dates": grouped["dates"],
+            "amounts": grouped["amounts"],
+            "locations": grouped["locations"],
+            "places": group_places(matches),
+            "percentages": grouped["percentages"],
+            "contact_info": {
+                "emails": grouped["emails"],
+                "phone_numbers": grouped["phone_numbers"]
+            }
         }
-    
+
     @staticmethod
     def extract_parties(text: str) -> List[str]:
         """Extract party names (organizations and individuals)"""
-        parties = []
-        
-        # Pattern: "between", "by and between", "by and between"
-        between_pattern = r'(?:between|by and between|entered into by and between)\s+([A-Z][A-Za-z\s&,\.]+?)(?:\s+and\s+|,)'
-        matches = re.findall(between_pattern, text)
-        parties.extend([m.strip() for m in matches])
-        
-        # Pattern: "Company", "Corporation", "Limited", "Inc.", "Ltd."
-        company_pattern = r'([A-Z][A-Za-z\s&\.]+(?:Company|Corporation|Limited|Inc\.|Ltd\.|LLP|Pvt)\.?)'
-        matches = re.findall(company_pattern, text[:2000])  # Check first 2000 chars
-        parties.extend([m.strip() for m in matches if len(m) > 5])
-        
-        # Remove duplicates and filter
-        parties = list(set(parties))
-        parties = [p for p in parties if len(p) > 3 and not any(skip in p for skip in ["The", "This", "That"])]
-        
-        return parties[:5]  # Return top 5
-    
+        return group_entities(m for m in scan_entities(text) if m.kind == "party")["parties"]
+
     @staticmethod
     def extract_dates(text: str) -> List[str]:
         """Extract dates from contract"""
-        dates = []
-        
-        # Pattern: DD/MM/YYYY or DD-MM-YYYY
-        date_pattern1 = r'\d{1,2}[/-]\d{1,2}[/-]\d{2,4}'
-        matches = re.findall(date_pattern1, text)
-        dates.extend(matches)
-        
-        # Pattern: Month Day, Year (e.g., "January 15, 2024")
-        date_pattern2 = r'(?:January|February|March|April|May|June|July|August|September|October|November|December)\s+\d{1,2},?\s+\d{4}'
-        matches = re.findall(date_pattern2, text)
-        dates.extend(matches)
-        
-        # Pattern: Day Month Year (e.g., "15 January 2024")
-        date_pattern3 = r'\d{1,2}\s+(?:January|February|March|April|May|June|July|August|September|October|November|December)\s+\d{4}'
-        matches = re.findall(date_pattern3, text)
-        dates.extend(matches)
-        
-        return list(set(dates))[:10]  # Return unique dates
-    
+        return group_entities(m for m in scan_entities(text) if m.kind == "date")["dates"]
+
     @staticmethod
     def extract_amounts(text: str) -> List[str]:
         """Extract financial amounts"""
-        amounts = []
-        
-        # Pattern: Currency amounts (₹, $, €, £, etc.)
-        amount_pattern = r'(?:₹|Rs|INR|Rs\.|\$|USD|€|EUR|£|GBP)\s*[\d,]+(?:\.\d{2})?'
-        matches = re.findall(amount_pattern, text, re.IGNORECASE)
-        amounts.extend(matches)
-        
-        # Pattern: Number followed by currency
-        amount_pattern2 = r'[\d,]+(?:\.\d{2})?\s*(?:rupees|dollars|euros|pounds|cr|lakhs|thousands|crores)'
-        matches = re.findall(amount_pattern2, text, re.IGNORECASE)
-        amounts.extend(matches)
-        
-        return list(set(amounts))[:15]  # Return unique amounts
-    
+        return group_entities(m for m in scan_entities(text) if m.kind == "amount")["amounts"]
+
     @staticmethod
     def extract_locations(text: str) -> List[str]:
         """Extract locations and jurisdictions"""
-        locations = []
-        
-        # Common Indian states
-        indian_states = [
-            "Andhra Pradesh", "Arunachal Pradesh", "Assam", "Bihar", "Chhattisgarh",
-            "Goa", "Gujarat", "Haryana", "Himachal Pradesh", "Jharkhand", "Karnataka",
-            "Kerala", "Madhya Pradesh", "Maharashtra", "Manipur", "Meghalaya", "Mizoram",
-            "Nagaland", "Odisha", "Punjab", "Rajasthan", "Sikkim", "Tamil Nadu",
-            "Telangana", "Tripura", "Uttar Pradesh", "Uttarakhand", "West Bengal",
-            "Delhi", "Mumbai", "Bangalore", "Chennai", "Kolkata", "Hyderabad"
-        ]
-        
-        for state in indian_states:
-            if state in text:
-                locations.append(state)
-        
-        # Pattern: City, Country
-        location_pattern = r'([A-Z][a-z]+),\s*([A-Z][a-z]+)'
-        matches = re.findall(location_pattern, text[:2000])
-        for match in matches:
-            locations.append(f"{match[0]}, {match[1]}")
-        
-        return list(set(locations))[:10]
-    
+        return group_entities(m for m in scan_entities(text) if m.kind == "location")["locations"]
+
     @staticmethod
     def extract_percentages(text: str) -> List[str]:
         """Extract percentages"""
-        percentages = []
-        
-        # Pattern: Number followed by %
-        percent_pattern = r'\d+(?:\.\d+)?%'
-        matches = re.findall(percent_pattern, text)
-        percentages.extend(matches)
-        
-        # Pattern: "X percent"
-        percent_pattern2 = r'(\d+(?:\.\d+)?)\s+(?:percent|%)'
-        matches = re.findall(percent_pattern2, text, re.IGNORECASE)
-        percentages.extend([m + '%' for m in matches])
-        
-        return list(set(percentages))[:10]
-    
+        return group_entities(m for m in scan_entities(text) if m.kind == "percentage")["percentages"]
+
     @staticmethod
     def extract_contact_info(text: str) -> Dict[str, List[str]]:
         """Extract email and phone information"""
-        contact = {
-            "emails": [],
-            "phone_numbers": []
+        grouped = group_entities(m for m in scan_entities(text) if m.kind in ("email", "phone"))
+        return {
+            "emails": grouped["emails"],
+            "phone_numbers": grouped["phone_numbers"]
         }
-        
-        # Email pattern
-        email_pattern = r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}'
-        contact["emails"] = list(set(re.findall(email_pattern, text)))[:5]
-        
-        # Phone pattern (Indian format)
-        phone_pattern = r'(?:\+91|0)?[\s\-]?\d{10}|\d{10}|\+\d{1,3}\s?\d{1,14}'
-        contact["phone_numbers"] = list(set(re.findall(phone_pattern, text)))[:5]
-        
-        return contact
-
-
-def extract_entities(text: str) -> Dict:
+
+
+def extract_entities(text: Union[str, Document], matches: List[EntityMatch] = None) -> Dict:
     """Wrapper function to extract all entities"""
-    return ContractNER.extract_all_entities(text)
+    return ContractNER.extract_all_entities(text, matches)
@@ -0,0 +1,196 @@
+"""
+Performance Instrumentation Module - Stage timings and LLM call counters
+A PerfRecorder collects wall time, CPU time, call counts and bytes per pipeline
+stage plus latency/token/retry/fallback data per LLM call, and exports them as
+a dict (report["perf"]), Prometheus text or JSON lines
+"""
+import contextvars
+import json
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
+
+class PerfRecorder:
+    """
+    Collects metrics for one analysis run
+    Stage CPU time is the calling thread's CPU time (time.thread_time), so work
+    fanned out to worker threads shows up as wall time, not CPU time
+    """
+
+    def __init__(self):
+        self.stages: Dict[str, Dict] = {}
+        self.llm_calls: List[Dict] = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def stage(self, name: str, bytes_processed: int = 0) -> Iterator[Dict]:
+        """
+        Time a pipeline stage; yields a dict whose "bytes" may be updated inside
+        the block when the size is only known afterwards
+        """
+        info = {"bytes": bytes_processed}
+        wall_start = time.perf_counter()
+        cpu_start = time.thread_time()
+        try:
+            yield info
+        finally:
+            wall = time.perf_counter() - wall_start
+            cpu = time.thread_time() - cpu_start
+            with self._lock:
+                stats = self.stages.setdefault(
+                    name, {"wall_seconds": 0.0, "cpu_seconds": 0.0, "calls": 0, "bytes": 0}
+                )
+                stats["wall_seconds"] += wall
+                stats["cpu_seconds"] += cpu
+                stats["calls"] += 1
+                stats["bytes"] += info["bytes"]
+
+    def record_llm_call(self, kind: str, latency: float = 0.0, input_tokens: int = 0,
+                        output_tokens: int = 0, retries: int = 0, outcome: str = "ok",
+                        cache_read_tokens: int = 0, cache_write_tokens: int = 0, **extra):
+        """
+        Record one LLM interaction
+        outcome: "ok", "error", "fallback" (rule engine used) or "cache_hit"
+        cache_read_tokens / cache_write_tokens: prompt-prefix cache usage reported by the API
+        """
+        record = {
+            "kind": kind,
+            "outcome": outcome,
+            "latency_seconds": round(latency, 6),
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "cache_read_tokens": cache_read_tokens,
+            "cache_write_tokens": cache_write_tokens,
+            "retries": retries
+        }
+        record.update(extra)
+        with self._lock:
+            self.llm_calls.append(record)
+
+    def to_dict(self) -> Dict:
+        """Snapshot suitable for report["perf"]"""
+        with self._lock:
+            stages = {
+                name: {
+                    "wall_seconds": round(stats["wall_seconds"], 6),
+                    "cpu_seconds": round(stats["cpu_seconds"], 6),
+                    "calls": stats["calls"],
+                    "bytes": stats["bytes"]
+                }
+                for name, stats in self.stages.items()
+            }
+            calls = list(self.llm_calls)
+
+        by_kind: Dict[str, Dict] = {}
+        for call in calls:
+            for key in ("all", call["kind"]):
+                totals = by_kind.setdefault(key, {
+                    "calls": 0, "errors": 0, "fallbacks": 0, "cache_hits": 0, "retries": 0,
+                    "input_tokens": 0, "output_tokens": 0, "cache_read_tokens": 0, "cache_write_tokens": 0,
+                    "latency_seconds_total": 0.0, "latency_seconds_max": 0.0
+                })
+                if call["outcome"] == "cache_hit":
+                    totals["cache_hits"] += 1
+                    continue
+                if call["outcome"] == "fallback":
+                    totals["fallbacks"] += 1
+                    continue
+                totals["calls"] += 1
+                totals["errors"] += call["outcome"] == "error"
+                totals["retries"] += call["retries"]
+                totals["input_tokens"] += call["input_tokens"]
+                totals["output_tokens"] += call["output_tokens"]
+                totals["cache_read_tokens"] += call.get("cache_read_tokens", 0)
+                totals["cache_write_tokens"] += call.get("cache_write_tokens", 0)
+                totals["latency_seconds_total"] = round(totals["latency_seconds_total"] + call["latency_seconds"], 6)
+                totals["latency_seconds_max"] = max(totals["latency_seconds_max"], call["latency_seconds"])
+
+        summary = by_kind.pop("all", None) or {
+            "calls": 0, "errors": 0, "fallbacks": 0, "cache_hits": 0, "retries": 0,
+            "input_tokens": 0, "output_tokens": 0, "cache_read_tokens": 0, "cache_write_tokens": 0,
+            "latency_seconds_total": 0.0, "latency_seconds_max": 0.0
+        }
+        summary["by_kind"] = by_kind
+        return {"stages": stages, "llm": summary, "llm_calls": calls}
+
+
+def _escape_label(value) -> str:
+    """Escape a Prometheus label value"""
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def to_prometheus(perf: Dict, prefix: str = "contract_analysis", labels: Dict[str, str] = None) -> str:
+    """Render a perf dict (PerfRecorder.to_dict / report["perf"]) as Prometheus text format"""
+    base_labels = dict(labels or {})
+
+    def fmt(extra: Dict[str, str]) -> str:
+        merged = dict(base_labels, **extra)
+        if not merged:
+            return ""
+        body = ",".join(f'{k}="{_escape_label(v)}"' for k, v in merged.items())
+        return "{" + body + "}"
+
+    lines = []
+    stage_metrics = (
+        ("stage_wall_seconds_total", "wall_seconds", "Wall-clock seconds spent per pipeline stage"),
+        ("stage_cpu_seconds_total", "cpu_seconds", "CPU seconds spent per pipeline stage"),
+        ("stage_calls_total", "calls", "Executions per pipeline stage"),
+        ("stage_bytes_total", "bytes", "Bytes processed per pipeline stage"),
+    )
+    for metric, key, help_text in stage_metrics:
+        lines.append(f"# HELP {prefix}_{metric} {help_text}")
+        lines.append(f"# TYPE {prefix}_{metric} counter")
+        for stage, stats in perf.get("stages", {}).items():
+            lines.append(f"{prefix}_{metric}{fmt({'stage': stage})} {stats[key]}")
+
+    llm_metrics = (
+        ("llm_calls_total", "calls", "LLM requests made"),
+        ("llm_errors_total", "errors", "LLM requests that failed"),
+        ("llm_fallbacks_total", "fallbacks", "Analyses answered by the rule engine instead of the LLM"),
+        ("llm_cache_hits_total", "cache_hits", "Analyses served from the analysis cache"),
+        ("llm_retries_total", "retries", "LLM request retries"),
+        ("llm_input_tokens_total", "input_tokens", "LLM input tokens"),
+        ("llm_output_tokens_total", "output_tokens", "LLM output tokens"),
+        ("llm_cache_read_tokens_total", "cache_read_tokens", "Input tokens read from the prompt cache"),
+        ("llm_cache_write_tokens_total", "cache_write_tokens", "Input tokens written to the prompt cache"),
+        ("llm_latency_seconds_total", "latency_seconds_total", "Summed LLM request latency"),
+    )
+    by_kind = perf.get("llm", {}).get("by_kind", {})
+    for metric, key, help_text in llm_metrics:
+        lines.append(f"# HELP {prefix}_{metric} {help_text}")
+        lines.append(f"# TYPE {prefix}_{metric} counter")
+        for kind, totals in by_kind.items():
+            lines.append(f"{prefix}_{metric}{fmt({'kind': kind})} {totals[key]}")
+
+    return "\n".join(lines) + "\n"
+
+
+def to_json_lines(perf: Dict, **labels) -> str:
+    """Render a perf dict as JSON lines: one record per stage and per LLM call"""
+    lines = []
+    for stage, stats in perf.get("stages", {}).items():
+        lines.append(json.dumps(dict(labels, type="stage", stage=stage, **stats)))
+    for call in perf.get("llm_calls", []):
+        lines.append(json.dumps(dict(labels, type="llm_call", **call)))
+    return "\n".join(lines) + ("\n" if lines else "")
+
+
+# Recorder for the analysis running in the current context (thread / task)
+_current_recorder: contextvars.ContextVar = contextvars.ContextVar("perf_recorder", default=None)
+
+
+def current_recorder() -> Optional[PerfRecorder]:
+    """The active recorder, or None when the caller is not being instrumented"""
+    return _current_recorder.get()
+
+
+@contextmanager
+def recording(recorder: PerfRecorder) -> Iterator[PerfRecorder]:
+    """Make recorder the active recorder for the enclosed block"""
+    token = _current_recorder.set(recorder)
+    try:
+        yield recorder
+    finally:
+        _current_recorder.reset(token)
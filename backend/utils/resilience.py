@@ -0,0 +1,273 @@
+"""
+Resilience Module - Retry, timeout and circuit-breaker policy for LLM calls
+Retryable failures (rate limits, overload, 5xx, timeouts, connection errors)
+are retried with jittered exponential backoff within an overall deadline;
+repeated failures open a process-wide circuit so callers fall back to the
+rule engine immediately while a background probe waits for the API to recover
+"""
+import os
+import random
+import threading
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+from backend.utils.scheduler import SchedulerTimeout
+
+
+# Per-request timeout in seconds, passed to the SDK
+LLM_TIMEOUT_SECONDS = float(os.getenv("LLM_TIMEOUT_SECONDS", "30"))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "3"))
+LLM_BACKOFF_BASE = float(os.getenv("LLM_BACKOFF_BASE", "0.5"))
+LLM_BACKOFF_MAX = float(os.getenv("LLM_BACKOFF_MAX", "8"))
+# Total seconds one call may spend across attempts and backoff before giving up
+LLM_CALL_DEADLINE_SECONDS = float(os.getenv("LLM_CALL_DEADLINE_SECONDS", "60"))
+CIRCUIT_FAILURE_THRESHOLD = int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", "5"))
+CIRCUIT_RECOVERY_SECONDS = float(os.getenv("CIRCUIT_RECOVERY_SECONDS", "30"))
+
+RETRYABLE_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504, 529}
+# Request-specific rejections say nothing about the API's health
+NON_TRIPPING_STATUS_CODES = {400, 404, 413, 422}
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling the API while the circuit is open"""
+
+
+def is_retryable(error: Exception) -> bool:
+    """Transient failures worth retrying"""
+    from anthropic import APIConnectionError
+    if isinstance(error, APIConnectionError):  # includes APITimeoutError
+        return True
+    return getattr(error, "status_code", None) in RETRYABLE_STATUS_CODES
+
+
+def trips_circuit(error: Exception) -> bool:
+    """Failures that count toward opening the circuit; waiting in our own queue is not one"""
+    if isinstance(error, SchedulerTimeout):
+        return False
+    return getattr(error, "status_code", None) not in NON_TRIPPING_STATUS_CODES
+
+
+def signals_outage(error: Exception) -> bool:
+    """
+    Timeouts, connection errors and 5xx: each failed attempt counts toward the
+    circuit, so an outage opens it within a call instead of after many calls
+    """
+    from anthropic import APIConnectionError
+    if isinstance(error, APIConnectionError):  # includes APITimeoutError
+        return True
+    status_code = getattr(error, "status_code", None)
+    return status_code is not None and status_code >= 500
+
+
+def retry_after_seconds(error: Exception) -> Optional[float]:
+    """Server-requested delay from retry-after-ms / retry-after headers, if any"""
+    from anthropic import APIStatusError
+    response = getattr(error, "response", None) if isinstance(error, APIStatusError) else None
+    headers = getattr(response, "headers", None) or {}
+    for name, scale in (("retry-after-ms", 0.001), ("retry-after", 1.0)):
+        value = headers.get(name)
+        if value is None:
+            continue
+        try:
+            return max(0.0, float(value) * scale)
+        except ValueError:
+            continue
+    return None
+
+
+class RetryPolicy:
+    """Jittered exponential backoff ("full jitter") for retryable errors"""
+
+    def __init__(self, max_retries: int = LLM_MAX_RETRIES, base_delay: float = LLM_BACKOFF_BASE,
+                 max_delay: float = LLM_BACKOFF_MAX, rng: random.Random = None,
+                 deadline: float = LLM_CALL_DEADLINE_SECONDS):
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.deadline = deadline
+        self._rng = rng or random.Random()
+
+    def delay(self, attempt: int, error: Exception = None) -> float:
+        """Seconds to wait before retry number attempt (0-based)"""
+        server_delay = retry_after_seconds(error) if error is not None else None
+        if server_delay is not None:
+            return min(server_delay, self.max_delay)
+        return self._rng.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+
+class CircuitBreaker:
+    """
+    Closed -> open after failure_threshold consecutive failures
+    While open every call is rejected; after recovery_timeout the circuit is
+    half-open and a single trial call (or the background probe) decides
+    whether to close it again or stay open for another period
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = CIRCUIT_FAILURE_THRESHOLD,
+                 recovery_timeout: float = CIRCUIT_RECOVERY_SECONDS):
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.times_opened = 0
+        self.rejected = 0
+        self._trial_in_flight = False
+        self._probe: Optional[Callable[[], None]] = None
+        self._probe_thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def set_probe(self, probe: Optional[Callable[[], None]]):
+        """Cheap health check run in the background while open; raising means still down"""
+        self._probe = probe
+
+    def allow(self) -> bool:
+        """Whether a call may go ahead now"""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and time.monotonic() - self.opened_at >= self.recovery_timeout:
+                self.state = self.HALF_OPEN
+            if self.state == self.HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            self.rejected += 1
+            return False
+
+    def release_trial(self):
+        """Let another call through a half-open circuit (the trial is being retried)"""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self._trial_in_flight = False
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                self._open()
+
+    def is_open(self) -> bool:
+        with self._lock:
+            return self.state == self.OPEN
+
+    def _open(self):
+        """Open the circuit and start the recovery probe (lock held)"""
+        if self.state != self.OPEN:
+            self.times_opened += 1
+        self.state = self.OPEN
+        self.opened_at = time.monotonic()
+        if self._probe is not None and (self._probe_thread is None or not self._probe_thread.is_alive()):
+            self._probe_thread = threading.Thread(target=self._probe_loop, name="llm-circuit-probe", daemon=True)
+            self._probe_thread.start()
+
+    def _probe_loop(self):
+        """Retry the probe every recovery_timeout until it succeeds or the circuit closes"""
+        while True:
+            time.sleep(self.recovery_timeout)
+            with self._lock:
+                if self.state == self.CLOSED:
+                    return
+            try:
+                self._probe()
+            except Exception:
+                with self._lock:
+                    self.opened_at = time.monotonic()
+                continue
+            self.record_success()
+            return
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "state": self.state,
+                "consecutive_failures": self.failures,
+                "times_opened": self.times_opened,
+                "rejected_calls": self.rejected
+            }
+
+
+def call_with_resilience(fn: Callable, breaker: CircuitBreaker, policy: RetryPolicy,
+                         sleep: Callable[[float], None] = time.sleep,
+                         clock: Callable[[], float] = time.monotonic) -> Tuple[object, int]:
+    """
+    Call fn(remaining) under the breaker with retries; returns (result, retries used)
+    remaining is the seconds left before policy.deadline (None without one),
+    for fn to bound its request timeout and any queueing by
+    Raises CircuitOpenError when the circuit rejects the call, otherwise the
+    last error once retries are exhausted, the deadline has passed or the next
+    backoff would pass it, a failed attempt has just opened the circuit, or
+    the error is not retryable
+    """
+    started = clock()
+    attempt = 0
+    last_error = None
+    while True:
+        remaining = None
+        if policy.deadline is not None:
+            remaining = policy.deadline - (clock() - started)
+            if remaining <= 0 and last_error is not None:
+                # The backoff overran the deadline
+                breaker.record_failure()
+                last_error.retries = attempt
+                raise last_error
+        if not breaker.allow():
+            raise CircuitOpenError("LLM circuit open; using rule-based analysis")
+        try:
+            result = fn(remaining)
+        except Exception as e:
+            last_error = e
+            if not trips_circuit(e):
+                # A rejected request says nothing about recovery: free the trial, keep the state
+                breaker.release_trial()
+                raise
+            delay = policy.delay(attempt, e)
+            out_of_time = policy.deadline is not None and clock() - started + delay >= policy.deadline
+            if attempt >= policy.max_retries or out_of_time or not is_retryable(e):
+                breaker.record_failure()
+                e.retries = attempt
+                raise
+            if signals_outage(e):
+                breaker.record_failure()
+                if breaker.is_open():
+                    # Give up now rather than back off only to be rejected
+                    e.retries = attempt
+                    raise
+            else:
+                # Rate limits only count toward the circuit once retries are exhausted
+                breaker.release_trial()
+            sleep(delay)
+            attempt += 1
+            continue
+        breaker.record_success()
+        return result, attempt
+
+
+# Process-wide breaker shared by every analyzer
+_breaker = None
+_breaker_lock = threading.Lock()
+
+
+def get_circuit_breaker() -> CircuitBreaker:
+    """Get or create the process-wide LLM circuit breaker"""
+    global _breaker
+    if _breaker is None:
+        with _breaker_lock:
+            if _breaker is None:
+                _breaker = CircuitBreaker()
+    return _breaker
+
+
+def get_circuit_stats() -> Dict:
+    """Wrapper function to get circuit breaker state"""
+    return get_circuit_breaker().stats()
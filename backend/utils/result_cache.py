@@ -0,0 +1,167 @@
+"""
+Result Cache Module - Whole-analysis report cache shared by every session
+Keyed by a SHA-256 of the uploaded file bytes plus an engine version that
+covers the extractor, rule tables, prompts and model, so an identical
+contract is answered instantly across users and restarts. Recent reports
+are kept in an in-memory LRU in front of an on-disk SQLite store
+"""
+import hashlib
+import json
+import os
+import zlib
+from collections import OrderedDict
+from typing import Dict, Optional
+
+from backend.utils.sqlite_store import CACHE_DIR, CacheSingleton, SQLiteStore
+
+
+DEFAULT_CACHE_PATH = os.path.join(CACHE_DIR, "result_cache.sqlite3")
+DEFAULT_MAX_ENTRIES = 5000
+DEFAULT_MEMORY_ENTRIES = 128
+
+
+class ResultCache:
+    """
+    Two-level store of analysis reports (JSON)
+    memory_entries reports stay decompressed in an LRU; the SQLite store holds
+    zlib-compressed reports and evicts least recently used ones beyond max_entries
+    """
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, max_entries: int = DEFAULT_MAX_ENTRIES,
+                 memory_entries: int = DEFAULT_MEMORY_ENTRIES):
+        self.path = path
+        self.max_entries = max_entries
+        self.memory_entries = memory_entries
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._memory: "OrderedDict[str, str]" = OrderedDict()
+        self._store = SQLiteStore(
+            path, "results",
+            ("engine_version TEXT NOT NULL", "value BLOB NOT NULL", "value_size INTEGER NOT NULL",
+             "hits INTEGER NOT NULL DEFAULT 0"),
+            max_entries=max_entries
+        )
+        # The memory LRU is guarded by the store lock, so both levels change together
+        self._lock = self._store.lock
+
+    @staticmethod
+    def make_key(data: bytes, file_type: str, engine_version: str) -> str:
+        """Content-addressed key for raw file bytes analyzed by a given engine version"""
+        return f"{engine_version}:{file_type}:{hashlib.sha256(data).hexdigest()}"
+
+    def _remember(self, key: str, value: str):
+        """Insert into the memory LRU (lock held)"""
+        if self.memory_entries <= 0:
+            return
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Return a fresh copy of the cached report for key, or None on miss"""
+        with self._lock:
+            value = self._memory.get(key)
+            if value is not None:
+                # Served without touching the store, so a busy or locked database cannot fail a hit
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+            else:
+                row = self._store.get(key, ("value",))
+                if row is None:
+                    self.misses += 1
+                    return None
+                value = zlib.decompress(row[0]).decode("utf-8")
+                self._remember(key, value)
+                self.disk_hits += 1
+
+        return json.loads(value)
+
+    def set(self, key: str, report: Dict, engine_version: str = ""):
+        """Store a report in memory and on disk, evicting least recently used entries over capacity"""
+        value = json.dumps(report, ensure_ascii=False)
+        blob = zlib.compress(value.encode("utf-8"), 6)
+        with self._lock:
+            self._remember(key, value)
+            self._store.set(key, engine_version=engine_version, value=blob, value_size=len(value))
+
+    def warm(self, limit: int = None) -> int:
+        """
+        Load the most recently used reports from disk into memory
+        Returns: number of reports now held in memory
+        """
+        limit = self.memory_entries if limit is None else min(limit, self.memory_entries)
+        if limit <= 0:
+            return 0
+        with self._lock:
+            rows = self._store.recent(("key", "value"), limit)
+            # Oldest first, so the most recent entry ends up most recently used
+            for key, blob in reversed(rows):
+                if key not in self._memory:
+                    self._remember(key, zlib.decompress(blob).decode("utf-8"))
+            return len(self._memory)
+
+    def invalidate(self, key: str = None, engine_version: str = None) -> int:
+        """Remove one entry, one engine version's entries, or everything when neither is given"""
+        with self._lock:
+            removed = self._store.delete(key=key, engine_version=engine_version)
+            if key is None and engine_version is None:
+                self._memory.clear()
+            else:
+                for cached_key in list(self._memory):
+                    if cached_key == key or (engine_version and cached_key.startswith(f"{engine_version}:")):
+                        del self._memory[cached_key]
+        return removed
+
+    def stats(self) -> Dict:
+        """Get memory/disk hit counters and current sizes"""
+        with self._lock:
+            entries, stored_bytes = self._store.aggregate("COUNT(*)", "COALESCE(SUM(LENGTH(value)), 0)")
+            memory_entries = len(self._memory)
+            memory_bytes = sum(len(value) for value in self._memory.values())
+        hits = self.memory_hits + self.disk_hits
+        lookups = hits + self.misses
+        return {
+            "hits": hits,
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_ratio": round(hits / lookups, 3) if lookups else 0.0,
+            "memory_entries": memory_entries,
+            "memory_bytes": memory_bytes,
+            "max_memory_entries": self.memory_entries,
+            "entries": entries,
+            "stored_bytes": stored_bytes,
+            "max_entries": self.max_entries,
+            "path": self.path
+        }
+
+
+# Singleton instance
+_cache = CacheSingleton("RESULT_CACHE", lambda: ResultCache(
+    path=os.getenv("RESULT_CACHE_PATH", DEFAULT_CACHE_PATH),
+    max_entries=int(os.getenv("RESULT_CACHE_MAX_ENTRIES", DEFAULT_MAX_ENTRIES)),
+    memory_entries=int(os.getenv("RESULT_CACHE_MEMORY_ENTRIES", DEFAULT_MEMORY_ENTRIES))
+))
+
+
+def get_result_cache() -> Optional[ResultCache]:
+    """
+    Get or create the process-wide result cache
+    Configured via RESULT_CACHE_PATH, RESULT_CACHE_MAX_ENTRIES and
+    RESULT_CACHE_MEMORY_ENTRIES; set RESULT_CACHE_DISABLED=1 to turn caching off
+    """
+    return _cache.get()
+
+
+def warm_result_cache(limit: int = None) -> int:
+    """Wrapper function to preload recent reports into memory"""
+    cache = get_result_cache()
+    return cache.warm(limit) if cache else 0
+
+
+def get_result_cache_stats() -> Dict:
+    """Wrapper function to get result cache statistics"""
+    cache = get_result_cache()
+    return cache.stats() if cache else {"enabled": False}
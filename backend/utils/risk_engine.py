@@ -3,32 +3,243 @@ Risk Engine Module - Analyzes contracts and clauses for legal risks
 Integrates with Anthropic Claude for advanced legal reasoning
 """
 import os
-from typing import Dict, List
-from anthropic import Anthropic
+import json
+import threading
+import time
+from typing import Dict, List, Optional, Set, Tuple, Union
 from dotenv import load_dotenv
+from backend.utils.analysis_cache import AnalysisCache, get_analysis_cache
+from backend.utils.document import Document
+from backend.utils.keyword_engine import get_keyword_engine
+from backend.utils.perf import current_recorder
+from backend.utils.resilience import (
+    LLM_TIMEOUT_SECONDS, CircuitOpenError, RetryPolicy, call_with_resilience, get_circuit_breaker,
+    retry_after_seconds
+)
+from backend.utils.scheduler import estimate_tokens, get_scheduler
 
 load_dotenv()
 
 
+# Contract-wide keywords that raise the overall risk score
+CRITICAL_CONTRACT_KEYWORDS = [
+    "unlimited liability", "perpetual", "irrevocable",
+    "sole discretion", "unilateral termination",
+    "non-compete", "confidentiality", "indemnify",
+    "penalty", "terminate at will"
+]
+
+
+# Shared instructions sent as the system prompt of every request; bump the
+# *_PROMPT_VERSION constants when editing it
+LEGAL_ADVISOR_SYSTEM_PROMPT = "You are an expert legal advisor specializing in contract analysis for Indian SMEs."
+
+
 class RiskAnalyzer:
     """
     Advanced risk analyzer using Claude AI for legal reasoning
     """
     
-    def __init__(self):
-        self.client = Anthropic()
+    # Bump when a prompt template changes so cached analyses are not reused
+    CLAUSE_PROMPT_VERSION = "clause-v3"
+    OVERVIEW_PROMPT_VERSION = "overview-v3"
+    BATCH_PROMPT_VERSION = "batch-json-v3"
+    
+    RISK_LEVELS = ("Low", "Medium", "High")
+    
+    # Rule-based risk keywords with weights
+    CRITICAL_HIGH_RISK_WEIGHTS = {
+        "unlimited liability": 3,
+        "perpetual": 3,
+        "irrevocable": 3,
+        "sole discretion": 2.5,
+        "unilateral termination": 2.5,
+        "non-compete": 2,
+        "unlimited damages": 2,
+        "terminate at will": 2,
+        "indemnify": 2,
+    }
+    
+    MEDIUM_RISK_WEIGHTS = {
+        "termination": 1,
+        "liability cap": 1,
+        "confidentiality": 1,
+        "jurisdiction": 1,
+        "arbitration": 1,
+        "notice period": 0.5,
+        "dispute resolution": 0.5,
+    }
+    
+    LOW_RISK_WEIGHTS = {
+        "compensation": 0.2,
+        "payment terms": 0.2,
+        "standard": 0.1,
+    }
+    
+    # Tool schema used to force one structured verdict per clause in batch mode
+    BATCH_TOOL = {
+        "name": "record_clause_analyses",
+        "description": "Record the risk analysis of every clause, one object per clause.",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "analyses": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "index": {"type": "integer", "description": "Clause number as given in the prompt"},
+                            "risk": {"type": "string", "enum": ["Low", "Medium", "High"]},
+                            "unfavorable": {"type": "boolean"},
+                            "explanation": {"type": "string", "description": "Plain English, max 2 sentences"},
+                            "concerns": {"type": "array", "items": {"type": "string"}},
+                            "suggestion": {"type": "string", "description": "Improvement or alternative wording"}
+                        },
+                        "required": ["index", "risk", "unfavorable", "explanation", "concerns", "suggestion"]
+                    }
+                }
+            },
+            "required": ["analyses"]
+        }
+    }
+    
+    def __init__(self, cache: AnalysisCache = None, offline: bool = None, client=None):
+        # Offline mode never calls the API and uses the rule engine only
+        if offline is None:
+            offline = os.getenv("CONTRACT_ANALYSIS_OFFLINE", "").lower() in ("1", "true", "yes")
+        self.offline = offline
+        # client: any object with messages.create, e.g. a mock Messages API client
+        # Retries are handled by call_with_resilience, so the SDK's own are disabled
+        self.client = None if offline else (client or self._default_client())
         self.model = "claude-3-5-sonnet-20241022"
         self.conversation_history = []
+        self.cache = cache if cache is not None else get_analysis_cache()
+        self.timeout = LLM_TIMEOUT_SECONDS
+        self.retry_policy = RetryPolicy()
+        self.breaker = get_circuit_breaker()
+        self.scheduler = get_scheduler()
+        if not offline:
+            self.breaker.set_probe(self._probe)
+    
+    @staticmethod
+    def _default_client():
+        """Anthropic SDK client; the SDK is imported here, on first use, to keep imports fast"""
+        from anthropic import Anthropic
+        return Anthropic(max_retries=0, timeout=LLM_TIMEOUT_SECONDS)
+    
+    def _cache_get(self, key: str) -> Dict:
+        """Look up a cached analysis, ignoring cache failures"""
+        if self.cache is None:
+            return None
+        try:
+            return self.cache.get(key)
+        except Exception:
+            return None
+    
+    def _cache_set(self, key: str, value: Dict, kind: str, prompt_version: str):
+        """Store an analysis, ignoring cache failures"""
+        if self.cache is None:
+            return
+        try:
+            self.cache.set(key, value, kind=kind, model=self.model, prompt_version=prompt_version)
+        except Exception:
+            pass
     
-    def analyze_clause(self, clause_text: str, clause_type: str) -> Dict:
+    def _create_message(self, kind: str, **kwargs):
+        """
+        Call the Messages API through the shared scheduler with timeout, retries
+        and the circuit breaker, recording latency, queueing, retries and token
+        usage for the active PerfRecorder
+        Raises CircuitOpenError without calling the API while the circuit is open
+        """
+        recorder = current_recorder()
+        started = time.perf_counter()
+        queued = []
+        
+        def scheduled_create(remaining: Optional[float]):
+            # Each attempt waits for the shared scheduler, which learns from 429/529s
+            # Queueing and the request itself both count against the call's deadline
+            permit = self.scheduler.acquire(estimate_tokens(
+                kwargs.get("messages"), kwargs.get("max_tokens", 0), kwargs.get("tools"), kwargs.get("system")
+            ), timeout=remaining)
+            queued.append(permit.waited)
+            timeout = self.timeout if remaining is None else min(self.timeout, max(remaining - permit.waited, 0.1))
+            try:
+                response = self.client.messages.create(model=self.model, timeout=timeout, **kwargs)
+            except Exception as e:
+                throttled = getattr(e, "status_code", None) in (429, 529)
+                self.scheduler.release(permit, rate_limited=throttled,
+                                       retry_after=retry_after_seconds(e) if throttled else None)
+                raise
+            usage = getattr(response, "usage", None)
+            used = sum(getattr(usage, field, 0) or 0 for field in (
+                "input_tokens", "cache_creation_input_tokens", "output_tokens"
+            ))
+            self.scheduler.release(permit, used_tokens=used or None)
+            return response
+        
+        try:
+            response, retries = call_with_resilience(scheduled_create, self.breaker, self.retry_policy)
+        except CircuitOpenError:
+            raise
+        except Exception as e:
+            if recorder:
+                recorder.record_llm_call(kind, time.perf_counter() - started, outcome="error",
+                                         retries=getattr(e, "retries", 0), error=type(e).__name__,
+                                         queued_seconds=round(sum(queued), 6))
+            raise
+        
+        if recorder:
+            usage = getattr(response, "usage", None)
+            recorder.record_llm_call(
+                kind,
+                time.perf_counter() - started,
+                input_tokens=getattr(usage, "input_tokens", 0) or 0,
+                output_tokens=getattr(usage, "output_tokens", 0) or 0,
+                cache_read_tokens=getattr(usage, "cache_read_input_tokens", 0) or 0,
+                cache_write_tokens=getattr(usage, "cache_creation_input_tokens", 0) or 0,
+                retries=retries,
+                queued_seconds=round(sum(queued), 6)
+            )
+        return response
+    
+    def _probe(self):
+        """Minimal request used by the circuit breaker to detect recovery"""
+        self.client.messages.create(
+            model=self.model, max_tokens=1, timeout=min(self.timeout, 10),
+            messages=[{"role": "user", "content": "ping"}]
+        )
+    
+    @staticmethod
+    def _note(kind: str, outcome: str, count: int = 1):
+        """Record cache hits and rule-engine fallbacks for the active PerfRecorder"""
+        recorder = current_recorder()
+        if recorder:
+            for _ in range(count):
+                recorder.record_llm_call(kind, outcome=outcome)
+    
+    def analyze_clause(self, clause_text: str, clause_type: str,
+                       keywords: Optional[Dict[str, Set[str]]] = None) -> Dict:
         """
         Analyze a single clause for risks using Claude
+        Results are cached by model, prompt version and clause text
+        keywords (the clause's keyword-engine hits) are used by the rule-based fallback
         """
+        if self.offline:
+            self._note("clause", "fallback")
+            return self._fallback_analysis(clause_text, clause_type, keywords)
+        
+        cache_key = AnalysisCache.make_key(
+            "clause", self.model, self.CLAUSE_PROMPT_VERSION, clause_text, extra=clause_type
+        )
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            self._note("clause", "cache_hit")
+            return cached
+        
         try:
             # Build the prompt
-            analysis_prompt = f"""You are an expert legal advisor specializing in contract analysis for Indian SMEs.
-
-Analyze the following {clause_type} clause from a contract and provide:
+            analysis_prompt = f"""Analyze the following {clause_type} clause from a contract and provide:
 1. Risk Level (Low/Medium/High) with reasoning
 2. Whether it's unfavorable to the company (Yes/No)
 3. Plain English explanation (max 2 sentences)
@@ -41,9 +252,10 @@ CLAUSE:
 Provide your analysis in a structured format."""
 
             # Call Claude API
-            response = self.client.messages.create(
-                model=self.model,
+            response = self._create_message(
+                "clause",
                 max_tokens=1024,
+                system=LEGAL_ADVISOR_SYSTEM_PROMPT,
                 messages=[
                     {"role": "user", "content": analysis_prompt}
                 ]
@@ -51,7 +263,7 @@ Provide your analysis in a structured format."""
             
             analysis_text = response.content[0].text
             
-            return {
+            result = {
                 "risk": self._extract_risk_level(analysis_text),
                 "unfavorable": self._is_unfavorable(analysis_text),
                 "explanation": self._extract_explanation(analysis_text),
@@ -59,17 +271,111 @@ Provide your analysis in a structured format."""
                 "concerns": self._extract_concerns(analysis_text),
                 "full_analysis": analysis_text
             }
+            self._cache_set(cache_key, result, "clause", self.CLAUSE_PROMPT_VERSION)
+            return result
         
         except Exception as e:
             # Fallback to rule-based analysis
-            return self._fallback_analysis(clause_text, clause_type)
+            self._note("clause", "fallback")
+            return self._fallback_analysis(clause_text, clause_type, keywords, fallback=True)
+    
+    def analyze_clauses_batch(self, clauses: List[Tuple[str, str]],
+                              keywords: Optional[List[Optional[Dict[str, Set[str]]]]] = None) -> List[Dict]:
+        """
+        Analyze several (clause_text, clause_type) pairs in a single request
+        Claude answers through a tool call with one JSON object per clause; objects
+        are schema-validated and any clause without a valid verdict falls back to
+        rule-based analysis. Results are returned in input order.
+        keywords, if given, holds each clause's keyword-engine hits for the fallback
+        """
+        keywords = keywords or [None] * len(clauses)
+        if self.offline:
+            self._note("batch", "fallback", len(clauses))
+            return [self._fallback_analysis(text, ctype, found) for (text, ctype), found in zip(clauses, keywords)]
+        
+        results: List[Optional[Dict]] = [None] * len(clauses)
+        cache_keys = []
+        pending = []
+        
+        for i, (clause_text, clause_type) in enumerate(clauses):
+            cache_key = AnalysisCache.make_key(
+                "clause", self.model, self.BATCH_PROMPT_VERSION, clause_text, extra=clause_type
+            )
+            cache_keys.append(cache_key)
+            cached = self._cache_get(cache_key)
+            if cached is not None:
+                self._note("batch", "cache_hit")
+                results[i] = cached
+            else:
+                pending.append(i)
+        
+        if pending:
+            try:
+                clause_blocks = "\n\n".join(
+                    f"CLAUSE {n} ({clauses[i][1]}):\n{clauses[i][0]}"
+                    for n, i in enumerate(pending, 1)
+                )
+                prompt = f"""Analyze each of the following {len(pending)} contract clauses and, for every clause, provide:
+1. Risk Level (Low/Medium/High)
+2. Whether it's unfavorable to the company (true/false)
+3. Plain English explanation (max 2 sentences)
+4. Specific concerns if any
+5. Suggested improvement or alternative wording
+
+{clause_blocks}
+
+Record exactly one analysis per clause with the record_clause_analyses tool, using the clause number as index."""
+
+                response = self._create_message(
+                    "batch",
+                    max_tokens=min(4096, 400 * len(pending) + 200),
+                    tools=[self.BATCH_TOOL],
+                    tool_choice={"type": "tool", "name": self.BATCH_TOOL["name"]},
+                    system=LEGAL_ADVISOR_SYSTEM_PROMPT,
+                    messages=[
+                        {"role": "user", "content": prompt}
+                    ]
+                )
+                
+                for item in self._extract_batch_items(response):
+                    analysis = self._validate_clause_result(item)
+                    if analysis is None or not 1 <= item["index"] <= len(pending):
+                        continue
+                    i = pending[item["index"] - 1]
+                    if results[i] is None:
+                        results[i] = analysis
+                        self._cache_set(cache_keys[i], analysis, "clause", self.BATCH_PROMPT_VERSION)
+            
+            except Exception as e:
+                # Pending clauses fall back to rule-based analysis below
+                pass
+        
+        for i, (clause_text, clause_type) in enumerate(clauses):
+            if results[i] is None:
+                self._note("batch", "fallback")
+                results[i] = self._fallback_analysis(clause_text, clause_type, keywords[i], fallback=True)
+        
+        return results
     
     def analyze_contract_overview(self, contract_text: str) -> Dict:
         """
         Provide high-level contract analysis
+        Results are cached by model, prompt version and the excerpt sent
         """
+        if self.offline:
+            self._note("overview", "fallback")
+            return self._fallback_contract_analysis(contract_text)
+        
+        cache_key = AnalysisCache.make_key(
+            "overview", self.model, self.OVERVIEW_PROMPT_VERSION, contract_text[:2000]
+        )
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            self._note("overview", "cache_hit")
+            return cached
+        
         try:
-            prompt = f"""As a legal expert for Indian SMEs, analyze this contract and provide:
+            prompt = f"""Analyze this contract and provide:
 1. Contract Type (Employment/Vendor/Lease/Partnership/Service/Other)
 2. Key Risks (list top 3)
 3. Overall Risk Score (Low/Medium/High)
@@ -81,9 +387,10 @@ CONTRACT EXCERPT (first 2000 chars):
 
 Keep your response concise and actionable."""
 
-            response = self.client.messages.create(
-                model=self.model,
+            response = self._create_message(
+                "overview",
                 max_tokens=1500,
+                system=LEGAL_ADVISOR_SYSTEM_PROMPT,
                 messages=[
                     {"role": "user", "content": prompt}
                 ]
@@ -91,7 +398,7 @@ Keep your response concise and actionable."""
             
             analysis = response.content[0].text
             
-            return {
+            result = {
                 "contract_type": self._extract_contract_type(analysis),
                 "key_risks": self._extract_key_risks(analysis),
                 "overall_risk": self._extract_overall_risk(analysis),
@@ -99,8 +406,11 @@ Keep your response concise and actionable."""
                 "compliance_notes": self._extract_compliance(analysis),
                 "full_analysis": analysis
             }
+            self._cache_set(cache_key, result, "overview", self.OVERVIEW_PROMPT_VERSION)
+            return result
         
         except Exception as e:
+            self._note("overview", "fallback")
             return self._fallback_contract_analysis(contract_text)
     
     def get_renegotiation_suggestions(self, clauses: List[Dict]) -> List[str]:
@@ -118,6 +428,53 @@ Keep your response concise and actionable."""
         
         return suggestions
     
+    # Helper methods for structured batch output
+    @staticmethod
+    def _extract_batch_items(response) -> List[Dict]:
+        """Pull the list of per-clause objects out of a tool-use (or JSON text) response"""
+        for block in response.content:
+            if getattr(block, "type", None) == "tool_use":
+                items = block.input.get("analyses", []) if isinstance(block.input, dict) else []
+                return items if isinstance(items, list) else []
+        
+        # Tolerate a plain JSON array answer
+        for block in response.content:
+            text = getattr(block, "text", "") or ""
+            start, end = text.find("["), text.rfind("]")
+            if start != -1 and end > start:
+                try:
+                    items = json.loads(text[start:end + 1])
+                except ValueError:
+                    continue
+                return items if isinstance(items, list) else []
+        return []
+    
+    @classmethod
+    def _validate_clause_result(cls, item) -> Optional[Dict]:
+        """Validate one batch object against BATCH_TOOL's schema; None if invalid"""
+        if not isinstance(item, dict):
+            return None
+        if not isinstance(item.get("index"), int) or isinstance(item.get("index"), bool):
+            return None
+        if item.get("risk") not in cls.RISK_LEVELS:
+            return None
+        if not isinstance(item.get("unfavorable"), bool):
+            return None
+        if not isinstance(item.get("explanation"), str) or not isinstance(item.get("suggestion"), str):
+            return None
+        concerns = item.get("concerns")
+        if not isinstance(concerns, list) or not all(isinstance(c, str) for c in concerns):
+            return None
+        
+        return {
+            "risk": item["risk"],
+            "unfavorable": item["unfavorable"],
+            "explanation": item["explanation"].strip(),
+            "suggestion": item["suggestion"].strip() or "Consult with legal advisor for improvements",
+            "concerns": [c.strip() for c in concerns][:3],
+            "full_analysis": json.dumps(item, ensure_ascii=False)
+        }
+    
     # Helper methods for text extraction
     @staticmethod
     def _extract_risk_level(text: str) -> str:
@@ -212,54 +569,34 @@ Keep your response concise and actionable."""
                 return line.strip().lstrip('•-').strip()
         return "Compliance status unclear - recommend legal review"
     
-    def _fallback_analysis(self, clause_text: str, clause_type: str) -> Dict:
-        """Fallback rule-based analysis with intelligent scoring"""
-        text_lower = clause_text.lower()
-        
-        # Define risk keywords with weights
-        critical_high_risk = {
-            "unlimited liability": 3,
-            "perpetual": 3,
-            "irrevocable": 3,
-            "sole discretion": 2.5,
-            "unilateral termination": 2.5,
-            "non-compete": 2,
-            "unlimited damages": 2,
-            "terminate at will": 2,
-            "indemnify": 2,
-        }
-        
-        medium_risk_words = {
-            "termination": 1,
-            "liability cap": 1,
-            "confidentiality": 1,
-            "jurisdiction": 1,
-            "arbitration": 1,
-            "notice period": 0.5,
-            "dispute resolution": 0.5,
-        }
-        
-        low_risk_words = {
-            "compensation": 0.2,
-            "payment terms": 0.2,
-            "standard": 0.1,
-        }
+    def _fallback_analysis(self, clause_text: str, clause_type: str,
+                           keywords: Optional[Dict[str, Set[str]]] = None, fallback: bool = False) -> Dict:
+        """
+        Fallback rule-based analysis with intelligent scoring
+        Pass keywords (e.g. Document.keywords_in over the clause span) to skip rescanning the clause
+        fallback marks a verdict that replaces a failed LLM call ("rules_fallback" tier)
+        rather than one for a clause that was never sent ("rules")
+        """
+        found = keywords if keywords is not None else get_keyword_engine().categories(clause_text.lower())
+        high_found = found.get("weight:high", set())
+        medium_found = found.get("weight:medium", set())
+        low_found = found.get("weight:low", set())
         
         # Calculate risk score
         risk_score = 0
         found_concerns = []
         
-        for keyword, weight in critical_high_risk.items():
-            if keyword in text_lower:
+        for keyword, weight in self.CRITICAL_HIGH_RISK_WEIGHTS.items():
+            if keyword in high_found:
                 risk_score += weight
                 found_concerns.append(f"Critical: {keyword}")
         
-        for keyword, weight in medium_risk_words.items():
-            if keyword in text_lower:
+        for keyword, weight in self.MEDIUM_RISK_WEIGHTS.items():
+            if keyword in medium_found:
                 risk_score += weight
         
-        for keyword, weight in low_risk_words.items():
-            if keyword in text_lower:
+        for keyword, weight in self.LOW_RISK_WEIGHTS.items():
+            if keyword in low_found:
                 risk_score = max(0, risk_score - weight)
         
         # Determine risk level based on score
@@ -278,7 +615,9 @@ Keep your response concise and actionable."""
             "explanation": clause_text[:200] + "..." if len(clause_text) > 200 else clause_text,
             "suggestion": self._get_improvement_suggestion(clause_type, risk),
             "concerns": found_concerns[:3] if found_concerns else [],
-            "full_analysis": f"Risk Score: {risk_score:.2f}\nClause Type: {clause_type}\nRisk Level: {risk}"
+            "full_analysis": f"Risk Score: {risk_score:.2f}\nClause Type: {clause_type}\nRisk Level: {risk}",
+            "risk_score": round(risk_score, 2),
+            "tier": "rules_fallback" if fallback else "rules"
         }
     
     @staticmethod
@@ -328,26 +667,40 @@ Keep your response concise and actionable."""
 
 # Singleton instance
 _analyzer = None
+_analyzer_lock = threading.Lock()
 
 
 def get_analyzer():
-    """Get or create analyzer instance"""
+    """Get or create analyzer instance (safe to call from worker threads)"""
     global _analyzer
     if _analyzer is None:
-        _analyzer = RiskAnalyzer()
+        with _analyzer_lock:
+            if _analyzer is None:
+                _analyzer = RiskAnalyzer()
     return _analyzer
 
 
-def analyze_clause(clause_text: str, clause_type: str = "General") -> Dict:
+def analyze_clause(clause_text: str, clause_type: str = "General",
+                   keywords: Optional[Dict[str, Set[str]]] = None) -> Dict:
     """Wrapper function for clause analysis"""
     analyzer = get_analyzer()
-    return analyzer.analyze_clause(clause_text, clause_type)
+    return analyzer.analyze_clause(clause_text, clause_type, keywords)
+
+
+def analyze_clauses_batch(clauses: List[Tuple[str, str]],
+                          keywords: Optional[List[Optional[Dict[str, Set[str]]]]] = None) -> List[Dict]:
+    """Wrapper function for batched clause analysis"""
+    analyzer = get_analyzer()
+    return analyzer.analyze_clauses_batch(clauses, keywords)
 
 
-def overall_risk(clauses: List[Dict], contract_text: str = "") -> str:
+def overall_risk(clauses: List[Dict], contract_text: Union[str, Document] = "",
+                 keyword_categories: Optional[Dict] = None) -> str:
     """
     Calculate overall contract risk with intelligent scoring
     Considers: number of high-risk clauses, severity, frequency of risk keywords
+    keyword_categories (keyword-engine hits) can stand in for contract_text
+    when the full text is not retained, e.g. in streaming analysis
     """
     if not clauses:
         return "Low"
@@ -367,16 +720,9 @@ def overall_risk(clauses: List[Dict], contract_text: str = "") -> str:
     risk_score = (high_risk_count * 3) + (medium_risk_count * 1)
     
     # Check for critical keywords in contract text
-    critical_keywords = [
-        "unlimited liability", "perpetual", "irrevocable",
-        "sole discretion", "unilateral termination",
-        "non-compete", "confidentiality", "indemnify",
-        "penalty", "terminate at will"
-    ]
-    
-    if contract_text:
-        text_lower = contract_text.lower()
-        critical_count = sum(1 for kw in critical_keywords if kw in text_lower)
+    if contract_text or keyword_categories:
+        found = keyword_categories if keyword_categories is not None else Document.ensure(contract_text).keyword_categories
+        critical_count = len(found.get("critical", ()))
         risk_score += critical_count
     
     # Determine overall risk based on scoring
@@ -0,0 +1,339 @@
+"""
+Scheduler Module - Process-wide admission control for LLM requests
+Every Messages API call takes a permit first:
+- a token bucket budgets estimated input + output tokens per minute (optionally
+  shared across processes through a file-locked state file)
+- concurrency adapts with AIMD: +1/limit per success, halved on a 429/529
+- waiting requests are served by priority lane, interactive before batch
+"""
+import contextvars
+import heapq
+import itertools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: cross-process budgeting is unavailable
+    fcntl = None
+
+
+LLM_TOKENS_PER_MINUTE = int(os.getenv("LLM_TOKENS_PER_MINUTE", "80000"))
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+LLM_MIN_CONCURRENCY = 1
+# Set to share the token budget between processes (e.g. CLI workers)
+LLM_SCHEDULER_STATE_PATH = os.getenv("LLM_SCHEDULER_STATE_PATH", "")
+
+LANES = ("interactive", "batch")
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(messages: List[Dict], max_tokens: int = 0, tools: List[Dict] = None,
+                    system=None) -> int:
+    """Rough request cost: prompt characters / 4 plus the output budget"""
+    chars = 0
+    if isinstance(system, str):
+        chars += len(system)
+    elif system:
+        chars += sum(len(block.get("text", "")) for block in system if isinstance(block, dict))
+    for message in messages or []:
+        content = message.get("content", "")
+        if isinstance(content, str):
+            chars += len(content)
+        else:
+            chars += sum(len(block.get("text", "")) for block in content if isinstance(block, dict))
+    if tools:
+        chars += len(json.dumps(tools))
+    return chars // CHARS_PER_TOKEN + 1 + max_tokens
+
+
+class SchedulerTimeout(Exception):
+    """Raised when a request cannot be admitted before its timeout"""
+
+
+class TokenBucket:
+    """In-process token bucket refilled continuously at tokens_per_minute (<= 0: unlimited)"""
+
+    def __init__(self, tokens_per_minute: int, capacity: int = None):
+        self.rate = tokens_per_minute / 60.0
+        self.capacity = capacity or max(tokens_per_minute, 1)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self.hold_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def take(self, amount: int) -> float:
+        """Take amount tokens and return 0, or return the seconds to wait before retrying"""
+        if self.rate <= 0:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            if now < self.hold_until:
+                return self.hold_until - now
+            self._refill(now)
+            if self.tokens >= amount:
+                self.tokens -= amount
+                return 0.0
+            return (amount - self.tokens) / self.rate
+
+    def adjust(self, delta: float):
+        """Refund (positive) or charge (negative) tokens once actual usage is known"""
+        if self.rate <= 0:
+            return
+        with self._lock:
+            self._refill(time.monotonic())
+            self.tokens = min(self.capacity, self.tokens + delta)
+
+    def hold(self, seconds: float):
+        """Admit nothing for seconds (server asked us to back off)"""
+        with self._lock:
+            self.hold_until = max(self.hold_until, time.monotonic() + seconds)
+
+
+class FileTokenBucket(TokenBucket):
+    """
+    Token bucket whose state lives in a JSON file guarded by flock, so every
+    process pointing at the same path shares one budget and one back-off
+    """
+
+    def __init__(self, path: str, tokens_per_minute: int, capacity: int = None):
+        super().__init__(tokens_per_minute, capacity)
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+    @contextmanager
+    def _state(self) -> Iterator[Dict]:
+        """Locked read-modify-write of the shared state"""
+        with open(self.path, "a+", encoding="utf-8") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                f.seek(0)
+                try:
+                    state = json.loads(f.read() or "{}")
+                except ValueError:
+                    state = {}
+                now = time.time()
+                tokens = state.get("tokens", float(self.capacity))
+                updated = state.get("updated", now)
+                state["tokens"] = min(self.capacity, tokens + max(0.0, now - updated) * self.rate)
+                state["updated"] = now
+                state.setdefault("hold_until", 0.0)
+                yield state
+                f.seek(0)
+                f.truncate()
+                f.write(json.dumps(state))
+                f.flush()
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def take(self, amount: int) -> float:
+        if self.rate <= 0:
+            return 0.0
+        with self._lock, self._state() as state:
+            now = time.time()
+            if now < state["hold_until"]:
+                return state["hold_until"] - now
+            if state["tokens"] >= amount:
+                state["tokens"] -= amount
+                return 0.0
+            return (amount - state["tokens"]) / self.rate
+
+    def adjust(self, delta: float):
+        if self.rate <= 0:
+            return
+        with self._lock, self._state() as state:
+            state["tokens"] = min(self.capacity, state["tokens"] + delta)
+
+    def hold(self, seconds: float):
+        with self._lock, self._state() as state:
+            state["hold_until"] = max(state["hold_until"], time.time() + seconds)
+
+
+class Permit:
+    """Admission for one request; hand it back to LLMScheduler.release"""
+
+    __slots__ = ("tokens", "lane", "waited")
+
+    def __init__(self, tokens: int, lane: str, waited: float):
+        self.tokens = tokens
+        self.lane = lane
+        self.waited = waited
+
+
+class LLMScheduler:
+    """
+    Admits LLM requests by lane priority, adaptive concurrency limit and token budget
+    Waiters are served strictly in (lane, arrival) order, so an interactive
+    request overtakes every queued batch request
+    """
+
+    def __init__(self, bucket: TokenBucket = None, max_concurrency: int = LLM_MAX_CONCURRENCY,
+                 min_concurrency: int = LLM_MIN_CONCURRENCY):
+        self.bucket = bucket or TokenBucket(LLM_TOKENS_PER_MINUTE)
+        self.max_concurrency = max(1, max_concurrency)
+        self.min_concurrency = max(1, min(min_concurrency, self.max_concurrency))
+        self.limit = float(self.max_concurrency)
+        self.in_flight = 0
+        self.admitted = {lane: 0 for lane in LANES}
+        self.wait_seconds = {lane: 0.0 for lane in LANES}
+        self.rate_limited = 0
+        self._waiters: List = []
+        self._sequence = itertools.count()
+        self._cond = threading.Condition()
+
+    def acquire(self, tokens: int, lane: str = None, timeout: float = None) -> Permit:
+        """
+        Block until this request may be sent
+        Raises SchedulerTimeout if that takes longer than timeout seconds
+        """
+        lane = lane if lane in LANES else current_lane()
+        tokens = min(max(1, tokens), self.bucket.capacity)
+        entry = (LANES.index(lane), next(self._sequence))
+        started = time.monotonic()
+        deadline = None if timeout is None else started + timeout
+
+        def wait_for(seconds: float):
+            # Wait on the condition (held) for at most seconds, or give up at the deadline
+            if deadline is not None:
+                left = deadline - time.monotonic()
+                if left <= 0:
+                    raise SchedulerTimeout(f"Not admitted within {timeout:.1f}s")
+                seconds = min(seconds, left)
+            self._cond.wait(seconds)
+
+        with self._cond:
+            heapq.heappush(self._waiters, entry)
+        try:
+            while True:
+                with self._cond:
+                    while self._waiters[0] != entry or self.in_flight >= int(self.limit):
+                        wait_for(1.0)
+                    # Hold the slot while the bucket is consulted outside the lock
+                    # (a FileTokenBucket locks and rewrites its state file)
+                    self.in_flight += 1
+                try:
+                    wait = self.bucket.take(tokens)
+                except BaseException:
+                    with self._cond:
+                        self.in_flight -= 1
+                    raise
+                if wait <= 0:
+                    break
+                with self._cond:
+                    self.in_flight -= 1
+                    wait_for(min(wait, 1.0))
+        finally:
+            with self._cond:
+                self._waiters.remove(entry)
+                heapq.heapify(self._waiters)
+                self._cond.notify_all()
+
+        waited = time.monotonic() - started
+        with self._cond:
+            self.admitted[lane] += 1
+            self.wait_seconds[lane] += waited
+        return Permit(tokens, lane, waited)
+
+    def release(self, permit: Permit, used_tokens: int = None, rate_limited: bool = False,
+                retry_after: float = None):
+        """
+        Return a permit; used_tokens reconciles the estimate with actual usage
+        rate_limited halves the concurrency limit (and holds the bucket for
+        retry_after seconds); a success grows it by 1/limit
+        """
+        if used_tokens is not None:
+            self.bucket.adjust(permit.tokens - used_tokens)
+        if rate_limited and retry_after:
+            self.bucket.hold(retry_after)
+        with self._cond:
+            self.in_flight -= 1
+            if rate_limited:
+                self.rate_limited += 1
+                self.limit = max(float(self.min_concurrency), self.limit / 2)
+            else:
+                self.limit = min(float(self.max_concurrency), self.limit + 1 / self.limit)
+            self._cond.notify_all()
+
+    @contextmanager
+    def slot(self, tokens: int, lane: str = None) -> Iterator[Permit]:
+        """acquire/release around a block; rate limiting must be reported via release instead"""
+        permit = self.acquire(tokens, lane)
+        try:
+            yield permit
+        finally:
+            self.release(permit)
+
+    def stats(self) -> Dict:
+        with self._cond:
+            return {
+                "concurrency_limit": round(self.limit, 2),
+                "in_flight": self.in_flight,
+                "queued": len(self._waiters),
+                "admitted": dict(self.admitted),
+                "wait_seconds": {lane: round(seconds, 3) for lane, seconds in self.wait_seconds.items()},
+                "rate_limited": self.rate_limited,
+                "tokens_per_minute": int(self.bucket.rate * 60),
+                "shared_budget": isinstance(self.bucket, FileTokenBucket)
+            }
+
+
+# Priority lane of the current analysis; worker threads inherit it via copied contexts
+_current_lane: contextvars.ContextVar = contextvars.ContextVar("llm_lane", default=None)
+
+
+def current_lane() -> str:
+    """Lane set by use_lane, else LLM_LANE, else interactive"""
+    lane = _current_lane.get() or os.getenv("LLM_LANE", "interactive")
+    return lane if lane in LANES else "interactive"
+
+
+@contextmanager
+def use_lane(lane: str) -> Iterator[str]:
+    """Run the enclosed block's LLM requests in lane ("interactive" or "batch")"""
+    if lane not in LANES:
+        raise ValueError(f"Unknown lane: {lane}")
+    token = _current_lane.set(lane)
+    try:
+        yield lane
+    finally:
+        _current_lane.reset(token)
+
+
+# Singleton instance
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler() -> LLMScheduler:
+    """
+    Get or create the process-wide scheduler
+    Configured via LLM_TOKENS_PER_MINUTE, LLM_MAX_CONCURRENCY and, to share the
+    token budget across processes, LLM_SCHEDULER_STATE_PATH
+    """
+    global _scheduler
+    if _scheduler is None:
+        with _scheduler_lock:
+            if _scheduler is None:
+                tokens_per_minute = int(os.getenv("LLM_TOKENS_PER_MINUTE", LLM_TOKENS_PER_MINUTE))
+                state_path = os.getenv("LLM_SCHEDULER_STATE_PATH", LLM_SCHEDULER_STATE_PATH)
+                if state_path and fcntl is not None:
+                    bucket = FileTokenBucket(state_path, tokens_per_minute)
+                else:
+                    bucket = TokenBucket(tokens_per_minute)
+                _scheduler = LLMScheduler(
+                    bucket, max_concurrency=int(os.getenv("LLM_MAX_CONCURRENCY", LLM_MAX_CONCURRENCY))
+                )
+    return _scheduler
+
+
+def get_scheduler_stats() -> Dict:
+    """Wrapper function to get scheduler statistics"""
+    return get_scheduler().stats()
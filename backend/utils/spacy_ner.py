@@ -0,0 +1,141 @@
+"""
+Statistical NER Module - Optional spaCy backend for parties and locations
+spaCy and its model are imported on first use, once per process, with the
+components entity recognition does not need excluded so they are never
+loaded. Documents are cut into chunks of whole sentences that nlp.pipe
+batches (optionally across worker processes), and every entity's offsets
+point back into the original text. Nothing is downloaded here; install the
+model with `python -m backend.provision --spacy`
+"""
+import os
+import threading
+from typing import Iterable, List, NamedTuple, Optional, Tuple, Union
+
+from backend.utils.document import Document
+
+
+SPACY_MODEL = os.getenv("SPACY_MODEL", "en_core_web_sm")
+# Pipeline components entity recognition does not read from
+EXCLUDED_COMPONENTS = ("parser", "lemmatizer", "tagger", "attribute_ruler", "senter")
+# Chunk size for nlp.pipe; a sentence longer than this is cut at whitespace
+CHUNK_CHARS = int(os.getenv("SPACY_CHUNK_CHARS", "4000"))
+BATCH_SIZE = int(os.getenv("SPACY_BATCH_SIZE", "32"))
+# Worker processes for nlp.pipe; each start-up costs a model load, so values
+# above 1 only pay off for long documents or many documents per call
+N_PROCESS = int(os.getenv("SPACY_N_PROCESS", "1"))
+
+# spaCy label -> entity kind reported by the NER stage
+ENTITY_LABELS = {
+    "ORG": "party",
+    "PERSON": "party",
+    "GPE": "location",
+    "LOC": "location",
+}
+
+Span = Tuple[int, int]
+
+_nlp = None
+_nlp_error: Optional[str] = None
+_nlp_lock = threading.Lock()
+
+
+class StatisticalEntity(NamedTuple):
+    """An entity the model found at text[start:end]; label is the spaCy label"""
+    kind: str
+    start: int
+    end: int
+    value: str
+    label: str
+
+
+def _load_model():
+    """Load the spaCy pipeline, or record why it cannot be loaded (lock held)"""
+    global _nlp, _nlp_error
+    try:
+        import spacy
+        _nlp = spacy.load(SPACY_MODEL, exclude=list(EXCLUDED_COMPONENTS))
+    except (ImportError, OSError) as e:
+        # OSError: spaCy is installed but the model package is not
+        _nlp_error = f"{type(e).__name__}: {e}"
+
+
+def get_nlp():
+    """Get or load the process-wide spaCy pipeline; None when spaCy or the model is missing"""
+    if _nlp is None and _nlp_error is None:
+        with _nlp_lock:
+            if _nlp is None and _nlp_error is None:
+                _load_model()
+    return _nlp
+
+
+def model_version() -> Optional[str]:
+    """Name and version of the loaded model (en_core_web_sm-3.7.1), or None when unavailable"""
+    nlp = get_nlp()
+    if nlp is None:
+        return None
+    return f"{nlp.meta.get('lang', '')}_{nlp.meta.get('name', '')}-{nlp.meta.get('version', '')}"
+
+
+def unavailable_reason() -> Optional[str]:
+    """Why the model could not be loaded, or None if it loads"""
+    get_nlp()
+    return _nlp_error
+
+
+def _cut(text: str, start: int, end: int, max_chars: int) -> List[Span]:
+    """Split text[start:end] into pieces of at most max_chars, preferring whitespace"""
+    pieces = []
+    while end - start > max_chars:
+        cut = text.rfind(" ", start + 1, start + max_chars)
+        if cut == -1:
+            cut = start + max_chars
+        pieces.append((start, cut))
+        start = cut
+    pieces.append((start, end))
+    return pieces
+
+
+def sentence_chunks(text: Union[str, Document], max_chars: int = CHUNK_CHARS) -> List[Span]:
+    """(start, end) of runs of consecutive sentences, each at most max_chars long"""
+    doc = Document.ensure(text)
+    chunks = []
+    start = end = None
+    for sentence_start, sentence_end in doc.sentence_spans:
+        if start is not None and sentence_end - start > max_chars:
+            chunks.append((start, end))
+            start = None
+        if start is None:
+            start = sentence_start
+        end = sentence_end
+    if start is not None:
+        chunks.append((start, end))
+    return [piece for chunk in chunks for piece in _cut(doc.text, chunk[0], chunk[1], max_chars)]
+
+
+def find_entities(texts: Iterable[Union[str, Document]], n_process: int = None,
+                  batch_size: int = None) -> List[List[StatisticalEntity]]:
+    """
+    Parties and locations in each text, in text order
+    The chunks of all texts go through one nlp.pipe call, so passing many
+    documents at once batches across them. Raises RuntimeError when the
+    model is unavailable
+    """
+    nlp = get_nlp()
+    if nlp is None:
+        raise RuntimeError(f"spaCy model {SPACY_MODEL} is not available ({_nlp_error})")
+
+    docs = [Document.ensure(text) for text in texts]
+    chunks = [(index, start, end) for index, doc in enumerate(docs) for start, end in sentence_chunks(doc)]
+    pieces = (docs[index].text[start:end] for index, start, end in chunks)
+    parsed_pieces = nlp.pipe(pieces, batch_size=batch_size or BATCH_SIZE, n_process=n_process or N_PROCESS)
+
+    results = [[] for _ in docs]
+    for (index, offset, _), parsed in zip(chunks, parsed_pieces):
+        for ent in parsed.ents:
+            kind = ENTITY_LABELS.get(ent.label_)
+            if kind is None:
+                continue
+            results[index].append(StatisticalEntity(
+                kind, offset + ent.start_char, offset + ent.end_char, ent.text, ent.label_
+            ))
+    return results
@@ -0,0 +1,153 @@
+"""
+SQLite Store Module - Shared on-disk LRU store behind the persistent caches
+Each cache names its table and value columns; the store adds the key and
+the created/accessed timestamps, expires rows past an optional TTL and
+evicts least recently used rows beyond max_entries
+"""
+import os
+import sqlite3
+import threading
+import time
+from typing import Callable, Generic, List, Optional, Sequence, Tuple, TypeVar
+
+
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "contract_analysis")
+
+T = TypeVar("T")
+
+
+class SQLiteStore:
+    """
+    One table of key -> value columns with LRU eviction (max_entries) and TTL
+    expiry (ttl_seconds); 0 disables either. A "hits" column, if declared,
+    counts lookups per row. Every method takes the store lock, which is
+    re-entrant so a cache can hold it around several calls
+    """
+
+    def __init__(self, path: str, table: str, columns: Sequence[str],
+                 max_entries: int = 0, ttl_seconds: float = 0):
+        self.path = path
+        self.table = table
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.columns = [column.split()[0] for column in columns]
+        self.lock = threading.RLock()
+
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        definitions = ",\n".join(
+            ["key TEXT PRIMARY KEY", *columns, "created_at REAL NOT NULL", "accessed_at REAL NOT NULL"]
+        )
+        self._conn.execute(f"CREATE TABLE IF NOT EXISTS {table} (\n{definitions}\n)")
+        self._conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{table}_accessed ON {table}(accessed_at)")
+        self._conn.commit()
+
+    def get(self, key: str, columns: Sequence[str]) -> Optional[Tuple]:
+        """Return the given columns of key's row and mark it used, or None on miss/expiry"""
+        now = time.time()
+        with self.lock:
+            row = self._conn.execute(
+                f"SELECT {', '.join(['created_at', *columns])} FROM {self.table} WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+
+            if self.ttl_seconds and now - row[0] > self.ttl_seconds:
+                self._conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+
+            hits = ", hits = hits + 1" if "hits" in self.columns else ""
+            self._conn.execute(f"UPDATE {self.table} SET accessed_at = ?{hits} WHERE key = ?", (now, key))
+            self._conn.commit()
+        return row[1:]
+
+    def set(self, key: str, **values):
+        """Store a row and evict least recently used rows over capacity"""
+        now = time.time()
+        names = ["key", *values, "created_at", "accessed_at"]
+        with self.lock:
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO {self.table} ({', '.join(names)}) "
+                f"VALUES ({', '.join('?' * len(names))})",
+                (key, *values.values(), now, now)
+            )
+            if self.max_entries:
+                self._conn.execute(
+                    f"""DELETE FROM {self.table} WHERE key IN (
+                        SELECT key FROM {self.table} ORDER BY accessed_at DESC LIMIT -1 OFFSET ?
+                    )""",
+                    (self.max_entries,)
+                )
+            self._conn.commit()
+
+    def delete(self, **filters) -> int:
+        """
+        Remove rows whose columns equal every non-None filter; with none, clear the table
+        Returns: number of rows removed
+        """
+        conditions = {column: value for column, value in filters.items() if value is not None}
+        query = f"DELETE FROM {self.table}"
+        if conditions:
+            query += " WHERE " + " AND ".join(f"{column} = ?" for column in conditions)
+
+        with self.lock:
+            removed = self._conn.execute(query, list(conditions.values())).rowcount
+            self._conn.commit()
+        return removed
+
+    def purge_expired(self) -> int:
+        """Remove all rows older than the TTL"""
+        if not self.ttl_seconds:
+            return 0
+        with self.lock:
+            removed = self._conn.execute(
+                f"DELETE FROM {self.table} WHERE created_at < ?", (time.time() - self.ttl_seconds,)
+            ).rowcount
+            self._conn.commit()
+        return removed
+
+    def recent(self, columns: Sequence[str], limit: int) -> List[Tuple]:
+        """The given columns of the limit most recently used rows, most recent first"""
+        with self.lock:
+            return self._conn.execute(
+                f"SELECT {', '.join(columns)} FROM {self.table} ORDER BY accessed_at DESC LIMIT ?", (limit,)
+            ).fetchall()
+
+    def aggregate(self, *expressions: str) -> Tuple:
+        """Evaluate SQL aggregates (e.g. "COUNT(*)") over the whole table"""
+        with self.lock:
+            return self._conn.execute(f"SELECT {', '.join(expressions)} FROM {self.table}").fetchone()
+
+
+class CacheSingleton(Generic[T]):
+    """
+    Process-wide cache instance, created on first use by factory
+    Returns None when <env_prefix>_DISABLED is set or the store cannot be opened
+    """
+
+    def __init__(self, env_prefix: str, factory: Callable[[], T]):
+        self.env_prefix = env_prefix
+        self.factory = factory
+        self._instance: Optional[T] = None
+        self._lock = threading.Lock()
+
+    def get(self) -> Optional[T]:
+        """The shared instance, or None when disabled or unusable"""
+        if os.getenv(f"{self.env_prefix}_DISABLED", "").lower() in ("1", "true", "yes"):
+            return None
+        if self._instance is None:
+            with self._lock:
+                if self._instance is None:
+                    try:
+                        self._instance = self.factory()
+                    except (sqlite3.Error, OSError):
+                        # Caching is an optimization; run uncached if the store is unusable
+                        return None
+        return self._instance
+
+    def reset(self):
+        """Drop the instance so the next get() reopens the store (settings are re-read)"""
+        with self._lock:
+            self._instance = None
@@ -0,0 +1,108 @@
+"""
+Text Cache Module - On-disk cache of extracted document text
+Keyed by a SHA-256 of the uploaded file bytes plus the extractor version, so
+re-uploading the same PDF or DOCX skips parsing entirely
+"""
+import hashlib
+import json
+import os
+import zlib
+from typing import Dict, List, Optional, Tuple
+
+from backend.utils.sqlite_store import CACHE_DIR, CacheSingleton, SQLiteStore
+
+
+DEFAULT_CACHE_PATH = os.path.join(CACHE_DIR, "text_cache.sqlite3")
+DEFAULT_MAX_ENTRIES = 2000
+
+
+class ExtractedTextCache:
+    """
+    SQLite store of zlib-compressed extracted text and page start offsets
+    Least recently used entries are evicted beyond max_entries
+    """
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.path = path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.bytes_saved = 0
+        self._store = SQLiteStore(
+            path, "texts",
+            ("file_type TEXT NOT NULL", "text BLOB NOT NULL", "page_offsets TEXT NOT NULL",
+             "raw_size INTEGER NOT NULL", "text_size INTEGER NOT NULL", "hits INTEGER NOT NULL DEFAULT 0"),
+            max_entries=max_entries
+        )
+
+    @staticmethod
+    def make_key(data: bytes, extractor_version: str) -> str:
+        """Content-addressed key for raw file bytes"""
+        return f"{extractor_version}:{hashlib.sha256(data).hexdigest()}"
+
+    def get(self, key: str, raw_size: int = 0) -> Optional[Tuple[str, str, List[int]]]:
+        """
+        Return (text, file_type, page_offsets) for key, or None on miss
+        raw_size is credited to bytes_saved on a hit
+        """
+        with self._store.lock:
+            row = self._store.get(key, ("file_type", "text", "page_offsets"))
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.bytes_saved += raw_size
+
+        file_type, blob, page_offsets = row
+        return zlib.decompress(blob).decode("utf-8"), file_type, json.loads(page_offsets)
+
+    def set(self, key: str, text: str, file_type: str, page_offsets: List[int], raw_size: int):
+        """Store extracted text and evict least recently used entries over capacity"""
+        self._store.set(
+            key, file_type=file_type, text=zlib.compress(text.encode("utf-8"), 6),
+            page_offsets=json.dumps(page_offsets), raw_size=raw_size, text_size=len(text)
+        )
+
+    def invalidate(self, key: str = None) -> int:
+        """Remove one entry, or everything when key is None"""
+        return self._store.delete(key=key)
+
+    def stats(self) -> Dict:
+        """Get hit ratio and bytes saved (this process and over the cache lifetime)"""
+        entries, stored_bytes, lifetime_saved = self._store.aggregate(
+            "COUNT(*)", "COALESCE(SUM(LENGTH(text)), 0)", "COALESCE(SUM(hits * raw_size), 0)"
+        )
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 3) if lookups else 0.0,
+            "bytes_saved": self.bytes_saved,
+            "lifetime_bytes_saved": lifetime_saved,
+            "entries": entries,
+            "stored_bytes": stored_bytes,
+            "max_entries": self.max_entries,
+            "path": self.path
+        }
+
+
+# Singleton instance
+_cache = CacheSingleton("TEXT_CACHE", lambda: ExtractedTextCache(
+    path=os.getenv("TEXT_CACHE_PATH", DEFAULT_CACHE_PATH),
+    max_entries=int(os.getenv("TEXT_CACHE_MAX_ENTRIES", DEFAULT_MAX_ENTRIES))
+))
+
+
+def get_text_cache() -> Optional[ExtractedTextCache]:
+    """
+    Get or create the process-wide extracted-text cache
+    Configured via TEXT_CACHE_PATH and TEXT_CACHE_MAX_ENTRIES; set
+    TEXT_CACHE_DISABLED=1 to turn caching off
+    """
+    return _cache.get()
+
+
+def get_text_cache_stats() -> Dict:
+    """Wrapper function to get extracted-text cache statistics"""
+    cache = get_text_cache()
+    return cache.stats() if cache else {"enabled": False}
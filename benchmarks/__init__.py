@@ -0,0 +1,15 @@
+"""
+Benchmarks Package - Reproducible performance measurements for the analysis pipeline
+"""
+from .generator import generate_contract, generate_file
+from .mock_llm import MockAnthropicClient
+from .baseline import compare, load_baseline, save_baseline
+
+__all__ = [
+    'generate_contract',
+    'generate_file',
+    'MockAnthropicClient',
+    'compare',
+    'load_baseline',
+    'save_baseline',
+]
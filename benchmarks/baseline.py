@@ -0,0 +1,68 @@
+"""
+Baseline Comparison - Flag benchmark regressions against a stored results file
+"""
+import json
+import os
+from typing import Dict, List
+
+
+DEFAULT_THRESHOLD = 0.20
+# Ignore slowdowns smaller than this many seconds; sub-millisecond timings are mostly noise
+DEFAULT_NOISE_FLOOR = 0.002
+
+
+def load_baseline(path: str) -> Dict:
+    """Read a results file written by save_baseline (empty dict if missing)"""
+    if not path or not os.path.exists(path):
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_baseline(results: Dict, path: str):
+    """Store benchmark results as the new baseline"""
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def compare(results: Dict, baseline: Dict, threshold: float = DEFAULT_THRESHOLD,
+            noise_floor: float = DEFAULT_NOISE_FLOOR) -> List[Dict]:
+    """
+    Compare median timings benchmark by benchmark
+    Returns one row per benchmark present in both files; a row is a regression
+    when the current median exceeds the baseline by more than threshold (a
+    fraction, 0.2 = 20%) and by more than noise_floor seconds
+    """
+    current = results.get("benchmarks", {})
+    previous = baseline.get("benchmarks", {})
+    rows = []
+    for name in sorted(set(current) & set(previous)):
+        before = previous[name]["median_seconds"]
+        after = current[name]["median_seconds"]
+        change = (after - before) / before if before > 0 else 0.0
+        rows.append({
+            "name": name,
+            "baseline_seconds": before,
+            "current_seconds": after,
+            "change": round(change, 4),
+            "regression": change > threshold and after - before > noise_floor
+        })
+    return rows
+
+
+def format_comparison(rows: List[Dict]) -> str:
+    """Plain-text table of a comparison"""
+    if not rows:
+        return "No benchmarks in common with the baseline"
+    width = max(len(row["name"]) for row in rows)
+    lines = [f"{'benchmark'.ljust(width)}  {'baseline':>10}  {'current':>10}  {'change':>8}"]
+    for row in rows:
+        flag = "  REGRESSION" if row["regression"] else ""
+        lines.append(
+            f"{row['name'].ljust(width)}  {row['baseline_seconds']:>10.4f}  "
+            f"{row['current_seconds']:>10.4f}  {row['change']:>+8.1%}{flag}"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,253 @@
+"""
+Synthetic Contract Generator - Seeded, reproducible contracts for benchmarking
+Builds numbered-section contracts from clause templates covering every
+IMPORTANT_CLAUSES category and renders them as TXT, DOCX or PDF
+"""
+import io
+import random
+import textwrap
+from typing import Dict, List, Tuple
+
+from backend.utils.clause_extractor import IMPORTANT_CLAUSES
+
+
+LINES_PER_PAGE = 50
+LINE_WIDTH = 90
+FORMATS = ("txt", "docx", "pdf")
+
+PARTIES = [
+    "Sharma Technologies Private Limited", "Mehta Logistics LLP", "Kaveri Foods Pvt. Ltd.",
+    "Northwind Services Limited", "Rao & Sons Traders", "Bluepeak Software Solutions Pvt. Ltd.",
+    "Ganga Textiles Limited", "Lotus Facility Management Pvt. Ltd.",
+]
+PEOPLE = ["Rajesh Kumar", "Priya Sharma", "Anil Mehta", "Sunita Rao", "Vikram Singh", "Meera Iyer"]
+CITIES = ["Mumbai", "Bengaluru", "Chennai", "New Delhi", "Pune", "Hyderabad", "Kolkata"]
+MONTHS = ["January", "February", "March", "April", "May", "June", "July",
+          "August", "September", "October", "November", "December"]
+CONTRACT_TITLES = {
+    "employment": "EMPLOYMENT AGREEMENT",
+    "vendor": "VENDOR SUPPLY AGREEMENT",
+    "lease": "LEASE AGREEMENT",
+    "partnership": "PARTNERSHIP AGREEMENT",
+    "service": "SERVICE AGREEMENT",
+    "nda": "NON-DISCLOSURE AGREEMENT",
+}
+
+# Sentence templates per clause category; {a}/{b} are the parties, the rest are filled at random
+CLAUSE_TEMPLATES: Dict[str, List[str]] = {
+    "termination": [
+        "Either party may terminate this Agreement by giving {days} days written notice to the other party.",
+        "{a} may terminate at will and without cause at its sole discretion.",
+        "Upon termination, {b} shall return all property and settle outstanding dues within {days} days.",
+        "Cancellation of any purchase order after dispatch shall attract a charge of {pct}% of its value.",
+    ],
+    "compensation": [
+        "{a} shall pay {b} a monthly fee of Rs. {amount} payable on or before the {day}th of each month.",
+        "The total compensation for the Services shall be INR {amount} inclusive of applicable taxes.",
+        "Salary shall be reviewed annually and any revision shall be at the sole discretion of {a}.",
+        "Payment terms are net {days} days from the date of a valid invoice.",
+    ],
+    "confidentiality": [
+        "{b} shall keep all Confidential Information strictly confidential and shall not disclose it to any third party.",
+        "The confidentiality obligations in this clause shall survive for {years} years after termination.",
+        "Confidential information excludes information that is publicly available through no fault of {b}.",
+    ],
+    "non-compete": [
+        "For {years} years after termination {b} shall not engage in any competing business in {city}.",
+        "This non-compete restriction applies to all clients serviced during the term of this Agreement.",
+    ],
+    "liability": [
+        "{b} shall indemnify and hold harmless {a} against all claims, losses and damages.",
+        "The aggregate liability of {a} shall not exceed Rs. {amount} under any circumstances.",
+        "{b} accepts unlimited liability for any breach of the data protection obligations herein.",
+    ],
+    "intellectual_property": [
+        "All intellectual property created under this Agreement shall vest exclusively in {a}.",
+        "{b} hereby assigns all copyright, patent and trademark rights in the deliverables to {a}.",
+        "The licence granted herein is perpetual and irrevocable.",
+    ],
+    "jurisdiction": [
+        "This Agreement shall be governed by the laws of India.",
+        "The courts at {city} shall have exclusive jurisdiction over any matter arising from this Agreement.",
+    ],
+    "auto_renewal": [
+        "This Agreement shall automatically renew for successive periods of {years} year(s) unless terminated.",
+        "Renewal shall be on the same terms unless either party gives notice {days} days before expiry.",
+    ],
+    "severance": [
+        "In the event of redundancy {a} shall pay severance equal to {months} months of salary.",
+        "No separation benefits shall be payable where termination is for cause.",
+    ],
+    "notice": [
+        "All notices shall be in writing and delivered to the registered office of the receiving party.",
+        "A notice shall be deemed received {days} days after dispatch by registered post.",
+    ],
+    "arbitration": [
+        "Any dispute shall be referred to arbitration under the Arbitration and Conciliation Act, 1996.",
+        "The seat of arbitration shall be {city} and the proceedings shall be conducted in English.",
+        "The parties shall first attempt mediation for {days} days before initiating dispute resolution.",
+    ],
+    "penalties": [
+        "Delay in delivery shall attract a penalty of {pct}% of the order value per week of delay.",
+        "Any breach of this clause shall attract a fine of Rs. {amount} per incident.",
+    ],
+    "force_majeure": [
+        "Neither party shall be liable for failure caused by force majeure or circumstances beyond control.",
+        "If a force majeure event continues for more than {days} days either party may terminate this Agreement.",
+    ],
+    "warranty": [
+        "{b} warrants that the Services shall be performed with reasonable skill and care.",
+        "The warranty period shall be {months} months from the date of acceptance.",
+        "{a} makes no representation or guarantee as to fitness for a particular purpose.",
+    ],
+    "assignment": [
+        "Neither party may assign this Agreement without the prior written consent of the other party.",
+        "{a} may assign its rights to any affiliate without notice to {b}.",
+    ],
+    "entire_agreement": [
+        "This Agreement constitutes the entire agreement between the parties.",
+        "This Agreement supersedes all prior understandings, whether written or oral.",
+    ],
+}
+
+HEADINGS = {category: category.replace("_", " ").replace("-", " ").upper() for category in CLAUSE_TEMPLATES}
+
+
+def _fill(template: str, rng: random.Random, parties: Tuple[str, str]) -> str:
+    """Fill one template with seeded values"""
+    return template.format(
+        a=parties[0],
+        b=parties[1],
+        days=rng.choice([7, 15, 30, 45, 60, 90]),
+        day=rng.randint(1, 28),
+        months=rng.choice([1, 2, 3, 6, 12]),
+        years=rng.choice([1, 2, 3, 5]),
+        pct=rng.choice([0.5, 1, 2, 5, 10]),
+        amount=f"{rng.randint(1, 999) * 1000:,}",
+        city=rng.choice(CITIES),
+    )
+
+
+def generate_contract(pages: int = 1, seed: int = 0, contract_type: str = None) -> str:
+    """
+    Build a contract roughly `pages` pages long (LINES_PER_PAGE wrapped lines each)
+    The same (pages, seed, contract_type) always yields the same text
+    """
+    if pages < 1:
+        raise ValueError("pages must be at least 1")
+    rng = random.Random(seed)
+    contract_type = contract_type or rng.choice(sorted(CONTRACT_TITLES))
+    parties = tuple(rng.sample(PARTIES, 2))
+    signed_on = f"{rng.randint(1, 28)} {rng.choice(MONTHS)} {rng.randint(2019, 2025)}"
+
+    lines = [
+        CONTRACT_TITLES[contract_type],
+        "",
+        f"This Agreement is made on {signed_on} at {rng.choice(CITIES)} between {parties[0]} "
+        f"(the \"Company\") and {parties[1]} (the \"Counterparty\"), represented by {rng.choice(PEOPLE)}.",
+        "",
+    ]
+    target_lines = pages * LINES_PER_PAGE
+    categories = sorted(CLAUSE_TEMPLATES)
+    section = 1
+    line_count = sum(len(textwrap.wrap(line, LINE_WIDTH)) or 1 for line in lines)
+
+    while line_count < target_lines:
+        category = categories[(section - 1) % len(categories)] if section <= len(categories) else rng.choice(categories)
+        templates = CLAUSE_TEMPLATES[category]
+        count = min(len(templates), rng.randint(2, 4))
+        sentences = [_fill(template, rng, parties) for template in rng.sample(templates, count)]
+        block = [f"{section}. {HEADINGS[category]}", " ".join(sentences), ""]
+        lines.extend(block)
+        line_count += sum(len(textwrap.wrap(line, LINE_WIDTH)) or 1 for line in block)
+        section += 1
+
+    lines.extend([
+        f"IN WITNESS WHEREOF the parties have signed this Agreement on {signed_on}.",
+        f"For {parties[0]}: {rng.choice(PEOPLE)}",
+        f"For {parties[1]}: {rng.choice(PEOPLE)}",
+    ])
+    return "\n".join(lines) + "\n"
+
+
+def paginate(text: str) -> List[List[str]]:
+    """Wrap text to LINE_WIDTH and split it into pages of LINES_PER_PAGE lines"""
+    wrapped = []
+    for line in text.split("\n"):
+        wrapped.extend(textwrap.wrap(line, LINE_WIDTH) or [""])
+    return [wrapped[i:i + LINES_PER_PAGE] for i in range(0, len(wrapped), LINES_PER_PAGE)] or [[""]]
+
+
+def to_txt(text: str) -> bytes:
+    return text.encode("utf-8")
+
+
+def to_docx(text: str) -> bytes:
+    """One paragraph per line via python-docx"""
+    from docx import Document
+
+    document = Document()
+    for line in text.split("\n"):
+        if line.strip():
+            document.add_paragraph(line)
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+def _pdf_escape(line: str) -> str:
+    return line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def to_pdf(text: str) -> bytes:
+    """
+    Minimal single-font PDF writer (Helvetica, one text object per page)
+    Avoids a PDF-authoring dependency; pdfplumber reads it back line by line
+    """
+    pages = paginate(text)
+    objects: List[bytes] = []
+
+    def add(body: bytes) -> int:
+        objects.append(body)
+        return len(objects)
+
+    font_id = add(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+    # Content and page objects come next, so the page tree id is known in advance
+    pages_id = font_id + 2 * len(pages) + 1
+    kids = []
+    for lines in pages:
+        stream = "BT /F1 10 Tf 50 760 Td 14 TL " + " ".join(f"({_pdf_escape(line)}) '" for line in lines) + " ET"
+        data = stream.encode("latin-1", "replace")
+        content_id = add(b"<< /Length %d >>\nstream\n" % len(data) + data + b"\nendstream")
+        kids.append(add(
+            b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 612 792] /Contents %d 0 R "
+            b"/Resources << /Font << /F1 %d 0 R >> >> >>" % (pages_id, content_id, font_id)
+        ))
+    add(b"<< /Type /Pages /Kids [%s] /Count %d >>" % (b" ".join(b"%d 0 R" % k for k in kids), len(kids)))
+    catalog_id = add(b"<< /Type /Catalog /Pages %d 0 R >>" % pages_id)
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, catalog_id, xref)
+    return bytes(out)
+
+
+RENDERERS = {"txt": to_txt, "docx": to_docx, "pdf": to_pdf}
+
+
+def generate_file(fmt: str, pages: int = 1, seed: int = 0, contract_type: str = None) -> Tuple[bytes, str]:
+    """Render a generated contract; returns (file bytes, file name)"""
+    if fmt not in RENDERERS:
+        raise ValueError(f"Unsupported format: {fmt}")
+    text = generate_contract(pages, seed, contract_type)
+    return RENDERERS[fmt](text), f"synthetic_{pages}p_s{seed}.{fmt}"
+
+
+# Every clause category the extractor knows about must have templates
+assert set(CLAUSE_TEMPLATES) == set(IMPORTANT_CLAUSES), "CLAUSE_TEMPLATES out of sync with IMPORTANT_CLAUSES"
@@ -0,0 +1,228 @@
+"""
+Benchmark Harness - Time each pipeline stage and the full pipeline on synthetic contracts
+
+Usage:
+    python -m benchmarks.harness --sizes 1,10,100 --formats txt,docx,pdf
+    python -m benchmarks.harness --baseline benchmarks/baseline.json --threshold 0.2
+    python -m benchmarks.harness --save-baseline benchmarks/baseline.json
+
+The LLM is replaced by a deterministic mock and the analysis, text and result
+caches are disabled, so every run does the same work. Exits 1 when any benchmark is
+slower than the baseline by more than the threshold.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from typing import Callable, Dict, List
+
+from benchmarks.baseline import (
+    DEFAULT_THRESHOLD, compare, format_comparison, load_baseline, save_baseline
+)
+from benchmarks.generator import FORMATS, generate_contract, generate_file
+from benchmarks.mock_llm import MockAnthropicClient
+
+
+def install_mock_llm(latency: float = 0.0, client=None, tokens_per_minute: int = 0):
+    """
+    Disable caches and point the shared RiskAnalyzer at a mock client
+    (a MockAnthropicClient unless client is given, e.g. mock_api.in_process_client)
+    The analyzer gets its own scheduler; tokens_per_minute=0 leaves the token
+    budget unlimited so benchmarks measure the pipeline, not the throttle
+    """
+    os.environ["ANALYSIS_CACHE_DISABLED"] = "1"
+    os.environ["TEXT_CACHE_DISABLED"] = "1"
+    os.environ["RESULT_CACHE_DISABLED"] = "1"
+    from backend.utils import risk_engine
+    from backend.utils.scheduler import LLMScheduler, TokenBucket
+
+    client = client or MockAnthropicClient(latency)
+    analyzer = risk_engine.RiskAnalyzer(offline=False, client=client)
+    analyzer.scheduler = LLMScheduler(TokenBucket(tokens_per_minute))
+    risk_engine._analyzer = analyzer
+    return client
+
+
+def time_call(fn: Callable, repeat: int = 3, setup: Callable = None) -> Dict:
+    """
+    Run fn repeat times (after one untimed warm-up) and summarize wall times
+    setup, if given, is called untimed before every run and its result passed to fn
+    """
+    fn(setup() if setup else None)
+    timings = []
+    for _ in range(repeat):
+        arg = setup() if setup else None
+        started = time.perf_counter()
+        fn(arg)
+        timings.append(time.perf_counter() - started)
+    return {
+        "median_seconds": round(statistics.median(timings), 6),
+        "min_seconds": round(min(timings), 6),
+        "max_seconds": round(max(timings), 6),
+        "runs": repeat
+    }
+
+
+def benchmark_stages(pages: int, seed: int = 0, repeat: int = 3) -> Dict[str, Dict]:
+    """Time each text-processing stage in isolation on a generated contract"""
+    from backend.utils.clause_extractor import extract_clauses
+    from backend.utils.contract_classifier import classify_contract_type
+    from backend.utils.document import Document
+    from backend.utils.file_reader import normalize_text
+    from backend.utils.ner import extract_entities
+    from backend.utils.risk_engine import get_analyzer, overall_risk
+
+    text = generate_contract(pages, seed)
+    cleaned, _ = normalize_text(text)
+
+    def fresh_document() -> Document:
+        return Document(cleaned)
+
+    def prepared_document() -> Document:
+        # Shared views built up front so later stages are timed on their own work
+        doc = Document(cleaned)
+        doc.sentence_spans
+        doc.keyword_hits
+        return doc
+
+    doc = prepared_document()
+    clauses = extract_clauses(doc, max_clauses=15)
+    analyzer = get_analyzer()
+    analyzed = [
+        dict(analyzer._fallback_analysis(c["full_text"], c["type"]), type=c["type"]) for c in clauses
+    ]
+
+    stages = {
+        "normalize": time_call(lambda _: normalize_text(text), repeat),
+        "sentence_tokenize": time_call(lambda d: d.sentence_spans, repeat, fresh_document),
+        "keyword_scan": time_call(lambda d: d.keyword_hits, repeat, fresh_document),
+        "classify": time_call(classify_contract_type, repeat, prepared_document),
+        "ner": time_call(extract_entities, repeat, prepared_document),
+        "extract_clauses": time_call(lambda d: extract_clauses(d, max_clauses=15), repeat, prepared_document),
+        "overall_risk": time_call(lambda d: overall_risk(analyzed, d), repeat, prepared_document),
+    }
+    for result in stages.values():
+        result["bytes"] = len(text.encode("utf-8"))
+    return stages
+
+
+def benchmark_extraction(fmt: str, pages: int, seed: int = 0, repeat: int = 3) -> Dict:
+    """Time extract_text on a generated file"""
+    from backend.cli import NamedBytesIO
+    from backend.utils.file_reader import extract_text
+
+    data, name = generate_file(fmt, pages, seed)
+    result = time_call(lambda _: extract_text(NamedBytesIO(data, name)), repeat)
+    result["bytes"] = len(data)
+    return result
+
+
+def benchmark_pipeline(fmt: str, pages: int, seed: int = 0, repeat: int = 3) -> Dict:
+    """Time analyze_contract end to end (mock LLM) and keep the last run's stage breakdown"""
+    from backend.cli import NamedBytesIO
+    from backend.main import analyze_contract
+
+    data, name = generate_file(fmt, pages, seed)
+    reports = []
+
+    def run(_):
+        report = analyze_contract(NamedBytesIO(data, name))
+        if not report.get("success"):
+            raise RuntimeError(report.get("error"))
+        reports.append(report)
+
+    result = time_call(run, repeat)
+    perf = reports[-1]["perf"]
+    result["bytes"] = len(data)
+    result["stages"] = {stage: stats["wall_seconds"] for stage, stats in perf["stages"].items()}
+    result["llm_calls"] = perf["llm"]["calls"]
+    result["clauses"] = len(reports[-1]["clauses"])
+    return result
+
+
+def run_suite(sizes: List[int], formats: List[str], repeat: int = 3, seed: int = 0,
+              log=sys.stderr) -> Dict:
+    """Run every benchmark; names look like stage/ner/10p, extract/pdf/10p, pipeline/pdf/10p"""
+    benchmarks = {}
+    for pages in sizes:
+        for stage, result in benchmark_stages(pages, seed, repeat).items():
+            benchmarks[f"stage/{stage}/{pages}p"] = result
+        for fmt in formats:
+            benchmarks[f"extract/{fmt}/{pages}p"] = benchmark_extraction(fmt, pages, seed, repeat)
+            benchmarks[f"pipeline/{fmt}/{pages}p"] = benchmark_pipeline(fmt, pages, seed, repeat)
+        if log:
+            print(f"finished {pages}-page benchmarks", file=log)
+
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "sizes": sizes,
+            "formats": formats,
+            "repeat": repeat,
+            "seed": seed,
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%S")
+        },
+        "benchmarks": benchmarks
+    }
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.harness",
+        description="Benchmark pipeline stages on seeded synthetic contracts"
+    )
+    parser.add_argument("--sizes", default="1,10,100", help="Comma-separated page counts (1-1000)")
+    parser.add_argument("--formats", default=",".join(FORMATS), help="Comma-separated formats: txt,docx,pdf")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per benchmark")
+    parser.add_argument("--seed", type=int, default=0, help="Generator seed")
+    parser.add_argument("--llm-latency", type=float, default=0.0, help="Seconds the mock LLM sleeps per request")
+    parser.add_argument("--output", "-o", help="Write results JSON here (default: stdout)")
+    parser.add_argument("--baseline", help="Compare against this baseline results file")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Allowed slowdown as a fraction of the baseline (default: 0.2)")
+    parser.add_argument("--save-baseline", help="Store these results as the baseline")
+    return parser
+
+
+def main(argv: List[str] = None) -> int:
+    args = build_parser().parse_args(argv)
+    sizes = [int(size) for size in args.sizes.split(",") if size.strip()]
+    formats = [fmt.strip().lower() for fmt in args.formats.split(",") if fmt.strip()]
+    if any(not 1 <= size <= 1000 for size in sizes):
+        print("Sizes must be between 1 and 1000 pages", file=sys.stderr)
+        return 2
+    if any(fmt not in FORMATS for fmt in formats):
+        print(f"Formats must be among: {', '.join(FORMATS)}", file=sys.stderr)
+        return 2
+
+    install_mock_llm(args.llm_latency)
+    results = run_suite(sizes, formats, max(1, args.repeat), args.seed)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    else:
+        print(json.dumps(results, indent=2))
+
+    if args.save_baseline:
+        save_baseline(results, args.save_baseline)
+
+    if args.baseline:
+        baseline = load_baseline(args.baseline)
+        if not baseline:
+            print(f"Baseline {args.baseline} not found; nothing to compare", file=sys.stderr)
+            return 0
+        rows = compare(results, baseline, args.threshold)
+        print(format_comparison(rows), file=sys.stderr)
+        if any(row["regression"] for row in rows):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
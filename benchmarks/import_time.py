@@ -0,0 +1,114 @@
+"""
+Import-Time Benchmark - Cold-start cost of the backend entry points
+
+Usage:
+    python -m benchmarks.import_time
+    python -m benchmarks.import_time --repeat 10 --budget 0.5
+
+Each target is imported in a fresh interpreter, so nothing is shared with
+this process. Reports the median import time, the slowest modules (from
+python -X importtime) and any heavy dependency that was loaded eagerly;
+exits 1 when a target exceeds the budget or pulls in a lazy dependency
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from typing import Dict, List
+
+
+TARGETS = ("backend", "backend.main", "backend.cli", "backend.utils")
+
+# Loaded on first use only; importing the backend must not pull them in
+LAZY_MODULES = ("anthropic", "nltk", "pdfplumber", "docx", "spacy", "textblob")
+
+DEFAULT_BUDGET_SECONDS = 1.0
+
+_PROBE = """
+import json, sys, time
+started = time.perf_counter()
+import {target}
+elapsed = time.perf_counter() - started
+print(json.dumps({{"seconds": elapsed, "lazy_loaded": [m for m in {lazy!r} if m in sys.modules]}}))
+"""
+
+
+def _run(args: List[str]) -> subprocess.CompletedProcess:
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    return subprocess.run([sys.executable] + args, cwd=root, capture_output=True, text=True, check=True)
+
+
+def time_import(target: str, repeat: int = 5) -> Dict:
+    """Median wall time of `import target` in fresh interpreters"""
+    timings = []
+    lazy_loaded = []
+    for _ in range(repeat):
+        result = json.loads(_run(["-c", _PROBE.format(target=target, lazy=LAZY_MODULES)]).stdout.strip().splitlines()[-1])
+        timings.append(result["seconds"])
+        lazy_loaded = result["lazy_loaded"]
+    return {
+        "median_seconds": round(statistics.median(timings), 4),
+        "min_seconds": round(min(timings), 4),
+        "max_seconds": round(max(timings), 4),
+        "runs": repeat,
+        "lazy_loaded": lazy_loaded
+    }
+
+
+def slowest_modules(target: str, top: int = 10) -> List[Dict]:
+    """Modules with the largest cumulative import time, parsed from -X importtime"""
+    stderr = _run(["-X", "importtime", "-c", f"import {target}"]).stderr
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, self_us, cumulative_us, name = [part.strip() for part in line.replace("import time:", "|", 1).split("|")]
+        if self_us.isdigit():
+            modules.append({"module": name, "self_ms": int(self_us) / 1000, "cumulative_ms": int(cumulative_us) / 1000})
+    modules.sort(key=lambda module: module["cumulative_ms"], reverse=True)
+    seen = set()
+    unique = [m for m in modules if not (m["module"] in seen or seen.add(m["module"]))]
+    return unique[:top]
+
+
+def run(targets=TARGETS, repeat: int = 5, top: int = 10) -> Dict:
+    return {
+        target: dict(time_import(target, repeat), slowest_modules=slowest_modules(target, top))
+        for target in targets
+    }
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.import_time",
+        description="Measure cold import time of the backend entry points"
+    )
+    parser.add_argument("--targets", default=",".join(TARGETS), help="Comma-separated modules to import")
+    parser.add_argument("--repeat", type=int, default=5, help="Fresh interpreters per target")
+    parser.add_argument("--top", type=int, default=10, help="Slowest modules to list per target")
+    parser.add_argument("--budget", type=float, default=DEFAULT_BUDGET_SECONDS,
+                        help="Fail when a median import exceeds this many seconds")
+    return parser
+
+
+def main(argv: List[str] = None) -> int:
+    args = build_parser().parse_args(argv)
+    targets = [target.strip() for target in args.targets.split(",") if target.strip()]
+    results = run(targets, max(1, args.repeat), args.top)
+    print(json.dumps(results, indent=2))
+
+    failed = False
+    for target, result in results.items():
+        if result["median_seconds"] > args.budget:
+            print(f"{target}: {result['median_seconds']}s exceeds the {args.budget}s budget", file=sys.stderr)
+            failed = True
+        if result["lazy_loaded"]:
+            print(f"{target}: eagerly imports {', '.join(result['lazy_loaded'])}", file=sys.stderr)
+            failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
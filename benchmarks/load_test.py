@@ -0,0 +1,140 @@
+"""
+LLM Load Test - Throughput and tail latency of the real LLM code path, offline
+
+Usage:
+    python -m benchmarks.load_test --contracts 50 --concurrency 8 --latency lognormal:0.8,0.5
+    python -m benchmarks.load_test --transport http --rate-429 0.1 --rate-529 0.02
+
+Analyzes generated contracts concurrently while RiskAnalyzer talks to the
+mock Messages API through the real anthropic SDK (in-process transport or a
+local HTTP server), then reports files/sec, contract and LLM-call latency
+percentiles, fallbacks and the mock server's status and token counts
+"""
+import argparse
+import json
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
+
+from backend.cli import NamedBytesIO, _percentile
+from benchmarks.generator import FORMATS, generate_file
+from benchmarks.harness import install_mock_llm
+from benchmarks.mock_api import (
+    LatencyModel, MockMessagesAPI, ResponseStore, in_process_client, start_server
+)
+
+
+def _latency_summary(values: List[float]) -> Dict:
+    return {
+        f"p{percent}_seconds": round(_percentile(values, percent), 4) for percent in (50, 95, 99)
+    }
+
+
+def run_load_test(api: MockMessagesAPI, contracts: int = 20, concurrency: int = 4, pages: int = 5,
+                  fmt: str = "txt", transport: str = "inprocess", max_retries: int = 0,
+                  tokens_per_minute: int = 0) -> Dict:
+    """Analyze `contracts` generated files, `concurrency` at a time, against api"""
+    from backend.main import analyze_contract
+    from backend.utils.resilience import get_circuit_stats
+    from backend.utils.risk_engine import get_analyzer
+
+    server = None
+    if transport == "http":
+        from anthropic import Anthropic
+        server, base_url = start_server(api)
+        client = Anthropic(api_key="mock", base_url=base_url, max_retries=max_retries)
+    else:
+        client = in_process_client(api, max_retries=max_retries)
+    install_mock_llm(client=client, tokens_per_minute=tokens_per_minute)
+
+    files = [generate_file(fmt, pages, seed) for seed in range(contracts)]
+    contract_latencies = []
+    llm_latencies = []
+    llm_totals = {"calls": 0, "errors": 0, "fallbacks": 0, "retries": 0, "input_tokens": 0, "output_tokens": 0,
+                  "cache_read_tokens": 0, "cache_write_tokens": 0}
+    failures = 0
+
+    def analyze(item):
+        data, name = item
+        started = time.perf_counter()
+        report = analyze_contract(NamedBytesIO(data, name))
+        return report, time.perf_counter() - started
+
+    started = time.perf_counter()
+    try:
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            for report, elapsed in pool.map(analyze, files):
+                contract_latencies.append(elapsed)
+                if not report.get("success"):
+                    failures += 1
+                perf = report.get("perf", {})
+                for key in llm_totals:
+                    llm_totals[key] += perf.get("llm", {}).get(key, 0)
+                llm_latencies.extend(
+                    call["latency_seconds"] for call in perf.get("llm_calls", []) if call["outcome"] == "ok"
+                )
+    finally:
+        if server:
+            server.shutdown()
+            server.server_close()
+    wall = time.perf_counter() - started
+
+    return {
+        "contracts": contracts,
+        "failures": failures,
+        "concurrency": concurrency,
+        "transport": transport,
+        "wall_seconds": round(wall, 3),
+        "files_per_second": round(contracts / wall, 3) if wall > 0 else 0.0,
+        "contract_latency": _latency_summary(contract_latencies),
+        "llm_call_latency": _latency_summary(llm_latencies),
+        "llm": llm_totals,
+        "circuit": get_circuit_stats(),
+        "scheduler": get_analyzer().scheduler.stats(),
+        "server": api.stats()
+    }
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.load_test",
+        description="Load-test the LLM analysis path against the mock Messages API"
+    )
+    parser.add_argument("--contracts", type=int, default=20, help="Contracts to analyze")
+    parser.add_argument("--concurrency", type=int, default=4, help="Contracts analyzed at once")
+    parser.add_argument("--pages", type=int, default=5, help="Pages per generated contract")
+    parser.add_argument("--format", default="txt", choices=FORMATS)
+    parser.add_argument("--transport", default="inprocess", choices=("inprocess", "http"))
+    parser.add_argument("--recordings", help="JSONL of recorded responses to replay")
+    parser.add_argument("--latency", default="lognormal:0.5,0.4",
+                        help="fixed:<s>, uniform:<lo>,<hi> or lognormal:<median>,<sigma>")
+    parser.add_argument("--rate-429", type=float, default=0.0)
+    parser.add_argument("--rate-529", type=float, default=0.0)
+    parser.add_argument("--retry-after", type=float, default=0.5, help="retry-after seconds sent with 429s")
+    parser.add_argument("--max-retries", type=int, default=0,
+                        help="SDK-level retries (RiskAnalyzer already retries with backoff)")
+    parser.add_argument("--tokens-per-minute", type=int, default=0,
+                        help="Scheduler token budget (0 = unlimited)")
+    parser.add_argument("--seed", type=int, default=0)
+    return parser
+
+
+def main(argv: List[str] = None) -> int:
+    args = build_parser().parse_args(argv)
+    api = MockMessagesAPI(
+        store=ResponseStore(args.recordings),
+        latency=LatencyModel(args.latency, args.seed),
+        rate_429=args.rate_429,
+        rate_529=args.rate_529,
+        retry_after=args.retry_after,
+        seed=args.seed
+    )
+    result = run_load_test(api, args.contracts, max(1, args.concurrency), args.pages, args.format,
+                           args.transport, args.max_retries, args.tokens_per_minute)
+    print(json.dumps(result, indent=2))
+    return 1 if result["failures"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
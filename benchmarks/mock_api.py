@@ -0,0 +1,385 @@
+"""
+Mock Messages API - Local stand-in for the Anthropic Messages endpoint
+
+Serves POST /v1/messages over HTTP (or in-process through the SDK's own
+transport) so RiskAnalyzer's real code path - SDK request building, retries,
+response parsing - runs without network access:
+- replays recorded responses keyed by a hash of the prompt, synthesizing a
+  deterministic answer for prompts that were never recorded
+- sleeps according to a latency distribution (fixed, uniform, lognormal)
+- injects 429 rate_limit_error and 529 overloaded_error responses at given rates
+- emulates prompt caching: a tools + system prefix ending in a cache_control
+  block is billed as a cache write the first time and a cache read afterwards
+- accounts input/output/cache tokens, status codes and latencies (GET /stats)
+
+Usage:
+    python -m benchmarks.mock_api --port 8089 --latency lognormal:0.8,0.5 --rate-429 0.05
+    ANTHROPIC_BASE_URL=http://127.0.0.1:8089 ANTHROPIC_API_KEY=mock streamlit run app.py
+"""
+import argparse
+import hashlib
+import json
+import math
+import random
+import sys
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+
+from benchmarks.mock_llm import estimate_tokens, synthesize
+
+
+def prompt_key(request: Dict) -> str:
+    """Hash of the parts of a request that determine the answer (not model or max_tokens)"""
+    material = {
+        "system": request.get("system"),
+        "messages": request.get("messages"),
+        "tools": request.get("tools"),
+    }
+    canonical = json.dumps(material, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def cached_prefix(request: Dict) -> Tuple[Optional[str], int]:
+    """(hash, estimated tokens) of the tools + system prefix, hash None unless marked cacheable"""
+    system = request.get("system") or []
+    if isinstance(system, str):
+        system = [{"type": "text", "text": system}]
+    prefix = json.dumps({"tools": request.get("tools"), "system": system}, sort_keys=True, ensure_ascii=False)
+    tokens = estimate_tokens(prefix)
+    if not system or not isinstance(system[-1], dict) or not system[-1].get("cache_control"):
+        return None, tokens
+    return hashlib.sha256(prefix.encode("utf-8")).hexdigest(), tokens
+
+
+class LatencyModel:
+    """
+    Seeded latency distribution, parsed from a spec string:
+    "fixed:0.5", "uniform:0.2,1.5" or "lognormal:<median>,<sigma>" (seconds)
+    """
+
+    def __init__(self, spec: str = "fixed:0", seed: int = 0):
+        kind, _, params = (spec or "fixed:0").partition(":")
+        values = [float(v) for v in params.split(",") if v.strip()] or [0.0]
+        if kind not in ("fixed", "uniform", "lognormal"):
+            raise ValueError(f"Unknown latency distribution: {kind}")
+        if kind != "fixed" and len(values) != 2:
+            raise ValueError(f"{kind} latency needs two parameters")
+        self.kind = kind
+        self.values = values
+        self.spec = spec
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def sample(self) -> float:
+        with self._lock:
+            if self.kind == "uniform":
+                return self._rng.uniform(*self.values)
+            if self.kind == "lognormal":
+                median, sigma = self.values
+                return self._rng.lognormvariate(math.log(median), sigma) if median > 0 else 0.0
+            return self.values[0]
+
+
+class ResponseStore:
+    """
+    Recorded Messages API responses keyed by prompt_key
+    Stored as JSON lines of {"key": ..., "response": {...}}
+    """
+
+    def __init__(self, path: str = None):
+        self.path = path
+        self._responses: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+        if path:
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    for line in f:
+                        if line.strip():
+                            record = json.loads(line)
+                            self._responses[record["key"]] = record["response"]
+            except FileNotFoundError:
+                pass
+
+    def __len__(self) -> int:
+        return len(self._responses)
+
+    def get(self, key: str) -> Optional[Dict]:
+        return self._responses.get(key)
+
+    def add(self, key: str, response: Dict):
+        """Keep a response and append it to the backing file"""
+        with self._lock:
+            self._responses[key] = response
+            if self.path:
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps({"key": key, "response": response}, ensure_ascii=False) + "\n")
+
+
+class RecordingMessages:
+    """Wraps a real client's messages resource and records every successful response"""
+
+    def __init__(self, messages, store: ResponseStore):
+        self._messages = messages
+        self._store = store
+
+    def create(self, **kwargs):
+        response = self._messages.create(**kwargs)
+        dump = response.model_dump() if hasattr(response, "model_dump") else response
+        self._store.add(prompt_key(kwargs), dump)
+        return response
+
+
+class RecordingClient:
+    """Real Anthropic client whose responses are saved for later replay by MockMessagesAPI"""
+
+    def __init__(self, client, store: ResponseStore):
+        self.messages = RecordingMessages(client.messages, store)
+
+
+class MockMessagesAPI:
+    """
+    Transport-independent core: turns a request body into (status, headers, body)
+    Thread-safe; one instance can serve many concurrent clients
+    """
+
+    def __init__(self, store: ResponseStore = None, latency: LatencyModel = None,
+                 rate_429: float = 0.0, rate_529: float = 0.0, retry_after: float = 1.0,
+                 seed: int = 0, sleep: bool = True):
+        self.store = store or ResponseStore()
+        self.latency = latency or LatencyModel()
+        self.rate_429 = rate_429
+        self.rate_529 = rate_529
+        self.retry_after = retry_after
+        self.sleep = sleep
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.reset_stats()
+
+    def reset_stats(self):
+        with self._lock:
+            self.requests = 0
+            self.status_counts: Dict[int, int] = {}
+            self.replayed = 0
+            self.synthesized = 0
+            self.input_tokens = 0
+            self.output_tokens = 0
+            self.cache_read_tokens = 0
+            self.cache_write_tokens = 0
+            self.cached_prefixes = set()
+            self.latencies: List[float] = []
+
+    def handle(self, request: Dict) -> Tuple[int, Dict[str, str], Dict]:
+        """Answer one POST /v1/messages body"""
+        delay = self.latency.sample()
+        with self._lock:
+            self.requests += 1
+            roll = self._rng.random()
+        if self.sleep and delay > 0:
+            time.sleep(delay)
+
+        if roll < self.rate_429:
+            status, headers, body = 429, {"retry-after": str(self.retry_after)}, self._error(
+                "rate_limit_error", "Number of request tokens has exceeded your per-minute rate limit")
+        elif roll < self.rate_429 + self.rate_529:
+            status, headers, body = 529, {}, self._error("overloaded_error", "Overloaded")
+        elif not isinstance(request.get("messages"), list) or not request.get("max_tokens"):
+            status, headers, body = 400, {}, self._error(
+                "invalid_request_error", "messages and max_tokens are required")
+        else:
+            status, headers = 200, {}
+            body = self._respond(request)
+
+        with self._lock:
+            self.status_counts[status] = self.status_counts.get(status, 0) + 1
+            self.latencies.append(delay)
+        headers["request-id"] = f"req_mock_{uuid.uuid4().hex[:24]}"
+        return status, headers, body
+
+    def _respond(self, request: Dict) -> Dict:
+        key = prompt_key(request)
+        recorded = self.store.get(key)
+        if recorded is not None:
+            body = dict(recorded)
+            with self._lock:
+                self.replayed += 1
+        else:
+            content, output_text = synthesize(request["messages"], request.get("tools"))
+            prefix_hash, prefix_tokens = cached_prefix(request)
+            cache_read = cache_write = 0
+            if prefix_hash is not None:
+                with self._lock:
+                    if prefix_hash in self.cached_prefixes:
+                        cache_read = prefix_tokens
+                    else:
+                        self.cached_prefixes.add(prefix_hash)
+                        cache_write = prefix_tokens
+            uncached = 0 if prefix_hash is not None else prefix_tokens
+            body = {
+                "id": f"msg_mock_{key[:24]}",
+                "type": "message",
+                "role": "assistant",
+                "model": request.get("model", "mock"),
+                "content": content,
+                "stop_reason": "tool_use" if request.get("tools") else "end_turn",
+                "stop_sequence": None,
+                "usage": {
+                    "input_tokens": estimate_tokens(json.dumps(request.get("messages"), ensure_ascii=False)) + uncached,
+                    "cache_creation_input_tokens": cache_write,
+                    "cache_read_input_tokens": cache_read,
+                    "output_tokens": estimate_tokens(output_text)
+                }
+            }
+            with self._lock:
+                self.synthesized += 1
+
+        usage = body.get("usage") or {}
+        with self._lock:
+            self.input_tokens += usage.get("input_tokens", 0) or 0
+            self.output_tokens += usage.get("output_tokens", 0) or 0
+            self.cache_read_tokens += usage.get("cache_read_input_tokens", 0) or 0
+            self.cache_write_tokens += usage.get("cache_creation_input_tokens", 0) or 0
+        return body
+
+    @staticmethod
+    def _error(error_type: str, message: str) -> Dict:
+        return {"type": "error", "error": {"type": error_type, "message": message}}
+
+    def stats(self) -> Dict:
+        """Requests, status codes, replay/synthesis split, tokens and injected latency"""
+        with self._lock:
+            latencies = sorted(self.latencies)
+            stats = {
+                "requests": self.requests,
+                "status_counts": {str(k): v for k, v in sorted(self.status_counts.items())},
+                "replayed": self.replayed,
+                "synthesized": self.synthesized,
+                "recorded_responses": len(self.store),
+                "input_tokens": self.input_tokens,
+                "output_tokens": self.output_tokens,
+                "cache_read_tokens": self.cache_read_tokens,
+                "cache_write_tokens": self.cache_write_tokens,
+                "latency_distribution": self.latency.spec
+            }
+        for percent in (50, 95, 99):
+            index = min(len(latencies) - 1, int(len(latencies) * percent / 100)) if latencies else None
+            stats[f"p{percent}_latency_seconds"] = round(latencies[index], 4) if latencies else 0.0
+        return stats
+
+
+def _handler_for(api: MockMessagesAPI):
+    class MessagesHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def _send(self, status: int, body: Dict, headers: Dict[str, str] = None):
+            data = json.dumps(body).encode("utf-8")
+            self.send_response(status)
+            self.send_header("content-type", "application/json")
+            self.send_header("content-length", str(len(data)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_POST(self):
+            length = int(self.headers.get("content-length") or 0)
+            try:
+                request = json.loads(self.rfile.read(length) or b"{}")
+            except ValueError:
+                self._send(400, MockMessagesAPI._error("invalid_request_error", "Body is not valid JSON"))
+                return
+            if self.path.split("?")[0].rstrip("/") != "/v1/messages":
+                self._send(404, MockMessagesAPI._error("not_found_error", f"Unknown path {self.path}"))
+                return
+            status, headers, body = api.handle(request)
+            self._send(status, body, headers)
+
+        def do_GET(self):
+            if self.path.rstrip("/") == "/stats":
+                self._send(200, api.stats())
+            else:
+                self._send(404, MockMessagesAPI._error("not_found_error", f"Unknown path {self.path}"))
+
+        def log_message(self, format, *args):
+            pass
+
+    return MessagesHandler
+
+
+def start_server(api: MockMessagesAPI, host: str = "127.0.0.1", port: int = 0) -> Tuple[ThreadingHTTPServer, str]:
+    """Serve api on a background thread; returns (server, base_url). Call server.shutdown() when done"""
+    server = ThreadingHTTPServer((host, port), _handler_for(api))
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, name="mock-messages-api", daemon=True)
+    thread.start()
+    return server, f"http://{host}:{server.server_address[1]}"
+
+
+def _sdk_http_module():
+    """The HTTP library the installed anthropic SDK is built on (httpx or its successor)"""
+    from anthropic import _base_client
+    return getattr(_base_client, "httpx2", None) or getattr(_base_client, "httpx")
+
+
+def in_process_client(api: MockMessagesAPI, **client_kwargs):
+    """
+    Real anthropic.Anthropic client whose HTTP transport calls api directly
+    No sockets are opened, but requests, retries and parsing go through the SDK
+    """
+    from anthropic import Anthropic
+
+    http = _sdk_http_module()
+
+    def transport(request):
+        status, headers, body = api.handle(json.loads(request.content or b"{}"))
+        return http.Response(status, headers=headers, json=body)
+
+    client_kwargs.setdefault("api_key", "mock")
+    client_kwargs.setdefault("base_url", "http://mock-messages-api")
+    return Anthropic(http_client=http.Client(transport=http.MockTransport(transport)), **client_kwargs)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.mock_api",
+        description="Serve a local mock of the Anthropic Messages API"
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--recordings", help="JSONL of recorded responses to replay")
+    parser.add_argument("--latency", default="fixed:0",
+                        help="fixed:<s>, uniform:<lo>,<hi> or lognormal:<median>,<sigma>")
+    parser.add_argument("--rate-429", type=float, default=0.0, help="Fraction of requests answered 429")
+    parser.add_argument("--rate-529", type=float, default=0.0, help="Fraction of requests answered 529")
+    parser.add_argument("--retry-after", type=float, default=1.0, help="retry-after seconds sent with 429s")
+    parser.add_argument("--seed", type=int, default=0)
+    return parser
+
+
+def main(argv: List[str] = None) -> int:
+    args = build_parser().parse_args(argv)
+    api = MockMessagesAPI(
+        store=ResponseStore(args.recordings),
+        latency=LatencyModel(args.latency, args.seed),
+        rate_429=args.rate_429,
+        rate_529=args.rate_529,
+        retry_after=args.retry_after,
+        seed=args.seed
+    )
+    server = ThreadingHTTPServer((args.host, args.port), _handler_for(api))
+    print(f"Mock Messages API on http://{args.host}:{args.port} "
+          f"({len(api.store)} recorded responses)", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(json.dumps(api.stats()), file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
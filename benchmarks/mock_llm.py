@@ -0,0 +1,119 @@
+"""
+Mock LLM Client - Deterministic stand-in for anthropic.Anthropic in benchmarks
+Implements messages.create for the three request shapes RiskAnalyzer sends
+(single clause, batched tool call, contract overview) with canned answers
+derived from a hash of the prompt, so repeated runs produce identical reports
+"""
+import hashlib
+import json
+import re
+import threading
+import time
+from types import SimpleNamespace
+from typing import Dict, List, Tuple
+
+RISKS = ("Low", "Medium", "High")
+CLAUSE_HEADER_PATTERN = re.compile(r"^CLAUSE (\d+) \(", re.M)
+
+
+def _prompt_text(messages: List[Dict]) -> str:
+    """Concatenate the text of every message"""
+    parts = []
+    for message in messages:
+        content = message.get("content", "")
+        if isinstance(content, str):
+            parts.append(content)
+        else:
+            parts.extend(block.get("text", "") for block in content if isinstance(block, dict))
+    return "\n".join(parts)
+
+
+def _digest(text: str) -> int:
+    return int(hashlib.sha256(text.encode("utf-8")).hexdigest()[:8], 16)
+
+
+def synthesize(messages: List[Dict], tools: List[Dict] = None) -> Tuple[List[Dict], str]:
+    """
+    Canned answer for a Messages API request, as content blocks (API JSON shape)
+    plus the text used for output token estimates
+    """
+    prompt = _prompt_text(messages or [])
+    if tools:
+        block = _tool_use(prompt, tools[0]["name"])
+        return [block], json.dumps(block["input"])
+    text = _text_answer(prompt, _digest(prompt))
+    return [{"type": "text", "text": text}], text
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough 4-characters-per-token estimate, enough for relative comparisons"""
+    return len(text) // 4 + 1
+
+
+def _tool_use(prompt: str, tool_name: str) -> Dict:
+    """One valid verdict per CLAUSE block in a batch prompt"""
+    analyses = []
+    for match in CLAUSE_HEADER_PATTERN.finditer(prompt):
+        index = int(match.group(1))
+        risk = RISKS[_digest(prompt[match.start():match.start() + 400]) % 3]
+        analyses.append({
+            "index": index,
+            "risk": risk,
+            "unfavorable": risk == "High",
+            "explanation": f"Clause {index} carries {risk.lower()} risk for the company.",
+            "concerns": [] if risk == "Low" else ["Terms favour the counterparty"],
+            "suggestion": "Negotiate balanced wording and a liability cap."
+        })
+    return {"type": "tool_use", "id": f"toolu_mock_{_digest(prompt):08x}", "name": tool_name,
+            "input": {"analyses": analyses}}
+
+
+def _text_answer(prompt: str, digest: int) -> str:
+    risk = RISKS[digest % 3]
+    if "CONTRACT EXCERPT" in prompt:
+        return (
+            "1. Contract Type: Service\n"
+            "2. Key Risks:\n- Liability exposure\n- Termination terms\n- Payment delays\n"
+            f"3. Overall Risk Score: {risk}\n"
+            "4. Top 5 Clauses to Review Carefully: Liability, Termination, Payment, IP, Arbitration\n"
+            "5. Compliance Status: No obvious conflict with Indian law identified."
+        )
+    return (
+        f"Risk Level: {risk}\n"
+        f"Unfavorable: {'Yes' if risk == 'High' else 'No'}\n"
+        "Explanation:\nThe clause allocates obligations between the parties.\n"
+        "Concerns:\n- Review the scope of obligations\n"
+        "Suggested improvement:\nAdd mutual obligations and a clear notice period."
+    )
+
+
+class MockMessages:
+    """messages.create with optional fixed latency; counts calls and tokens"""
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.calls = 0
+        self.input_tokens = 0
+        self.output_tokens = 0
+        self._lock = threading.Lock()
+
+    def create(self, model: str = None, max_tokens: int = 1024, messages: List[Dict] = None,
+               tools: List[Dict] = None, **kwargs):
+        content, output_text = synthesize(messages, tools)
+        usage = SimpleNamespace(input_tokens=estimate_tokens(_prompt_text(messages or [])),
+                                output_tokens=estimate_tokens(output_text))
+        with self._lock:
+            self.calls += 1
+            self.input_tokens += usage.input_tokens
+            self.output_tokens += usage.output_tokens
+        if self.latency:
+            time.sleep(self.latency)
+        return SimpleNamespace(content=[SimpleNamespace(**block) for block in content], usage=usage,
+                               stop_reason="tool_use" if tools else "end_turn", model=model)
+
+
+class MockAnthropicClient:
+    """Drop-in for Anthropic(): only .messages.create is provided"""
+
+    def __init__(self, latency: float = 0.0):
+        self.messages = MockMessages(latency)
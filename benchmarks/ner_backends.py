@@ -0,0 +1,144 @@
+"""
+NER Backend Benchmark - Throughput and recall of the regex and spaCy entity scanners
+
+Usage:
+    python -m benchmarks.ner_backends
+    python -m benchmarks.ner_backends --contracts 50 --pages 3 --n-process 2 --batch-size 64
+
+Runs scan_entities with each backend over seeded synthetic contracts and
+scores parties and locations against the names the generator put in them
+(a name counts as found when a reported value equals it, ignoring case and
+surrounding punctuation). For spaCy, "pipe" also times one batched
+find_entities call over the whole corpus, as a batch deployment would use
+it. A backend that is not installed is reported as unavailable
+"""
+import argparse
+import json
+import sys
+import time
+from typing import Dict, List, Set
+
+from benchmarks.generator import CITIES, PARTIES, PEOPLE, generate_contract
+
+BACKENDS = ("regex", "spacy")
+KINDS = ("party", "location")
+MB = 1024 * 1024
+
+
+def build_corpus(contracts: int, pages: int, seed: int = 0) -> List[str]:
+    return [generate_contract(pages, seed + i) for i in range(contracts)]
+
+
+def _normalize(value: str) -> str:
+    return value.strip(" \t\n.,;:\"'()").casefold()
+
+
+def gold_entities(text: str) -> Dict[str, Set[str]]:
+    """Generator names present in text, per kind"""
+    return {
+        "party": {_normalize(name) for name in PARTIES + PEOPLE if name in text},
+        "location": {_normalize(name) for name in CITIES if name in text},
+    }
+
+
+def score(found: List[Dict[str, Set[str]]], gold: List[Dict[str, Set[str]]]) -> Dict[str, Dict]:
+    """Recall per kind over the corpus, with the number of distinct values reported"""
+    scores = {}
+    for kind in KINDS:
+        expected = sum(len(names[kind]) for names in gold)
+        hits = sum(len(names[kind] & values[kind]) for names, values in zip(gold, found))
+        scores[kind] = {
+            "recall": round(hits / expected, 3) if expected else None,
+            "expected": expected,
+            "found_values": sum(len(values[kind]) for values in found),
+        }
+    return scores
+
+
+def run_backend(backend: str, texts: List[str], n_process: int = None, batch_size: int = None) -> Dict:
+    """Time scan_entities(text, backend) over the corpus and score its parties and locations"""
+    from backend.utils import spacy_ner
+    from backend.utils.ner import scan_entities
+
+    result = {"available": True}
+    if backend == "spacy":
+        started = time.perf_counter()
+        if spacy_ner.get_nlp() is None:
+            return {"available": False, "reason": spacy_ner.unavailable_reason()}
+        result["model"] = spacy_ner.model_version()
+        result["load_seconds"] = round(time.perf_counter() - started, 3)
+    # Warm-up: gazetteer, keyword tables, sentence splitter
+    list(scan_entities(texts[0], backend))
+
+    found = []
+    started = time.perf_counter()
+    for text in texts:
+        values = {kind: set() for kind in KINDS}
+        for match in scan_entities(text, backend):
+            if match.kind in values:
+                values[match.kind].add(_normalize(match.value))
+        found.append(values)
+    seconds = time.perf_counter() - started
+
+    size = sum(len(text.encode("utf-8")) for text in texts)
+    result.update({
+        "seconds": round(seconds, 4),
+        "mb_per_second": round(size / MB / seconds, 3) if seconds else None,
+        "docs_per_second": round(len(texts) / seconds, 2) if seconds else None,
+        "scores": score(found, [gold_entities(text) for text in texts]),
+    })
+
+    if backend == "spacy":
+        started = time.perf_counter()
+        spacy_ner.find_entities(texts, n_process=n_process, batch_size=batch_size)
+        pipe_seconds = time.perf_counter() - started
+        result["pipe"] = {
+            "n_process": n_process or spacy_ner.N_PROCESS,
+            "batch_size": batch_size or spacy_ner.BATCH_SIZE,
+            "seconds": round(pipe_seconds, 4),
+            "docs_per_second": round(len(texts) / pipe_seconds, 2) if pipe_seconds else None,
+        }
+    return result
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.ner_backends",
+        description="Compare the regex and spaCy NER backends on throughput and recall"
+    )
+    parser.add_argument("--backends", default=",".join(BACKENDS), help="Comma-separated backends to run")
+    parser.add_argument("--contracts", type=int, default=20, help="Number of synthetic contracts")
+    parser.add_argument("--pages", type=int, default=2, help="Pages per contract")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the first contract")
+    parser.add_argument("--n-process", type=int, default=None, help="nlp.pipe worker processes (spaCy)")
+    parser.add_argument("--batch-size", type=int, default=None, help="nlp.pipe batch size (spaCy)")
+    return parser
+
+
+def main(argv: List[str] = None) -> int:
+    args = build_parser().parse_args(argv)
+    backends = [backend.strip() for backend in args.backends.split(",") if backend.strip()]
+    unknown = [backend for backend in backends if backend not in BACKENDS]
+    if unknown or args.contracts < 1:
+        print(f"Unknown backend: {', '.join(unknown)}" if unknown else "--contracts must be at least 1",
+              file=sys.stderr)
+        return 2
+
+    texts = build_corpus(args.contracts, max(1, args.pages), args.seed)
+    results = {
+        "corpus": {
+            "contracts": len(texts),
+            "pages": args.pages,
+            "mb": round(sum(len(text.encode("utf-8")) for text in texts) / MB, 3),
+        }
+    }
+    for backend in backends:
+        results[backend] = run_backend(backend, texts, args.n_process, args.batch_size)
+        if not results[backend]["available"]:
+            print(f"{backend}: unavailable ({results[backend]['reason']})", file=sys.stderr)
+    print(json.dumps(results, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
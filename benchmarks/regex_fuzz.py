@@ -0,0 +1,164 @@
+"""
+Regex Fuzz Benchmark - Worst-case scanning time on hostile or OCR-garbled text
+
+Usage:
+    python -m benchmarks.regex_fuzz
+    python -m benchmarks.regex_fuzz --size-kb 1024 --ceiling 3.0 --timeout 60
+
+Feeds long pathological strings (unterminated party clauses, capitalized runs
+without a company suffix, whitespace and digit runs, random OCR noise) to every
+regex-driven stage. Each case runs in a fresh interpreter under a timeout and
+at two sizes: seconds per MB must stay under the ceiling at the larger one, and
+"growth" (per-MB time at full size / at a quarter size) near 1 shows the stage
+is linear. Exits 1 when a case exceeds the ceiling or times out
+"""
+import argparse
+import json
+import os
+import random
+import string
+import subprocess
+import sys
+import time
+from typing import Callable, Dict, List
+
+DEFAULT_SIZE_KB = 512
+DEFAULT_CEILING_SECONDS_PER_MB = 3.0
+DEFAULT_TIMEOUT_SECONDS = 60.0
+MB = 1024 * 1024
+
+
+def _repeat(unit: str) -> Callable[[int], str]:
+    return lambda size: (unit * (size // len(unit) + 1))[:size]
+
+
+def _ocr_noise(size: int) -> str:
+    """Seeded mix of letters, digits, currency/date punctuation and whitespace"""
+    rng = random.Random(size)
+    alphabet = string.ascii_letters + string.digits + " \n\t.,;:&@%/-+()₹$'" + " " * 8
+    return "".join(rng.choice(alphabet) for _ in range(size))
+
+
+INPUTS = {
+    "unterminated_party": _repeat("between Alpha Beta "),
+    "party_whitespace": _repeat("between A" + " " * 200 + "\n"),
+    "capitalized_run": _repeat("Alpha Beta Gamma "),
+    "company_no_suffix": _repeat("Ab & C. "),
+    "whitespace": _repeat(" \t "),
+    "blank_lines": _repeat("\n \n"),
+    "indented_newlines": _repeat("\n" + " " * 64),
+    "digits": _repeat("1234567890"),
+    "digit_groups": _repeat("1,"),
+    "decimals": _repeat("1."),
+    "month_gaps": _repeat("January" + " " * 64),
+    "email_local": _repeat("a.b+c_d"),
+    "email_at_runs": _repeat("a@b."),
+    "label_lines": _repeat("effective date payment: security " + " " * 32),
+    "ocr_noise": _ocr_noise,
+}
+
+
+def _stages() -> Dict[str, Callable[[str], object]]:
+    """Regex-driven stages, imported lazily so the parent process stays light"""
+    from backend.utils.contract_classifier import ContractClassifier
+    from backend.utils.document import Document, _regex_sent_tokenize
+    from backend.utils.ner import COMPANY_PATTERN, scan_entities
+
+    return {
+        "entities": lambda text: list(scan_entities(text)),
+        # Only the contract head is searched in practice; run it over everything
+        "company_names": lambda text: COMPANY_PATTERN.findall(text),
+        "sections": lambda text: Document(text).section_spans,
+        "sentences": _regex_sent_tokenize,
+        "key_dates": ContractClassifier.get_key_dates,
+        "key_amounts": ContractClassifier.get_key_amounts,
+    }
+
+
+STAGES = ("entities", "company_names", "sections", "sentences", "key_dates", "key_amounts")
+
+
+def _time(fn: Callable, text: str) -> float:
+    started = time.perf_counter()
+    fn(text)
+    return time.perf_counter() - started
+
+
+def run_case(stage: str, input_name: str, size: int) -> Dict:
+    """Time one stage on one input at size and size / 4 (in this process)"""
+    fn = _stages()[stage]
+    fn(INPUTS[input_name](1024))
+    small = size // 4
+    small_seconds = _time(fn, INPUTS[input_name](small))
+    seconds = _time(fn, INPUTS[input_name](size))
+    per_mb = seconds / (size / MB)
+    small_per_mb = small_seconds / (small / MB)
+    return {
+        "seconds": round(seconds, 4),
+        "seconds_per_mb": round(per_mb, 3),
+        "growth": round(per_mb / small_per_mb, 2) if small_per_mb > 0 else None
+    }
+
+
+def run_isolated(stage: str, input_name: str, size: int, timeout: float) -> Dict:
+    """run_case in a fresh interpreter; a catastrophic backtrack is reported as a timeout"""
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    command = [sys.executable, "-m", "benchmarks.regex_fuzz", "--case", stage, input_name, str(size)]
+    try:
+        result = subprocess.run(command, cwd=root, capture_output=True, text=True, timeout=timeout, check=True)
+    except subprocess.TimeoutExpired:
+        return {"timed_out": True, "seconds": timeout}
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def run(stages=STAGES, inputs=tuple(INPUTS), size: int = DEFAULT_SIZE_KB * 1024,
+        timeout: float = DEFAULT_TIMEOUT_SECONDS) -> Dict:
+    return {
+        stage: {input_name: run_isolated(stage, input_name, size, timeout) for input_name in inputs}
+        for stage in stages
+    }
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.regex_fuzz",
+        description="Check that regex-driven stages stay linear on pathological input"
+    )
+    parser.add_argument("--stages", default=",".join(STAGES), help="Comma-separated stages to run")
+    parser.add_argument("--inputs", default=",".join(INPUTS), help="Comma-separated inputs to feed")
+    parser.add_argument("--size-kb", type=int, default=DEFAULT_SIZE_KB, help="Size of each input")
+    parser.add_argument("--ceiling", type=float, default=DEFAULT_CEILING_SECONDS_PER_MB,
+                        help="Fail when a case takes more than this many seconds per MB")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT_SECONDS,
+                        help="Seconds before a case is killed and counted as failed")
+    parser.add_argument("--case", nargs=3, metavar=("STAGE", "INPUT", "SIZE"), help=argparse.SUPPRESS)
+    return parser
+
+
+def main(argv: List[str] = None) -> int:
+    args = build_parser().parse_args(argv)
+    if args.case:
+        stage, input_name, size = args.case
+        print(json.dumps(run_case(stage, input_name, int(size))))
+        return 0
+
+    stages = [stage.strip() for stage in args.stages.split(",") if stage.strip()]
+    inputs = [name.strip() for name in args.inputs.split(",") if name.strip()]
+    results = run(stages, inputs, max(4, args.size_kb) * 1024, args.timeout)
+    print(json.dumps(results, indent=2))
+
+    failed = False
+    for stage, cases in results.items():
+        for input_name, result in cases.items():
+            if result.get("timed_out"):
+                print(f"{stage}/{input_name}: timed out after {args.timeout}s", file=sys.stderr)
+                failed = True
+            elif result["seconds_per_mb"] > args.ceiling:
+                print(f"{stage}/{input_name}: {result['seconds_per_mb']}s/MB exceeds the {args.ceiling}s/MB ceiling",
+                      file=sys.stderr)
+                failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
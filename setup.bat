@@ -56,6 +56,16 @@ if %errorlevel% neq 0 (
 echo ✓ All dependencies installed
 echo.
 
+REM Download NLP data once here; the app never downloads at startup
+echo Downloading NLP data...
+python -m backend.provision
+if %errorlevel% neq 0 (
+    echo ⚠️  NLTK data unavailable; a simpler sentence splitter will be used
+) else (
+    echo ✓ NLP data ready
+)
+echo.
+
 REM Check for .env file
 if not exist .env (
     echo.
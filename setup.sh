@@ -54,6 +54,16 @@ fi
 echo "✓ All dependencies installed"
 echo ""
 
+# Download NLP data once here; the app never downloads at startup
+echo "Downloading NLP data..."
+python -m backend.provision
+if [ $? -ne 0 ]; then
+    echo "⚠️  NLTK data unavailable; a simpler sentence splitter will be used"
+else
+    echo "✓ NLP data ready"
+fi
+echo ""
+
 # Check for .env file
 if [ ! -f ".env" ]; then
     echo ""
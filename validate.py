@@ -26,7 +26,6 @@ def check_dependencies():
         'streamlit',
         'anthropic',
         'nltk',
-        'textblob',
         'docx',
         'pdfplumber',
         'pandas',
@@ -84,6 +83,19 @@ def check_file_structure():
     return True
 
 
+def check_nlp_data():
+    """Check if the NLTK sentence tokenizer data is installed (optional; warns only)"""
+    from backend.provision import check_nltk_data
+    
+    if any(check_nltk_data().values()):
+        print("✓ NLTK punkt tokenizer data")
+        return True
+    
+    print("⚠️  NLTK punkt data not found; sentences will be split with a simpler regex")
+    print("   Run: python -m backend.provision")
+    return True
+
+
 def check_env_file():
     """Check if .env file exists and has API key"""
     if not Path('.env').exists():
@@ -118,6 +130,7 @@ def main():
         ("Python Version", check_python_version),
         ("Dependencies", check_dependencies),
         ("File Structure", check_file_structure),
+        ("NLP Data", check_nlp_data),
         ("Environment Setup", check_env_file),
     ]
     